@@ -1,7 +1,7 @@
 from __future__ import annotations
 import random
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 from core.cards import Card, parse_label
 from core.evaluator import RANK_VALUE, evaluate_best
@@ -136,6 +136,7 @@ def estimate_equity_vs_range(
     community: Sequence[str],
     opponent_range: Sequence[HandCombo],
     trials: int = 400,
+    rng: Optional[random.Random] = None,
 ) -> float:
     deck = _remaining_deck([*hole, *community])
     hero_cards = parse_cards(hole)
@@ -144,7 +145,7 @@ def estimate_equity_vs_range(
     wins = 0
     ties = 0
     total = 0
-    rng = random.Random()
+    rng = rng or random.Random()
 
     for _ in range(trials):
         if opponent_range:
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from typing import Any, Dict, Optional
 
 import websockets
 
+from core import compact
+from core.serialization import dumps, loads
+
 from .decisions import DecisionResult
 from .logging_utils import HandLogger
 from .opponent_model import OpponentModel
@@ -18,28 +20,39 @@ LOGGER = logging.getLogger("strategic_bot")
 
 
 class StrategicBot:
-    def __init__(self, team_name: str, bot_label: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        team_name: str,
+        bot_label: Optional[str] = None,
+        log_hands: bool = True,
+        compact_frames: bool = False,
+    ) -> None:
         self.team_name = team_name
         self.bot_label = bot_label
+        # Ask for binary frames (core/compact.py); used once welcome confirms it.
+        self.compact_frames = compact_frames
+        self._packed = False
         self.display_name = f"{team_name} ({bot_label})" if bot_label else team_name
         self.tracker = GameStateTracker()
         self.opponent_model = OpponentModel()
         self.builder = DecisionBuilder(self.tracker, self.opponent_model)
         self.engine = DecisionEngine(self.opponent_model)
-        self.hand_logger = HandLogger()
+        self.hand_logger: Optional[HandLogger] = HandLogger() if log_hands else None
 
     async def connect_and_play(self, url: str) -> None:
         async with websockets.connect(url) as ws:
             hello = {"type": "hello", "v": 1, "team": self.team_name}
             if self.bot_label:
                 hello["bot"] = self.bot_label
-            await ws.send(json.dumps(hello))
+            if self.compact_frames:
+                hello["encoding"] = compact.NAME
+            await ws.send(dumps(hello))
             LOGGER.info("[connect] %s as %s", url, self.display_name)
             await self._play(ws)
 
     async def _play(self, websocket: websockets.WebSocketClientProtocol) -> None:
         async for raw in websocket:
-            message = json.loads(raw)
+            message = compact.decode(raw) if compact.is_compact(raw) else loads(raw)
             msg_type = message.get("type")
 
             if msg_type == "welcome":
@@ -70,6 +83,7 @@ class StrategicBot:
 
     async def _handle_welcome(self, message: Dict[str, Any]) -> None:
         LOGGER.info("[welcome] seat=%s config=%s", message.get("seat"), message.get("config"))
+        self._packed = message.get("encoding") == compact.NAME
         seat = message.get("seat")
         if seat is not None:
             self.tracker.set_seat(seat)
@@ -116,13 +130,7 @@ class StrategicBot:
         message: Dict[str, Any],
         websocket: websockets.WebSocketClientProtocol,
     ) -> None:
-        try:
-            context = self.builder.build(message)
-            decision = self.engine.decide(context)
-            decision = sanitize_result(context, decision)
-        except Exception as exc:  # pragma: no cover - defensive
-            LOGGER.exception("Failed to choose action: %s", exc)
-            decision = self._fallback(message)
+        decision = self.decide(message)
         payload = {
             "type": "action",
             "v": 1,
@@ -132,7 +140,17 @@ class StrategicBot:
         if decision.amount is not None:
             payload["amount"] = int(decision.amount)
         LOGGER.debug("[action] %s", payload)
-        await websocket.send(json.dumps(payload))
+        await websocket.send(compact.encode(payload) if self._packed else dumps(payload))
+
+    def decide(self, message: Dict[str, Any]) -> DecisionResult:
+        """Pure decision core: act payload in, sanitized action out (no I/O)."""
+        try:
+            context = self.builder.build(message)
+            decision = self.engine.decide(context)
+            return sanitize_result(context, decision)
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.exception("Failed to choose action: %s", exc)
+            return self._fallback(message)
 
     def _fallback(self, message: Dict[str, Any]) -> DecisionResult:
         legal = message.get("legal", [])
@@ -147,6 +165,7 @@ class StrategicBot:
     def _handle_end_hand(self, message: Dict[str, Any]) -> None:
         if self.tracker.hand:
             history = self.tracker.finalize_hand()
-            self.hand_logger.log_hand(history)
+            if self.hand_logger is not None:
+                self.hand_logger.log_hand(history)
         LOGGER.info("[hand %s] end | stacks=%s", message.get("hand_id"), message.get("stacks"))
 
@@ -27,9 +27,16 @@ from .utils import preflop_strength
 
 
 class DecisionBuilder:
-    def __init__(self, tracker: GameStateTracker, opponent_model: OpponentModel) -> None:
+    def __init__(
+        self,
+        tracker: GameStateTracker,
+        opponent_model: OpponentModel,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         self.tracker = tracker
         self.opponent_model = opponent_model
+        # None keeps equity sampling unseeded; self-play passes a seeded Random.
+        self.rng = rng
 
     def build(self, payload: Dict[str, object]) -> DecisionContext:
         self.tracker.sync_from_act_payload(payload)
@@ -83,6 +90,7 @@ class DecisionBuilder:
             hole_cards,
             community,
             opponent_range,
+            rng=self.rng,
         )
 
         return DecisionContext(
@@ -3,7 +3,9 @@
 from .cards import Card, RANKS, SUITS, build_deck, deal
 from .evaluator import evaluate_best, parse_cards
 from .game import GameEngine, HandContext
-from .models import ActionType, Phase, PlayerSeat, TableConfig
+from .instrumentation import EngineHooks, EngineStatsCollector, LatencyHistogram
+from .models import ActionType, Phase, PlayerSeat, SeatActionWindow, TableConfig
+from .tournament import BlindLevel, BlindSchedule, TournamentEngine
 
 __all__ = [
     "Card",
@@ -15,8 +17,15 @@ __all__ = [
     "parse_cards",
     "GameEngine",
     "HandContext",
+    "EngineHooks",
+    "EngineStatsCollector",
+    "LatencyHistogram",
     "ActionType",
     "Phase",
     "PlayerSeat",
+    "SeatActionWindow",
     "TableConfig",
+    "BlindLevel",
+    "BlindSchedule",
+    "TournamentEngine",
 ]
@@ -30,6 +30,18 @@ def build_deck(seed: Optional[int] = None) -> List[Card]:
     return deck
 
 
+# Cards are immutable, so one canonical set can back every recycled deck.
+_ORDERED_DECK = tuple(Card(rank, suit) for rank in RANKS[::-1] for suit in SUITS)
+
+
+def refill_deck(deck: List[Card], seed: Optional[int], rng: random.Random) -> List[Card]:
+    """Refill ``deck`` in place with the same order ``build_deck(seed)`` returns."""
+    rng.seed(seed)
+    deck[:] = _ORDERED_DECK
+    rng.shuffle(deck)
+    return deck
+
+
 def deal(deck: List[Card], count: int) -> List[Card]:
     if len(deck) < count:
         raise ValueError("Not enough cards left in deck")
@@ -0,0 +1,312 @@
+"""Compact binary encoding for bot traffic, negotiated in ``hello``.
+
+A bot that sends ``"encoding": "compact"`` in its hello gets a welcome (still
+JSON text) echoing the same field, and from then on every table message as a
+binary frame in this format. It may answer with binary frames too. Text frames
+stay JSON either way, so clients can tell the two apart by frame type.
+
+The format is a MessagePack subset (nil, bool, int, float64, str, array, map)
+with two changes that make poker messages small:
+
+* Map keys listed in ``KEYS`` are written as their index (one byte) instead of
+  the field name; any other key is written as a string.
+* Cards under ``CARD_KEYS`` travel as integers 0-51 (``CARDS`` order): a card
+  list as a ``bin`` whose bytes are the cards, a single card as a 1-byte ext of
+  type ``CARD_EXT``. The codec emits ``bin`` for nothing else.
+
+``decode(encode(msg)) == msg`` for anything JSON can carry (int keys become
+strings, as in JSON), so bots keep reading the usual field
+names and card labels. This module only needs the standard library so that
+bots can copy it alongside ``sample_bot.py``.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+NAME = "compact"
+
+# Append only: a key's index is its wire id. At most 128 entries (fixint ids).
+KEYS: Tuple[str, ...] = (
+    "type", "v", "ts", "log_seq", "hand_id", "seat", "stack", "committed",
+    "has_folded", "ev", "amount", "players", "phase", "pot", "current_bet",
+    "min_raise_increment", "you", "hole", "to_call", "time_ms", "table", "sb",
+    "bb", "seats", "button", "community", "legal", "call_amount", "min_raise_to",
+    "max_raise_to", "events", "action", "cards", "card", "stacks", "seed",
+    "results", "final_stacks", "winner", "rank", "hand", "board", "team",
+    "connected", "table_id", "stream", "resume", "encoding", "at_hand_id",
+    "sb_seat", "bb_seat", "time_ms_remaining", "code", "msg", "status",
+    "config", "variant", "starting_stack", "move_time_ms", "in_hand", "seated",
+    "total_seats", "players_ready", "can_start", "command", "error",
+)
+_KEY_IDS: Dict[str, int] = {key: idx for idx, key in enumerate(KEYS)}
+
+CARD_KEYS = frozenset({"hole", "community", "cards", "card", "hand", "board"})
+CARDS: Tuple[str, ...] = tuple(rank + suit for rank in "23456789TJQKA" for suit in "hdcs")
+_CARD_IDS: Dict[str, int] = {label: idx for idx, label in enumerate(CARDS)}
+CARD_EXT = 1
+
+Packed = Union[bytes, bytearray, memoryview]
+
+# Encoded short strings; cleared when full.
+_STRINGS: Dict[str, bytes] = {}
+_STRINGS_MAX = 4096
+# Deepest array/map nesting decode accepts; table messages use four levels.
+MAX_DEPTH = 32
+
+_pack_d = struct.Struct(">d").pack
+_unpack_d = struct.Struct(">d").unpack_from
+
+
+def is_compact(raw: object) -> bool:
+    """True for a binary frame in this format (a map; JSON never starts with a byte >= 0x80)."""
+    return isinstance(raw, (bytes, bytearray, memoryview)) and len(raw) > 0 and raw[0] >= 0x80
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    out = bytearray()
+    _write_map(out, message)
+    return bytes(out)
+
+
+def encode_envelope(
+    msg_type: str,
+    payload: Dict[str, Any],
+    ts: Optional[str] = None,
+    log_seq: Optional[int] = None,
+) -> bytes:
+    """Same as ``encode({"type": ..., "v": 1, "ts": ..., "log_seq": ..., **payload})`` without the merged dict."""
+    out = bytearray()
+    _write_len(out, 2 + (ts is not None) + (log_seq is not None) + len(payload), 0x80, 0xDE)
+    out.append(0)
+    _write(out, msg_type)
+    out += b"\x01\x01"
+    if ts is not None:
+        out.append(2)
+        _write(out, ts)
+    if log_seq is not None:
+        out.append(3)
+        _write(out, log_seq)
+    _write_items(out, payload)
+    return bytes(out)
+
+
+def decode(data: Packed) -> Dict[str, Any]:
+    """Decode one message; ValueError for anything that is not a well-formed map."""
+    if type(data) is not bytes:
+        data = bytes(data)
+    try:
+        value, pos = _read(data, 0, 0)
+    except (IndexError, struct.error) as exc:
+        # Truncated data, or a key, card or ext id out of range.
+        raise ValueError(f"Malformed compact message: {exc}") from None
+    if pos != len(data):
+        raise ValueError("Trailing bytes after compact message")
+    if type(value) is not dict:
+        raise ValueError("A compact message must be a map")
+    return value
+
+
+def _write_len(out: bytearray, n: int, fix: int, wide: int) -> None:
+    # fix: fixmap/fixarray base; wide: the 16-bit variant (the 32-bit one follows it).
+    if n < 16:
+        out.append(fix | n)
+    elif n < 0x10000:
+        out.append(wide)
+        out += n.to_bytes(2, "big")
+    else:
+        out.append(wide + 1)
+        out += n.to_bytes(4, "big")
+
+
+def _write_map(out: bytearray, value: Dict[Any, Any]) -> None:
+    _write_len(out, len(value), 0x80, 0xDE)
+    _write_items(out, value)
+
+
+def _write_items(out: bytearray, value: Dict[Any, Any]) -> None:
+    # Small ints, short strings and key ids cover almost every field, so they
+    # are handled inline instead of through _write.
+    key_ids = _KEY_IDS
+    strings = _STRINGS
+    for key, item in value.items():
+        key_id = key_ids.get(key)
+        if key_id is not None:
+            out.append(key_id)
+        else:
+            _write(out, key if type(key) is str else str(key))
+        kind = type(item)
+        if kind is int and 0 <= item < 0x80:
+            out.append(item)
+        elif kind is str:
+            if key in CARD_KEYS and item in _CARD_IDS:
+                out += bytes((0xD4, CARD_EXT, _CARD_IDS[item]))
+                continue
+            packed = strings.get(item)
+            if packed is None:
+                packed = _pack_str(item)
+            out += packed
+        elif kind is bool:
+            out.append(0xC3 if item else 0xC2)
+        elif kind is list and key in CARD_KEYS and _write_cards(out, item):
+            continue
+        else:
+            _write(out, item)
+
+
+def _write_cards(out: bytearray, value: List[Any]) -> bool:
+    if len(value) >= 256:
+        return False
+    try:
+        cards = bytes([_CARD_IDS[label] for label in value])
+    except (KeyError, TypeError):
+        return False
+    out += bytes((0xC4, len(cards)))
+    out += cards
+    return True
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode()
+    n = len(data)
+    if n < 32:
+        packed = bytes((0xA0 | n,)) + data
+        # Phases, actions, hand ids and team names repeat in every message.
+        if len(_STRINGS) >= _STRINGS_MAX:
+            _STRINGS.clear()
+        _STRINGS[value] = packed
+        return packed
+    if n < 0x100:
+        return bytes((0xD9, n)) + data
+    if n < 0x10000:
+        return b"\xda" + n.to_bytes(2, "big") + data
+    return b"\xdb" + n.to_bytes(4, "big") + data
+
+
+def _write(out: bytearray, value: Any) -> None:
+    kind = type(value)
+    if kind is str:
+        packed = _STRINGS.get(value)
+        out += packed if packed is not None else _pack_str(value)
+    elif kind is int:
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xFF)
+        elif value >= 0:
+            for marker, size in ((0xCC, 1), (0xCD, 2), (0xCE, 4), (0xCF, 8)):
+                if value < 1 << (8 * size):
+                    out.append(marker)
+                    out += value.to_bytes(size, "big")
+                    return
+            raise OverflowError("Integer too large for the compact encoding")
+        else:
+            for marker, size in ((0xD0, 1), (0xD1, 2), (0xD2, 4), (0xD3, 8)):
+                if value >= -(1 << (8 * size - 1)):
+                    out.append(marker)
+                    out += value.to_bytes(size, "big", signed=True)
+                    return
+            raise OverflowError("Integer too large for the compact encoding")
+    elif kind is dict:
+        _write_len(out, len(value), 0x80, 0xDE)
+        _write_items(out, value)
+    elif kind is list or kind is tuple:
+        _write_len(out, len(value), 0x90, 0xDC)
+        for item in value:
+            _write(out, item)
+    elif value is None:
+        out.append(0xC0)
+    elif kind is bool:
+        out.append(0xC3 if value else 0xC2)
+    elif kind is float:
+        out.append(0xCB)
+        out += _pack_d(value)
+    else:
+        raise TypeError(f"Cannot encode {kind.__name__} in the compact encoding")
+
+
+def _read(data: bytes, pos: int, depth: int) -> Tuple[Any, int]:
+    marker = data[pos]
+    pos += 1
+    if marker < 0x80:
+        return marker, pos
+    if marker < 0x90:
+        return _read_map(data, pos, marker & 0x0F, depth + 1)
+    if marker < 0xA0:
+        return _read_array(data, pos, marker & 0x0F, depth + 1)
+    if marker < 0xC0:
+        end = pos + (marker & 0x1F)
+        return data[pos:end].decode(), end
+    if marker >= 0xE0:
+        return marker - 0x100, pos
+    if marker == 0xC0:
+        return None, pos
+    if marker == 0xC2:
+        return False, pos
+    if marker == 0xC3:
+        return True, pos
+    if marker == 0xC4:
+        end = pos + 1 + data[pos]
+        return [CARDS[card] for card in data[pos + 1 : end]], end
+    if marker == 0xD4:
+        if data[pos] != CARD_EXT:
+            raise ValueError(f"Unknown ext type {data[pos]}")
+        return CARDS[data[pos + 1]], pos + 2
+    if marker == 0xCB:
+        return _unpack_d(data, pos)[0], pos + 8
+    if 0xCC <= marker <= 0xCF:
+        size = 1 << (marker - 0xCC)
+        return int.from_bytes(data[pos : pos + size], "big"), pos + size
+    if 0xD0 <= marker <= 0xD3:
+        size = 1 << (marker - 0xD0)
+        return int.from_bytes(data[pos : pos + size], "big", signed=True), pos + size
+    if 0xD9 <= marker <= 0xDB:
+        size = 1 << (marker - 0xD9)
+        n = int.from_bytes(data[pos : pos + size], "big")
+        pos += size
+        return data[pos : pos + n].decode(), pos + n
+    if marker in (0xDC, 0xDD, 0xDE, 0xDF):
+        size = 2 if marker in (0xDC, 0xDE) else 4
+        n = int.from_bytes(data[pos : pos + size], "big")
+        reader = _read_array if marker <= 0xDD else _read_map
+        return reader(data, pos + size, n, depth + 1)
+    raise ValueError(f"Unsupported compact marker 0x{marker:02x}")
+
+
+def _read_array(data: bytes, pos: int, n: int, depth: int) -> Tuple[List[Any], int]:
+    if depth > MAX_DEPTH:
+        raise ValueError("Compact message nested too deeply")
+    items = []
+    for _ in range(n):
+        item, pos = _read(data, pos, depth)
+        items.append(item)
+    return items, pos
+
+
+def _read_map(data: bytes, pos: int, n: int, depth: int) -> Tuple[Dict[str, Any], int]:
+    if depth > MAX_DEPTH:
+        raise ValueError("Compact message nested too deeply")
+    keys = KEYS
+    result: Dict[str, Any] = {}
+    for _ in range(n):
+        marker = data[pos]
+        if marker < 0x80:
+            key = keys[marker]
+            pos += 1
+        else:
+            key, pos = _read(data, pos, depth)
+            if type(key) is not str:
+                raise ValueError("Compact map keys must be strings or key ids")
+        # Same inline fast paths as _write_items.
+        marker = data[pos]
+        if marker < 0x80:
+            result[key] = marker
+            pos += 1
+        elif 0xA0 <= marker < 0xC0:
+            end = pos + 1 + (marker & 0x1F)
+            result[key] = data[pos + 1 : end].decode()
+            pos = end
+        else:
+            result[key], pos = _read(data, pos, depth)
+    return result, pos
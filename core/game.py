@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import itertools
+import random
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Deque, Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
-from .cards import Card, build_deck, deal
+from .cards import Card, build_deck, deal, refill_deck
 from .evaluator import evaluate_best, parse_cards
-from .models import ActionType, Phase, PlayerSeat, TableConfig
+from .instrumentation import EngineHooks
+from .models import ACTION_BITS, ActionType, Phase, PlayerSeat, SeatActionWindow, TableConfig
 
 # GameEngine keeps all table state in memory. No networking lives here—only
 # poker rules, chip accounting, and betting order.
@@ -31,6 +33,49 @@ class HandContext:
     actor_queue: Deque[int] = field(default_factory=deque)
     pre_events: List[Dict[str, object]] = field(default_factory=list)
 
+    def reset(self, hand_id: str, seed: int, button: int, min_raise_increment: int) -> None:
+        # Pooled engines reuse the context; containers are cleared, never replaced.
+        self.hand_id = hand_id
+        self.seed = seed
+        self.button = button
+        self.community.clear()
+        self.phase = Phase.PRE_FLOP
+        self.pot = 0
+        self.current_bet = 0
+        self.min_raise_increment = min_raise_increment
+        self.last_raise_seat = None
+        self.pending_callers.clear()
+        self.actor_queue.clear()
+        self.pre_events.clear()
+
+
+# One (seat, action, amount) entry as fed to GameEngine.apply_actions.
+ActionTuple = Tuple[int, ActionType, Optional[int]]
+
+
+class IllegalActionError(ValueError):
+    """A batched action was rejected; earlier entries in the batch stay applied."""
+
+    def __init__(self, index: int, seat: int, action: object, amount: Optional[int], reason: str) -> None:
+        super().__init__(f"action #{index} (seat {seat} {getattr(action, 'value', action)} {amount}): {reason}")
+        self.index = index
+        self.seat = seat
+        self.action = action
+        self.amount = amount
+        self.reason = reason
+
+
+@dataclass
+class ActionBatchResult:
+    applied: int
+    # Flat event stream for the whole batch; None when the caller opted out.
+    events: Optional[List[Dict[str, object]]]
+    phase: Phase
+    pot: int
+    stacks: List[Optional[int]]
+    next_actor: Optional[int]
+    hand_complete: bool
+
 
 def describe_rank(score: Tuple[int, List[int]]) -> str:
     category, kickers = score
@@ -56,12 +101,35 @@ def describe_rank(score: Tuple[int, List[int]]) -> str:
 class GameEngine:
     """No-Limit Texas Hold'em engine for a single table."""
 
-    def __init__(self, config: TableConfig) -> None:
+    def __init__(
+        self,
+        config: TableConfig,
+        hooks: Optional[Sequence[EngineHooks]] = None,
+        reuse_hands: bool = False,
+    ) -> None:
         self.config = config
         self.seats: List[Optional[PlayerSeat]] = [None] * config.seats
         self.button: Optional[int] = None
         self.hand_counter = 0
         self.hand: Optional[HandContext] = None
+        # Opt-in pooling: start_hand recycles the previous HandContext (deck,
+        # queues, event list) in place, so a context must not be held past the
+        # next start_hand. Dealt cards and events are identical either way.
+        self.reuse_hands = reuse_hands
+        self._pooled_hand: Optional[HandContext] = None
+        self._deck_rng = random.Random()
+        self._window: Optional[SeatActionWindow] = None
+        # Empty tuple keeps the hot paths to a single falsy check.
+        self._hooks: Tuple[EngineHooks, ...] = tuple(hooks or ())
+
+    # Instrumentation -------------------------------------------------
+
+    def add_hooks(self, hooks: EngineHooks) -> None:
+        if hooks not in self._hooks:
+            self._hooks = self._hooks + (hooks,)
+
+    def remove_hooks(self, hooks: EngineHooks) -> None:
+        self._hooks = tuple(h for h in self._hooks if h is not hooks)
 
     # Seat management -------------------------------------------------
 
@@ -77,15 +145,48 @@ class GameEngine:
                 existing.team = team_display
             return existing
 
-        for idx in range(self.config.seats):
-            seat = self.seats[idx]
-            if seat is None:
-                seat = PlayerSeat(seat=idx, team=team_display, team_key=team_key, stack=self.config.starting_stack)
+        return self.seat_player(team_display, self.config.starting_stack)
+
+    def seat_player(self, team: str, stack: int, seat_idx: Optional[int] = None) -> PlayerSeat:
+        """Seat a team with an explicit stack (table moves); first free seat unless given."""
+        team_display = team.strip()
+        if not team_display:
+            raise ValueError("TEAM_REQUIRED")
+        team_key = self._normalize_team(team_display)
+        if self._find_seat_by_key(team_key):
+            raise ValueError("TEAM_ALREADY_SEATED")
+
+        candidates = range(self.config.seats) if seat_idx is None else (seat_idx,)
+        for idx in candidates:
+            if self.seats[idx] is None:
+                seat = PlayerSeat(seat=idx, team=team_display, team_key=team_key, stack=stack)
+                # Joining mid-hand: sit out until the next deal so the seat
+                # never counts as a live opponent in the current pot.
+                seat.has_folded = self.hand is not None and not self.is_hand_complete()
                 self.seats[idx] = seat
+                self._window = None
                 return seat
 
         raise RuntimeError("Table is full")
 
+    def remove_seat(self, seat_idx: int) -> PlayerSeat:
+        """Vacate a seat between hands (bust-outs, table breaks and balancing)."""
+        if self.hand and not self.is_hand_complete():
+            raise RuntimeError("Cannot remove a seat during a hand")
+        seat = self.seats[seat_idx]
+        if seat is None:
+            raise RuntimeError("Seat empty")
+        self.seats[seat_idx] = None
+        self._window = None
+        return seat
+
+    def find_team(self, team: str) -> Optional[PlayerSeat]:
+        """Seat already held by ``team`` (case-insensitive), if any."""
+        return self._find_seat_by_key(self._normalize_team(team))
+
+    def has_open_seat(self) -> bool:
+        return any(seat is None for seat in self.seats)
+
     def _normalize_team(self, team: str) -> str:
         return team.strip().casefold()
 
@@ -98,6 +199,21 @@ class GameEngine:
     def seating_order(self) -> List[int]:
         return [seat.seat for seat in self.seats if seat and seat.stack > 0]
 
+    def next_big_blind_seat(self) -> Optional[int]:
+        """Seat that will post the big blind if a hand started now."""
+        active = self.seating_order()
+        if len(active) < 2:
+            return None
+
+        # Fold flags from the previous hand are still set, so walk stacks only.
+        def following(idx: int) -> int:
+            return next((seat for seat in active if seat > idx), active[0])
+
+        button = active[0] if self.button is None else following(self.button)
+        if len(active) == 2:
+            return following(button)
+        return following(following(button))
+
     # Hand lifecycle --------------------------------------------------
     def can_start_hand(self) -> bool:
         active = [seat for seat in self.seats if seat and seat.stack > 0]
@@ -106,6 +222,10 @@ class GameEngine:
     def start_hand(self, seed: Optional[int] = None) -> HandContext:
         if not self.can_start_hand():
             raise RuntimeError("Not enough active players to start a hand")
+        hooks = self._hooks
+        if hooks:
+            started = time.perf_counter_ns()
+        self._window = None
 
         active = [seat for seat in self.seats if seat and seat.stack > 0]
         for seat in active:
@@ -113,7 +233,6 @@ class GameEngine:
 
         if seed is None:
             seed = int(time.time() * 1000) & 0xFFFFFFFF
-        deck = build_deck(seed)
 
         # Move button
         if self.button is None:
@@ -124,25 +243,48 @@ class GameEngine:
         hand_id = f"H-{time.strftime('%Y%m%d')}-{self.hand_counter:05d}"
         self.hand_counter += 1
 
-        ctx = HandContext(
-            hand_id=hand_id,
-            seed=seed,
-            button=self.button,
-            deck=deck,
-            community=[],
-            phase=Phase.PRE_FLOP,
-            pot=0,
-            current_bet=0,
-            min_raise_increment=self.config.bb,
-            last_raise_seat=None,
-            pending_callers=set(),
-            actor_queue=deque(),
-        )
+        if self.reuse_hands:
+            ctx = self._checkout_hand(hand_id, seed, self.button)
+        else:
+            ctx = HandContext(
+                hand_id=hand_id,
+                seed=seed,
+                button=self.button,
+                deck=build_deck(seed),
+                community=[],
+                phase=Phase.PRE_FLOP,
+                pot=0,
+                current_bet=0,
+                min_raise_increment=self.config.bb,
+                last_raise_seat=None,
+                pending_callers=set(),
+                actor_queue=deque(),
+            )
 
         self._deal_hole_cards(ctx)
         self._post_blinds(ctx)
         self._setup_betting_round(ctx, preflop=True)
         self.hand = ctx
+        if hooks:
+            elapsed = time.perf_counter_ns() - started
+            for hook in hooks:
+                hook.on_hand_start(self, ctx, elapsed)
+        return ctx
+
+    def _checkout_hand(self, hand_id: str, seed: int, button: int) -> HandContext:
+        ctx = self._pooled_hand
+        if ctx is not None:
+            ctx.reset(hand_id, seed, button, self.config.bb)
+            refill_deck(ctx.deck, seed, self._deck_rng)
+        else:
+            ctx = HandContext(
+                hand_id=hand_id,
+                seed=seed,
+                button=button,
+                deck=refill_deck([], seed, self._deck_rng),
+                min_raise_increment=self.config.bb,
+            )
+        self._pooled_hand = ctx
         return ctx
 
     def _deal_hole_cards(self, ctx: HandContext) -> None:
@@ -255,14 +397,28 @@ class GameEngine:
 
     # Action handling -------------------------------------------------
     def legal_actions(self, seat_idx: int) -> Tuple[List[ActionType], Optional[int], Optional[int], Optional[int]]:
+        return self.action_window(seat_idx).as_tuple()
+
+    def action_window(self, seat_idx: int) -> SeatActionWindow:
+        """Legal moves plus call/raise bounds, computed once per turn and cached.
+
+        The cache is dropped whenever engine state moves (apply_action,
+        start_hand, seat changes), so every prompt path shares one window.
+        """
         if not self.hand:
             raise RuntimeError("Hand not in progress")
-        ctx = self.hand
+        window = self._window
+        if window is not None and window.seat == seat_idx:
+            return window
+        window = self._window = self._compute_window(self.hand, seat_idx)
+        return window
+
+    def _compute_window(self, ctx: HandContext, seat_idx: int) -> SeatActionWindow:
         seat = self.seats[seat_idx]
         if seat is None or seat.has_folded:
             raise RuntimeError("Seat not active")
 
-        # Return every legal move plus helper numbers (amount to call, min/max raise).
+        # Every legal move plus helper numbers (amount to call, min/max raise).
         legal: List[ActionType] = [ActionType.FOLD]
         call_amount = ctx.current_bet - seat.committed
         if call_amount <= 0:
@@ -285,11 +441,33 @@ class GameEngine:
                 min_raise_to = max_raise_to
                 legal.append(ActionType.RAISE_TO)
 
-        return legal, (call_amount if call_amount and call_amount > 0 else None), min_raise_to, max_raise_to
+        mask = 0
+        for action in legal:
+            mask |= ACTION_BITS[action]
+        return SeatActionWindow(
+            seat=seat_idx,
+            legal=tuple(legal),
+            call_amount=call_amount if call_amount and call_amount > 0 else None,
+            min_raise_to=min_raise_to,
+            max_raise_to=max_raise_to,
+            mask=mask,
+        )
 
     def apply_action(self, seat_idx: int, action: ActionType, amount: Optional[int]) -> List[Dict[str, object]]:
+        hooks = self._hooks
+        if not hooks:
+            return self._apply_action(seat_idx, action, amount)
+        started = time.perf_counter_ns()
+        events = self._apply_action(seat_idx, action, amount)
+        elapsed = time.perf_counter_ns() - started
+        for hook in hooks:
+            hook.on_action(self, seat_idx, action, events, elapsed)
+        return events
+
+    def _apply_action(self, seat_idx: int, action: ActionType, amount: Optional[int]) -> List[Dict[str, object]]:
         if not self.hand:
             raise RuntimeError("Hand not active")
+        self._window = None
         ctx = self.hand
         seat = self.seats[seat_idx]
         if seat is None or seat.has_folded:
@@ -336,11 +514,12 @@ class GameEngine:
             if not short_all_in:
                 ctx.min_raise_increment = amount - previous_bet
                 ctx.last_raise_seat = seat_idx
-            ctx.pending_callers = {
+            ctx.pending_callers.clear()
+            ctx.pending_callers.update(
                 s
                 for s in self._active_seats()
                 if s != seat_idx and self.seats[s] and self.seats[s].stack > 0
-            }
+            )
             events.append({"ev": "BET", "seat": seat_idx, "amount": additional})
         else:
             raise ValueError(f"Unsupported action {action}")
@@ -351,6 +530,50 @@ class GameEngine:
         events.extend(self._advance_after_action(ctx))
         return events
 
+    def apply_actions(self, actions: Sequence[ActionTuple], collect_events: bool = True) -> ActionBatchResult:
+        """Apply a run of actions in order, e.g. when replaying a stored hand.
+
+        Each entry must belong to the seat whose turn it is. The first illegal
+        entry raises IllegalActionError carrying its index; everything before
+        it has already been applied. With ``collect_events=False`` only the
+        final state summary is returned.
+        """
+        ctx = self.hand
+        if not ctx:
+            raise RuntimeError("Hand not in progress")
+        hooks = self._hooks
+        apply = self.apply_action if hooks else self._apply_action
+        queue = ctx.actor_queue
+        seats = self.seats
+        events: Optional[List[Dict[str, object]]] = [] if collect_events else None
+        applied = 0
+        for index, (seat_idx, action, amount) in enumerate(actions):
+            # Same pruning as next_actor(), inlined for the hot loop.
+            while queue and (seats[queue[0]] is None or seats[queue[0]].has_folded):
+                queue.popleft()
+            if not queue:
+                raise IllegalActionError(index, seat_idx, action, amount, "no action pending")
+            if queue[0] != seat_idx:
+                raise IllegalActionError(index, seat_idx, action, amount, f"seat {queue[0]} is to act")
+            try:
+                action = ActionType(action)
+                produced = apply(seat_idx, action, amount)
+            except ValueError as exc:
+                raise IllegalActionError(index, seat_idx, action, amount, str(exc)) from None
+            if events is not None:
+                events.extend(produced)
+            applied += 1
+
+        return ActionBatchResult(
+            applied=applied,
+            events=events,
+            phase=ctx.phase,
+            pot=ctx.pot,
+            stacks=[seat.stack if seat else None for seat in seats],
+            next_actor=self.next_actor(),
+            hand_complete=self.is_hand_complete(),
+        )
+
     def _advance_after_action(self, ctx: HandContext) -> List[Dict[str, object]]:
         events: List[Dict[str, object]] = []
         active = self._active_seats()
@@ -359,9 +582,17 @@ class GameEngine:
             winner = self.seats[winner_idx]
             assert winner
             if ctx.pot > 0:
+                hooks = self._hooks
+                if hooks:
+                    started = time.perf_counter_ns()
                 winner.stack += ctx.pot
-                events.append({"ev": "POT_AWARD", "seat": winner_idx, "amount": ctx.pot})
+                award = {"ev": "POT_AWARD", "seat": winner_idx, "amount": ctx.pot}
+                events.append(award)
                 ctx.pot = 0
+                if hooks:
+                    elapsed = time.perf_counter_ns() - started
+                    for hook in hooks:
+                        hook.on_pots_awarded(self, [award], elapsed)
             ctx.phase = Phase.SHOWDOWN
             ctx.pending_callers.clear()
             ctx.actor_queue.clear()
@@ -393,6 +624,9 @@ class GameEngine:
 
         progressed = False
         while True:
+            hooks = self._hooks
+            if hooks:
+                started = time.perf_counter_ns()
             if ctx.phase == Phase.PRE_FLOP:
                 ctx.phase = Phase.FLOP
                 cards = deal(ctx.deck, 3)
@@ -411,9 +645,17 @@ class GameEngine:
             else:
                 ctx.phase = Phase.SHOWDOWN
                 events.extend(self._resolve_showdown(ctx))
+                if hooks:
+                    elapsed = time.perf_counter_ns() - started
+                    for hook in hooks:
+                        hook.on_showdown(self, ctx, elapsed)
                 return events
 
             progressed = True
+            if hooks:
+                elapsed = time.perf_counter_ns() - started
+                for hook in hooks:
+                    hook.on_phase_advanced(self, ctx.phase, elapsed)
 
             for seat_idx in self._active_seats():
                 seat = self.seats[seat_idx]
@@ -423,14 +665,16 @@ class GameEngine:
             ctx.current_bet = 0
             ctx.min_raise_increment = self.config.bb
             ctx.last_raise_seat = None
-            ctx.pending_callers = {
+            ctx.pending_callers.clear()
+            ctx.pending_callers.update(
                 s
                 for s in self._active_seats()
                 if self.seats[s] and self.seats[s].stack > 0
-            }
+            )
             if ctx.pending_callers:
                 start = self._next_active_seat(ctx.button)
-                ctx.actor_queue = deque(self._rotation_from(start))
+                ctx.actor_queue.clear()
+                ctx.actor_queue.extend(self._rotation_from(start))
                 break
 
             # No players with chips left → continue revealing to showdown.
@@ -500,7 +744,7 @@ class GameEngine:
         if seat is None:
             raise RuntimeError("Seat empty")
 
-        legal, call_amount, min_raise_to, max_raise_to = self.legal_actions(seat_idx)
+        window = self.action_window(seat_idx)
         to_call = max(ctx.current_bet - seat.committed, 0)
 
         return {
@@ -534,10 +778,10 @@ class GameEngine:
                 if s is not None
             ],
             "community": [card.label for card in ctx.community],
-            "legal": [action.value for action in legal],
-            "call_amount": call_amount,
-            "min_raise_to": min_raise_to,
-            "max_raise_to": max_raise_to,
+            "legal": [action.value for action in window.legal],
+            "call_amount": window.call_amount,
+            "min_raise_to": window.min_raise_to,
+            "max_raise_to": window.max_raise_to,
         }
 
     def snapshot_payload(self, seat_idx: int, time_ms_remaining: int) -> Dict[str, object]:
@@ -549,7 +793,6 @@ class GameEngine:
             raise RuntimeError("Seat empty")
 
         next_actor = self.next_actor()
-        legal, call_amount, min_raise_to, max_raise_to = self.legal_actions(seat_idx)
 
         payload = {
             "at_hand_id": ctx.hand_id,
@@ -576,10 +819,11 @@ class GameEngine:
         }
 
         if next_actor == seat_idx:
-            payload["legal"] = [action.value for action in legal]
-            payload["call_amount"] = call_amount
-            payload["min_raise_to"] = min_raise_to
-            payload["max_raise_to"] = max_raise_to
+            window = self.action_window(seat_idx)
+            payload["legal"] = [action.value for action in window.legal]
+            payload["call_amount"] = window.call_amount
+            payload["min_raise_to"] = window.min_raise_to
+            payload["max_raise_to"] = window.max_raise_to
 
         return payload
 
@@ -672,6 +916,10 @@ class GameEngine:
                 }
             )
 
+        hooks = self._hooks
+        if hooks:
+            award_started = time.perf_counter_ns()
+            first_award = len(events)
         for pot_value, contenders in self._build_side_pots():
             if pot_value <= 0 or not contenders:
                 continue
@@ -685,6 +933,10 @@ class GameEngine:
                     seat.stack += payout
                 events.append({"ev": "POT_AWARD", "seat": seat_idx, "amount": payout})
             ctx.pot -= pot_value
+        if hooks:
+            elapsed = time.perf_counter_ns() - award_started
+            for hook in hooks:
+                hook.on_pots_awarded(self, events[first_award:], elapsed)
 
         eliminated = [seat.seat for seat in self.seats if seat and seat.stack == 0]
         for seat_idx in eliminated:
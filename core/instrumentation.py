@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from .models import ActionType, Phase
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .game import GameEngine, HandContext
+
+# Optional observers for GameEngine. The engine only reads the clock when at
+# least one hook is registered, so an unobserved table pays a single truthiness
+# check per call and nothing else.
+
+
+class EngineHooks:
+    """Base observer. Override the callbacks you care about; timings are in ns."""
+
+    def on_hand_start(self, engine: "GameEngine", ctx: "HandContext", elapsed_ns: int) -> None:
+        pass
+
+    def on_action(
+        self,
+        engine: "GameEngine",
+        seat_idx: int,
+        action: ActionType,
+        events: List[Dict[str, object]],
+        elapsed_ns: int,
+    ) -> None:
+        pass
+
+    def on_phase_advanced(self, engine: "GameEngine", phase: Phase, elapsed_ns: int) -> None:
+        pass
+
+    def on_showdown(self, engine: "GameEngine", ctx: "HandContext", elapsed_ns: int) -> None:
+        pass
+
+    def on_pots_awarded(
+        self,
+        engine: "GameEngine",
+        awards: List[Dict[str, object]],
+        elapsed_ns: int,
+    ) -> None:
+        pass
+
+
+# Upper bucket bounds in microseconds; the last bucket catches everything else.
+DEFAULT_BUCKETS_US: Sequence[float] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 50_000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative-friendly, Prometheus style)."""
+
+    __slots__ = ("bounds_us", "counts", "count", "total_ns", "max_ns")
+
+    def __init__(self, bounds_us: Sequence[float] = DEFAULT_BUCKETS_US) -> None:
+        self.bounds_us = tuple(bounds_us)
+        self.counts = [0] * (len(self.bounds_us) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe_ns(self, elapsed_ns: int) -> None:
+        self.counts[bisect.bisect_left(self.bounds_us, elapsed_ns / 1_000)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def mean_us(self) -> float:
+        return (self.total_ns / self.count) / 1_000 if self.count else 0.0
+
+    def quantile_us(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (None if empty)."""
+        if not self.count:
+            return None
+        target = max(1, int(q * self.count + 0.999999))
+        running = 0
+        for idx, bucket in enumerate(self.counts):
+            running += bucket
+            if running >= target:
+                if idx < len(self.bounds_us):
+                    return float(self.bounds_us[idx])
+                return self.max_ns / 1_000
+        return self.max_ns / 1_000
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "mean_us": round(self.mean_us(), 3),
+            "p50_us": self.quantile_us(0.5),
+            "p99_us": self.quantile_us(0.99),
+            "max_us": round(self.max_ns / 1_000, 3),
+            "buckets_us": list(self.bounds_us),
+            "counts": list(self.counts),
+        }
+
+
+@dataclass
+class TableEngineStats:
+    table_id: str
+    counters: Dict[str, int] = field(default_factory=dict)
+    latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+
+    def bump(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, elapsed_ns: int) -> None:
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = LatencyHistogram()
+        histogram.observe_ns(elapsed_ns)
+
+    def engine_time_ns(self) -> int:
+        # Hand setup plus action handling covers every engine entry point;
+        # phase/showdown/award timings are nested inside apply_action.
+        return sum(self.latency[name].total_ns for name in ("hand_start", "apply_action") if name in self.latency)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "table_id": self.table_id,
+            "engine_time_ms": round(self.engine_time_ns() / 1_000_000, 3),
+            "counters": dict(self.counters),
+            "latency": {name: hist.as_dict() for name, hist in self.latency.items()},
+        }
+
+
+class _TableStatsHooks(EngineHooks):
+    def __init__(self, stats: TableEngineStats) -> None:
+        self.stats = stats
+
+    def on_hand_start(self, engine, ctx, elapsed_ns):
+        self.stats.bump("hands")
+        self.stats.observe("hand_start", elapsed_ns)
+
+    def on_action(self, engine, seat_idx, action, events, elapsed_ns):
+        self.stats.bump("actions")
+        self.stats.bump(f"actions.{action.value}")
+        self.stats.observe("apply_action", elapsed_ns)
+
+    def on_phase_advanced(self, engine, phase, elapsed_ns):
+        self.stats.bump(f"phases.{phase.value}")
+        self.stats.observe("phase_advance", elapsed_ns)
+
+    def on_showdown(self, engine, ctx, elapsed_ns):
+        self.stats.bump("showdowns")
+        self.stats.observe("showdown", elapsed_ns)
+
+    def on_pots_awarded(self, engine, awards, elapsed_ns):
+        self.stats.bump("pot_awards", len(awards))
+        self.stats.bump("chips_awarded", sum(int(award.get("amount", 0)) for award in awards))
+        self.stats.observe("pot_award", elapsed_ns)
+
+
+class EngineStatsCollector:
+    """Aggregates engine counters and latency histograms, one bucket per table."""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, TableEngineStats] = {}
+
+    def hooks_for(self, table_id: str) -> EngineHooks:
+        stats = self.tables.get(table_id)
+        if stats is None:
+            stats = self.tables[table_id] = TableEngineStats(table_id=table_id)
+        return _TableStatsHooks(stats)
+
+    def attach(self, engine: "GameEngine", table_id: str) -> EngineHooks:
+        hooks = self.hooks_for(table_id)
+        engine.add_hooks(hooks)
+        return hooks
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {table_id: stats.as_dict() for table_id, stats in self.tables.items()}
+
+    def summary_line(self, table_id: str) -> str:
+        stats = self.tables.get(table_id)
+        if stats is None:
+            return f"table={table_id} no engine samples"
+        action_hist = stats.latency.get("apply_action")
+        return (
+            f"table={table_id} hands={stats.counters.get('hands', 0)} "
+            f"actions={stats.counters.get('actions', 0)} "
+            f"engine_ms={stats.engine_time_ns() / 1_000_000:.2f} "
+            f"apply_mean_us={action_hist.mean_us() if action_hist else 0.0:.1f} "
+            f"apply_p99_us={action_hist.quantile_us(0.99) if action_hist else None}"
+        )
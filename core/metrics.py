@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .instrumentation import DEFAULT_BUCKETS_US, LatencyHistogram
+
+# Minimal Prometheus text-format registry (exposition format 0.0.4) so both
+# hosts can serve /metrics without a client library. Counters, gauges and
+# histograms are label-keyed families; collectors compute gauges at scrape
+# time from live host state (queue depths, connections) instead of being
+# updated on every change.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bot think time spans milliseconds to the whole move clock, far past the
+# engine-sized DEFAULT_BUCKETS_US.
+ACT_RTT_BUCKETS_US: Sequence[float] = (
+    1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 30_000_000,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Sample = Tuple[Dict[str, object], float]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        self.values[_label_key(labels)] = value
+
+
+class Histogram:
+    """Label-keyed LatencyHistograms rendered with ``le`` bounds in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, bounds_us: Sequence[float] = DEFAULT_BUCKETS_US) -> None:
+        self.name = name
+        self.help = help_text
+        self.bounds_us = tuple(bounds_us)
+        self.values: Dict[LabelKey, LatencyHistogram] = {}
+
+    def observe_ns(self, elapsed_ns: int, **labels: object) -> None:
+        key = _label_key(labels)
+        histogram = self.values.get(key)
+        if histogram is None:
+            histogram = self.values[key] = LatencyHistogram(self.bounds_us)
+        histogram.observe_ns(elapsed_ns)
+
+    def get(self, **labels: object) -> Optional[LatencyHistogram]:
+        return self.values.get(_label_key(labels))
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        for key, histogram in self.values.items():
+            running = 0
+            for bound, count in zip(histogram.bounds_us, histogram.counts):
+                running += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', repr(bound / 1e6)))} {running}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {repr(histogram.total_ns / 1e9)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {histogram.count}")
+        return lines
+
+
+class RateMeter:
+    """Events per second over a sliding window (e.g. hands/sec)."""
+
+    def __init__(self, window_s: float = 60.0) -> None:
+        self.window_s = window_s
+        self._marks: Deque[float] = deque()
+        self._started = time.monotonic()
+
+    def mark(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._marks.append(now)
+        self._trim(now)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self._trim(now)
+        span = min(self.window_s, now - self._started)
+        return len(self._marks) / span if span > 0 else 0.0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_s
+        while self._marks and self._marks[0] < cutoff:
+            self._marks.popleft()
+
+
+Collector = Callable[[], Iterable[Sample]]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._families: Dict[str, object] = {}
+        self._collected: List[Tuple[str, str, str, Collector]] = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, bounds_us: Sequence[float] = DEFAULT_BUCKETS_US) -> Histogram:
+        return self._register(Histogram(name, help_text, bounds_us))
+
+    def collect(self, name: str, kind: str, help_text: str, collector: Collector) -> None:
+        """Register samples computed at scrape time; ``collector`` yields (labels, value)."""
+        self._collected.append((name, kind, help_text, collector))
+
+    def _register(self, family):  # type: ignore[no-untyped-def]
+        existing = self._families.get(family.name)
+        if existing is not None:
+            if type(existing) is not type(family):
+                raise ValueError(f"Metric {family.name} already registered as {existing.kind}")  # type: ignore[attr-defined]
+            return existing
+        self._families[family.name] = family
+        return family
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families.values():
+            lines.append(f"# HELP {family.name} {family.help}")  # type: ignore[attr-defined]
+            lines.append(f"# TYPE {family.name} {family.kind}")  # type: ignore[attr-defined]
+            lines.extend(family.render())  # type: ignore[attr-defined]
+        grouped: Dict[str, Tuple[str, str, List[Collector]]] = {}
+        for name, kind, help_text, collector in self._collected:
+            grouped.setdefault(name, (kind, help_text, []))[2].append(collector)
+        for name, (kind, help_text, collectors) in grouped.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for collector in collectors:
+                for labels, value in collector():
+                    lines.append(f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def merge_expositions(parts: Iterable[Tuple[Dict[str, str], str]]) -> str:
+    """Merge Prometheus text from several registries, adding each part's labels to its samples.
+
+    Families that appear in more than one part are written once, with every
+    part's samples under a single HELP/TYPE header.
+    """
+    families: Dict[str, Tuple[List[str], List[str]]] = {}
+    for labels, text in parts:
+        prefix = ",".join(f'{name}="{_escape(str(value))}"' for name, value in sorted(labels.items()))
+        family = None
+        for line in text.splitlines():
+            if line.startswith("# "):
+                fields = line.split(" ", 3)
+                if len(fields) >= 3 and fields[1] in ("HELP", "TYPE"):
+                    family = fields[2]
+                    header = families.setdefault(family, ([], []))[0]
+                    if not any(seen.startswith(f"# {fields[1]} ") for seen in header):
+                        header.append(line)
+                continue
+            if not line.strip() or family is None:
+                continue
+            if prefix:
+                name, brace, rest = line.partition("{")
+                if not brace:
+                    name, _, value = line.partition(" ")
+                    line = f"{name}{{{prefix}}} {value}"
+                else:
+                    line = f"{name}{{{prefix}{'' if rest.startswith('}') else ','}{rest}"
+            families[family][1].append(line)
+    lines: List[str] = []
+    for header, samples in families.values():
+        lines.extend(header)
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
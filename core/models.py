@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class Phase(str, Enum):
@@ -71,12 +71,29 @@ class ActionRequest:
     amount: Optional[int] = None
 
 
-@dataclass
+# Bit per action so policy code can test legality with a single AND.
+ACTION_BITS: Dict[ActionType, int] = {
+    ActionType.FOLD: 1,
+    ActionType.CHECK: 2,
+    ActionType.CALL: 4,
+    ActionType.RAISE_TO: 8,
+}
+
+
+@dataclass(frozen=True)
 class SeatActionWindow:
-    legal: List[ActionType]
+    seat: int
+    legal: Tuple[ActionType, ...]
     call_amount: Optional[int]
     min_raise_to: Optional[int]
     max_raise_to: Optional[int]
+    mask: int
+
+    def allows(self, action: ActionType) -> bool:
+        return bool(self.mask & ACTION_BITS[action])
+
+    def as_tuple(self) -> Tuple[List[ActionType], Optional[int], Optional[int], Optional[int]]:
+        return list(self.legal), self.call_amount, self.min_raise_to, self.max_raise_to
 
 
 @dataclass
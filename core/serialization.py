@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Union
+
+try:  # Optional accelerated backend; the stdlib encoder is always available.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+# One place for JSON on the wire. Hosts, bots and tools call dumps()/loads()
+# (or a Serializer picked by name) instead of the json module, so the backend
+# can change without touching callers. Both backends write compact JSON
+# without ASCII escaping, so clients cannot tell which one is running.
+#
+# POKER_SERIALIZER=json|orjson|auto (default auto: orjson when installed).
+# The process-wide default is resolved on first use, not at import, and an
+# unusable value falls back to the stdlib backend with a warning, so a typo
+# in the environment cannot break every module that imports this one.
+
+LOGGER = logging.getLogger(__name__)
+
+SERIALIZER_ENV = "POKER_SERIALIZER"
+
+Raw = Union[str, bytes, bytearray, memoryview]
+
+
+class Serializer:
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def loads(self, raw: Raw) -> Any:
+        if isinstance(raw, memoryview):
+            raw = raw.tobytes()
+        return json.loads(raw)
+
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        # Seat-indexed dicts use int keys; the stdlib backend accepts them too.
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj, option=self._options).decode()
+
+    def loads(self, raw: Raw) -> Any:
+        return self._loads(raw)
+
+
+SERIALIZERS: Dict[str, Callable[[], Serializer]] = {"json": Serializer, "orjson": OrjsonSerializer}
+
+
+def available_serializers() -> list:
+    return ["json"] + (["orjson"] if orjson is not None else [])
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """Serializer by name; ``None`` reads POKER_SERIALIZER and falls back to the fastest available."""
+    choice = (name or os.environ.get(SERIALIZER_ENV) or "auto").strip().lower()
+    if choice == "auto":
+        choice = "orjson" if orjson is not None else "json"
+    factory = SERIALIZERS.get(choice)
+    if factory is None:
+        raise ValueError(f"Unknown serializer {choice!r}; choose from {', '.join(SERIALIZERS)}")
+    return factory()
+
+
+_DEFAULT: Optional[Serializer] = None
+
+
+def default_serializer() -> Serializer:
+    """The process-wide serializer from POKER_SERIALIZER; json (with a warning) when that is unusable."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        try:
+            _DEFAULT = get_serializer()
+        except (ValueError, RuntimeError) as exc:
+            LOGGER.warning("Ignoring %s=%r (%s); using json", SERIALIZER_ENV, os.environ.get(SERIALIZER_ENV), exc)
+            _DEFAULT = Serializer()
+    return _DEFAULT
+
+
+def dumps(obj: Any) -> str:
+    return (_DEFAULT or default_serializer()).dumps(obj)
+
+
+def loads(raw: Raw) -> Any:
+    return (_DEFAULT or default_serializer()).loads(raw)
+
+
+class TickClock:
+    """UTC ISO-8601 timestamps recomputed at most once per ``tick_s``.
+
+    Every message built within one tick (typically one table update fanned out
+    to all clients) shares the same string instead of formatting a fresh
+    datetime each time.
+    """
+
+    def __init__(self, tick_s: float = 0.001, clock: Callable[[], float] = time.time) -> None:
+        self.tick_s = tick_s
+        self._clock = clock
+        self._stamp = float("-inf")
+        self._value = ""
+
+    def now_iso(self) -> str:
+        now = self._clock()
+        if now - self._stamp >= self.tick_s:
+            self._stamp = now
+            self._value = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        return self._value
+
+
+class EnvelopeEncoder:
+    """Encodes ``{"type", "v", "ts", ...payload}`` envelopes.
+
+    The ``{"type":...,"v":1,"ts":"`` head is built once per message type and
+    the payload is encoded on its own, so no merged dict is built per message.
+    ``fragments`` maps keys to values that were encoded ahead of time (for
+    example a table config that never changes) and are spliced in verbatim.
+    Payload keys must not repeat the envelope's own.
+    """
+
+    def __init__(self, serializer: Optional[Serializer] = None, clock: Optional[TickClock] = None) -> None:
+        self.serializer = serializer or default_serializer()
+        self.clock = clock or TickClock()
+        self._heads: Dict[str, str] = {}
+
+    def encode(
+        self,
+        msg_type: str,
+        payload: Dict[str, Any],
+        *,
+        log_seq: Optional[int] = None,
+        fragments: Optional[Dict[str, str]] = None,
+    ) -> str:
+        head = self._heads.get(msg_type)
+        if head is None:
+            head = self._heads[msg_type] = '{"type":' + self.serializer.dumps(msg_type) + ',"v":1,"ts":"'
+        parts = [head, self.clock.now_iso(), '"']
+        if log_seq is not None:
+            parts.append(f',"log_seq":{log_seq}')
+        if payload:
+            parts.append(",")
+            parts.append(self.serializer.dumps(payload)[1:-1])
+        if fragments:
+            for key, raw in fragments.items():
+                parts.append(f',"{key}":{raw}')
+        parts.append("}")
+        return "".join(parts)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .game import GameEngine
+from .models import ActionType, TableConfig
+
+# TournamentEngine runs a multi-table event on top of one GameEngine per
+# table: seating, bust-outs, table breaking/balancing and blind levels. Like
+# GameEngine it is pure Python with no networking, so structure tests can
+# play thousands of events headlessly.
+
+Policy = Callable[[GameEngine, int], Tuple[ActionType, Optional[int]]]
+
+
+@dataclass(frozen=True)
+class BlindLevel:
+    sb: int
+    bb: int
+    rounds: int  # how many table rounds (one hand on every table) the level lasts
+
+
+@dataclass(frozen=True)
+class BlindSchedule:
+    levels: Tuple[BlindLevel, ...]
+
+    @classmethod
+    def doubling(cls, sb: int, bb: int, rounds: int, count: int = 20) -> "BlindSchedule":
+        return cls(tuple(BlindLevel(sb * 2**idx, bb * 2**idx, rounds) for idx in range(count)))
+
+    def level_index(self, rounds_played: int) -> int:
+        elapsed = 0
+        for idx, level in enumerate(self.levels):
+            elapsed += level.rounds
+            if rounds_played < elapsed:
+                return idx
+        return len(self.levels) - 1
+
+
+@dataclass
+class TableMove:
+    team: str
+    from_table: str
+    to_table: str
+    seat: int
+    reason: str  # "break" or "balance"
+
+
+@dataclass
+class TournamentResult:
+    # Finishing order, champion first.
+    standings: List[str]
+    rounds: int
+    hands: int
+    moves: List[TableMove] = field(default_factory=list)
+    final_level: int = 0
+
+
+def check_call_policy(engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Optional[int]]:
+    window = engine.action_window(seat_idx)
+    if window.allows(ActionType.CHECK):
+        return ActionType.CHECK, None
+    if window.allows(ActionType.CALL):
+        return ActionType.CALL, None
+    return ActionType.FOLD, None
+
+
+class TournamentEngine:
+    """Multi-table No-Limit Hold'em tournament built from per-table GameEngines."""
+
+    def __init__(
+        self,
+        config: TableConfig,
+        schedule: BlindSchedule,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not schedule.levels:
+            raise ValueError("Blind schedule needs at least one level")
+        self.base_config = config
+        self.schedule = schedule
+        self.rng = random.Random(seed)
+        self.tables: Dict[str, GameEngine] = {}
+        self.level = 0
+        self.rounds_played = 0
+        self.hands_played = 0
+        self.moves: List[TableMove] = []
+        self.busted: List[str] = []  # bust order, first out first
+        self._table_counter = 0
+
+    # Seating -----------------------------------------------------------
+
+    def seat_entrants(self, teams: Sequence[str]) -> None:
+        if self.tables:
+            raise RuntimeError("Entrants already seated")
+        if len(teams) < 2:
+            raise ValueError("Need at least two entrants")
+        order = list(teams)
+        self.rng.shuffle(order)
+        table_count = math.ceil(len(order) / self.base_config.seats)
+        engines = [self._open_table() for _ in range(table_count)]
+        # Deal entrants round-robin so table sizes differ by at most one.
+        for idx, team in enumerate(order):
+            engines[idx % table_count].seat_player(team, self.base_config.starting_stack)
+
+    def _open_table(self) -> GameEngine:
+        self._table_counter += 1
+        table_id = f"T-{self._table_counter}"
+        level = self.schedule.levels[self.level]
+        engine = GameEngine(replace(self.base_config, sb=level.sb, bb=level.bb), reuse_hands=True)
+        self.tables[table_id] = engine
+        return engine
+
+    def players_remaining(self) -> int:
+        return sum(len(self._seated(engine)) for engine in self.tables.values())
+
+    def table_sizes(self) -> Dict[str, int]:
+        return {table_id: len(self._seated(engine)) for table_id, engine in self.tables.items()}
+
+    def is_complete(self) -> bool:
+        return self.players_remaining() <= 1
+
+    @staticmethod
+    def _seated(engine: GameEngine) -> List[int]:
+        return [seat.seat for seat in engine.seats if seat is not None]
+
+    # Play --------------------------------------------------------------
+
+    def play_round(self, policy: Policy = check_call_policy) -> int:
+        """Play one hand on every table that can deal, then settle the field."""
+        played = 0
+        for engine in list(self.tables.values()):
+            if not engine.can_start_hand():
+                continue
+            opening = {seat.seat: seat.stack for seat in engine.seats if seat}
+            engine.start_hand(seed=self.rng.getrandbits(32))
+            engine.consume_pre_events()
+            while not engine.is_hand_complete():
+                actor = engine.next_actor()
+                if actor is None:
+                    break
+                action, amount = policy(engine, actor)
+                engine.apply_action(actor, action, amount)
+            engine.hand = None
+            played += 1
+            self._remove_busted(engine, opening)
+        self.hands_played += played
+        self.rounds_played += 1
+        self._rebalance()
+        self._apply_level()
+        return played
+
+    def run(self, policy: Policy = check_call_policy, max_rounds: int = 100_000) -> TournamentResult:
+        while not self.is_complete() and self.rounds_played < max_rounds:
+            self.play_round(policy)
+        survivors = sorted(
+            (seat for engine in self.tables.values() for seat in engine.seats if seat),
+            key=lambda seat: seat.stack,
+            reverse=True,
+        )
+        standings = [seat.team for seat in survivors] + list(reversed(self.busted))
+        return TournamentResult(
+            standings=standings,
+            rounds=self.rounds_played,
+            hands=self.hands_played,
+            moves=list(self.moves),
+            final_level=self.level,
+        )
+
+    def _remove_busted(self, engine: GameEngine, opening: Dict[int, int]) -> None:
+        busted = [seat for seat in engine.seats if seat is not None and seat.stack == 0]
+        # Same-hand bust-outs: the bigger starting stack finishes higher.
+        busted.sort(key=lambda seat: opening.get(seat.seat, 0))
+        for seat in busted:
+            engine.remove_seat(seat.seat)
+            self.busted.append(seat.team)
+
+    # Balancing ---------------------------------------------------------
+
+    def _rebalance(self) -> None:
+        remaining = self.players_remaining()
+        if remaining <= 1:
+            return
+        needed = max(1, math.ceil(remaining / self.base_config.seats))
+        while len(self.tables) > needed:
+            self._break_table(self._smallest_table())
+        while True:
+            sizes = self.table_sizes()
+            largest = max(sizes, key=lambda table_id: (sizes[table_id], table_id))
+            smallest = self._smallest_table()
+            if sizes[largest] - sizes[smallest] <= 1:
+                return
+            self._move_player(largest, smallest, reason="balance")
+
+    def _smallest_table(self) -> str:
+        sizes = self.table_sizes()
+        # Ties break the highest-numbered table first (it opened last).
+        return min(sizes, key=lambda table_id: (sizes[table_id], -int(table_id.split("-")[1])))
+
+    def _break_table(self, table_id: str) -> None:
+        engine = self.tables[table_id]
+        for seat_idx in self._seated(engine):
+            sizes = self.table_sizes()
+            del sizes[table_id]
+            target = min(sizes, key=lambda other: (sizes[other], other))
+            self._move_player(table_id, target, reason="break", seat_idx=seat_idx)
+        del self.tables[table_id]
+
+    def _move_player(self, source: str, target: str, *, reason: str, seat_idx: Optional[int] = None) -> None:
+        source_engine = self.tables[source]
+        if seat_idx is None:
+            # Move the player due for the big blind so nobody skips or repeats blinds.
+            seat_idx = source_engine.next_big_blind_seat()
+            if seat_idx is None:
+                seat_idx = self._seated(source_engine)[0]
+        player = source_engine.remove_seat(seat_idx)
+        placed = self.tables[target].seat_player(player.team, player.stack)
+        self.moves.append(
+            TableMove(team=player.team, from_table=source, to_table=target, seat=placed.seat, reason=reason)
+        )
+
+    # Blinds ------------------------------------------------------------
+
+    def _apply_level(self) -> None:
+        level_idx = self.schedule.level_index(self.rounds_played)
+        if level_idx == self.level:
+            return
+        self.level = level_idx
+        level = self.schedule.levels[level_idx]
+        for engine in self.tables.values():
+            engine.config = replace(engine.config, sb=level.sb, bb=level.bb)
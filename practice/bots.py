@@ -37,7 +37,7 @@ def _rough_hand_strength(hole: list[str]) -> int:
     return score
 
 
-def _should_raise(strength: int, phase: Phase, facing_bet: bool) -> bool:
+def _should_raise(strength: int, phase: Phase, facing_bet: bool, rng: random.Random = _RNG) -> bool:
     # Encourage more post-flop barreling and occasional light opens.
     base = 0.2 if facing_bet else 0.35
     phase_bonus = {
@@ -52,13 +52,14 @@ def _should_raise(strength: int, phase: Phase, facing_bet: bool) -> bool:
     # Always attack with premium holdings.
     if strength >= 36:
         return True
-    return _RNG.random() < probability
+    return rng.random() < probability
 
 
 def _choose_raise_amount(
     min_raise_to: Optional[int],
     max_raise_to: Optional[int],
     facing_bet: bool,
+    rng: random.Random = _RNG,
 ) -> int:
     if min_raise_to is None:
         raise ValueError("Raise requested without a minimum amount")
@@ -66,7 +67,7 @@ def _choose_raise_amount(
         return min_raise_to
 
     span = max_raise_to - min_raise_to
-    roll = _RNG.random()
+    roll = rng.random()
 
     # Facing a bet → weight toward stronger responses, otherwise mix in more probes.
     if facing_bet:
@@ -80,13 +81,23 @@ def _choose_raise_amount(
         if roll > 0.9:
             return max_raise_to
 
-    return min_raise_to + int(span * _RNG.random())
+    return min_raise_to + int(span * rng.random())
 
 
-def baseline_strategy(engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Optional[int]]:
-    """Aggressive demo bot: mixes in random raises with a bias toward stronger holdings."""
+def baseline_strategy(
+    engine: GameEngine,
+    seat_idx: int,
+    rng: Optional[random.Random] = None,
+) -> Tuple[ActionType, Optional[int]]:
+    """Aggressive demo bot: mixes in random raises with a bias toward stronger holdings.
 
-    legal, call_amount, min_raise_to, max_raise_to = engine.legal_actions(seat_idx)
+    Pass ``rng`` to make choices reproducible (self-play); defaults to the module RNG.
+    """
+    rng = rng or _RNG
+
+    window = engine.action_window(seat_idx)
+    legal, call_amount = window.legal, window.call_amount
+    min_raise_to, max_raise_to = window.min_raise_to, window.max_raise_to
 
     # Always fold if folding is only option.
     if len(legal) == 1 and legal[0] == ActionType.FOLD:
@@ -98,8 +109,8 @@ def baseline_strategy(engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Op
     phase = engine.hand.phase if engine.hand else Phase.PRE_FLOP
     facing_bet = call_amount is not None
 
-    if ActionType.RAISE_TO in legal and hole and _should_raise(strength, phase, facing_bet):
-        amount = _choose_raise_amount(min_raise_to, max_raise_to, facing_bet)
+    if ActionType.RAISE_TO in legal and hole and _should_raise(strength, phase, facing_bet, rng):
+        amount = _choose_raise_amount(min_raise_to, max_raise_to, facing_bet, rng)
         return ActionType.RAISE_TO, amount
 
     # Fall back to calling if legal.
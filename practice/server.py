@@ -2,22 +2,103 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import logging
+import time
+import weakref
 from dataclasses import dataclass, replace
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import websockets
 from http import HTTPStatus
 
+from core import compact
 from core.game import GameEngine
+from core.instrumentation import EngineHooks
+from core.metrics import ACT_RTT_BUCKETS_US, CONTENT_TYPE, MetricsRegistry, RateMeter, Sample
 from core.models import ActionType, TableConfig
+from core.serialization import dumps, loads
 from practice.bots import baseline_strategy
+from tournament.admission import AdmissionConfig, AdmissionGate
+from tournament.compression import COMPRESSION_PROFILES, CompressionConfig
+from tournament.hand_history import HandHistoryRecorder
+from tournament.rate_limit import RATE_LIMIT_CLOSE_CODE, RateLimit, RateLimitConfig, TokenBucket
 
 LOGGER = logging.getLogger("practice_host")
 
 AB_SEAT_ORDER = {"A": 0, "B": 1}
 
+# Served at GET /metrics; same family names as the tournament host so one
+# dashboard covers both. Practice sessions write straight to the socket, so
+# the queue depth is the bytes buffered in each transport.
+METRICS = MetricsRegistry()
+_ACT_RTT = METRICS.histogram(
+    "poker_act_roundtrip_seconds", "Time from sending an act prompt to receiving the bot's action.", ACT_RTT_BUCKETS_US
+)
+_ENGINE_APPLY = METRICS.histogram("poker_engine_apply_seconds", "GameEngine.apply_action time.")
+_BROADCAST = METRICS.histogram("poker_broadcast_fanout_seconds", "Time to send one broadcast to every bot.")
+_HANDS = METRICS.counter("poker_hands_total", "Hands started.")
+_MESSAGES = METRICS.counter("poker_messages_sent_total", "Messages written to sockets.")
+_BYTES = METRICS.counter("poker_bytes_sent_total", "Message bytes written to sockets.")
+_RATE_LIMITED = METRICS.counter(
+    "poker_messages_rate_limited_total", "Inbound messages dropped by per-connection rate limits."
+)
+_RATE_LIMIT_CLOSES = METRICS.counter(
+    "poker_rate_limit_disconnects_total", "Connections closed for flooding past their rate limit."
+)
+_HAND_RATE = RateMeter()
+_CONNECTIONS: "weakref.WeakSet[websockets.WebSocketServerProtocol]" = weakref.WeakSet()
+_ADMISSION_GATES: List[AdmissionGate] = []
+
+
+def _write_buffer_bytes(websocket: websockets.WebSocketServerProtocol) -> int:
+    transport = getattr(websocket, "transport", None)
+    return transport.get_write_buffer_size() if transport is not None else 0
+
+
+def _connection_samples() -> Iterable[Sample]:
+    yield {"role": "player"}, len(_CONNECTIONS)
+
+
+def _queue_samples() -> Iterable[Sample]:
+    yield {"kind": "player"}, sum(_write_buffer_bytes(ws) for ws in list(_CONNECTIONS))
+
+
+def _pending_samples() -> Iterable[Sample]:
+    if _ADMISSION_GATES:
+        yield {}, sum(gate.pending for gate in _ADMISSION_GATES)
+
+
+def _refused_samples() -> Iterable[Sample]:
+    totals: Dict[tuple, int] = {}
+    for gate in _ADMISSION_GATES:
+        for key, count in gate.refused.items():
+            totals[key] = totals.get(key, 0) + count
+    for (role, reason), count in sorted(totals.items()):
+        yield {"role": role, "reason": reason}, count
+
+
+METRICS.collect(
+    "poker_hands_per_second", "gauge", "Hands started per second over the last minute.",
+    lambda: [({}, round(_HAND_RATE.rate(), 3))],
+)
+METRICS.collect("poker_connections", "gauge", "Open bot connections.", _connection_samples)
+METRICS.collect("poker_send_buffer_bytes", "gauge", "Bytes waiting in socket write buffers.", _queue_samples)
+METRICS.collect(
+    "poker_connections_pending", "gauge", "Sockets accepted but still waiting for their hello.", _pending_samples
+)
+METRICS.collect(
+    "poker_connections_refused_total", "counter", "Sockets refused by admission control.", _refused_samples
+)
+
+
+class _EngineMetricsHooks(EngineHooks):
+    def on_hand_start(self, engine, ctx, elapsed_ns):
+        _HANDS.inc()
+        _HAND_RATE.mark()
+
+    def on_action(self, engine, seat_idx, action, events, elapsed_ns):
+        _ENGINE_APPLY.observe_ns(elapsed_ns)
+
 
 class PracticeServerError(Exception):
     def __init__(self, code: str, msg: str) -> None:
@@ -36,8 +117,21 @@ def _config_payload(config: TableConfig) -> Dict[str, Any]:
     }
 
 
+async def _send_json(websocket: websockets.WebSocketServerProtocol, msg_type: str, payload: Dict[str, Any]) -> None:
+    await websocket.send(dumps({"type": msg_type, **payload}))
+
+
 async def _send_error(websocket: websockets.WebSocketServerProtocol, code: str, msg: str) -> None:
-    await websocket.send(json.dumps({"type": "error", "code": code, "msg": msg}))
+    await _send_json(websocket, "error", {"code": code, "msg": msg})
+
+
+async def _read_hello(websocket: websockets.WebSocketServerProtocol, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    try:
+        hello = loads(await asyncio.wait_for(websocket.recv(), timeout=timeout))
+    except Exception:
+        return None
+    return hello if isinstance(hello, dict) else None
+
 
 @dataclass
 class RemoteBotClient:
@@ -45,9 +139,51 @@ class RemoteBotClient:
     websocket: websockets.WebSocketServerProtocol
     preferred_seat: int = 0
     seat_idx: Optional[int] = None
+    # Negotiated with "encoding": "compact" in hello: binary frames after welcome.
+    compact: bool = False
+    # Inbound flood protection, as on the tournament host; None disables it.
+    bucket: Optional[TokenBucket] = None
+    close_after: int = 0
+
+    async def send_welcome(self, payload: Dict[str, Any]) -> None:
+        if self.compact:
+            payload = {**payload, "encoding": compact.NAME}
+        await self.send_encoded(_encode(payload, False))
 
     async def send_json(self, payload: Dict[str, Any]) -> None:
-        await self.websocket.send(json.dumps({"v": 1, **payload}))
+        await self.send_encoded(_encode(payload, self.compact))
+
+    async def send_encoded(self, message: Union[str, bytes]) -> None:
+        await self.websocket.send(message)
+        _MESSAGES.inc()
+        _BYTES.inc(len(message))
+
+    async def reject_flood(self) -> None:
+        """Account for a message over the rate limit; closes the socket after ``close_after`` in a row."""
+        assert self.bucket is not None
+        _RATE_LIMITED.inc()
+        if self.close_after and self.bucket.streak >= self.close_after:
+            _RATE_LIMIT_CLOSES.inc()
+            LOGGER.warning("Closing %s: %s messages in a row over its rate limit", self.team_label, self.bucket.streak)
+            await self.websocket.close(code=RATE_LIMIT_CLOSE_CODE, reason="Rate limit exceeded")
+        elif self.bucket.streak == 1:
+            await _send_error(self.websocket, "RATE_LIMITED", "Too many messages; excess is dropped")
+
+
+def _encode(payload: Dict[str, Any], packed: bool) -> Union[str, bytes]:
+    message = {"v": 1, **payload}
+    return compact.encode(message) if packed else dumps(message)
+
+
+def _decode(raw: Union[str, bytes]) -> Dict[str, Any]:
+    # Malformed or non-object frames decode to {}, which the session ignores.
+    try:
+        if compact.is_compact(raw):
+            return compact.decode(raw)
+        message = loads(raw)
+    except (ValueError, RecursionError):
+        return {}
+    return message if isinstance(message, dict) else {}
 
 
 # Each incoming table run is coordinated through PracticeSession.
@@ -61,10 +197,14 @@ class PracticeSession:
         config: TableConfig,
         remote_players: List[RemoteBotClient],
         house_team: str = "HOUSE",
+        hand_history: Optional[HandHistoryRecorder] = None,
     ) -> None:
         if not remote_players:
             raise ValueError("At least one remote player required")
         self.engine = GameEngine(config)
+        self.engine.add_hooks(_EngineMetricsHooks())
+        if hand_history is not None:
+            hand_history.attach(self.engine, "PRACTICE")
         self.remote_players = list(remote_players)
         self.remote_by_seat: Dict[int, RemoteBotClient] = {}
         self.house_team = house_team
@@ -121,26 +261,49 @@ class PracticeSession:
     async def _prompt_remote(self, remote: RemoteBotClient) -> tuple[ActionType, Optional[int]]:
         assert remote.seat_idx is not None
         payload = self.engine.act_payload(remote.seat_idx)
+        if remote.bucket is not None:
+            # The answer to this prompt is never limited.
+            remote.bucket.credit()
         await remote.send_json({"type": "act", **payload})
+        sent_ns = time.perf_counter_ns()
         while True:
             raw = await remote.websocket.recv()
-            message = json.loads(raw)
+            if remote.bucket is not None and not remote.bucket.take():
+                # Dropped before decoding; once the socket is closed, recv raises.
+                await remote.reject_flood()
+                continue
+            message = _decode(raw)
             if message.get("type") != "action":
                 continue
+            _ACT_RTT.observe_ns(time.perf_counter_ns() - sent_ns, seat=remote.seat_idx)
             action = ActionType(message["action"])
             amount = message.get("amount")
             return action, amount
 
     async def _broadcast_json(self, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter_ns()
+        # Encoded once per encoding for the whole table.
+        encoded: Dict[bool, Union[str, bytes]] = {}
         for remote in self.remote_players:
-            await remote.send_json(payload)
+            message = encoded.get(remote.compact)
+            if message is None:
+                message = encoded[remote.compact] = _encode(payload, remote.compact)
+            await remote.send_encoded(message)
+        _BROADCAST.observe_ns(time.perf_counter_ns() - started)
 
 
 class ABTable:
-    def __init__(self, team: str, team_key: str, config: TableConfig) -> None:
+    def __init__(
+        self,
+        team: str,
+        team_key: str,
+        config: TableConfig,
+        hand_history: Optional[HandHistoryRecorder] = None,
+    ) -> None:
         self.team = team
         self.team_key = team_key
         self.config = config
+        self.hand_history = hand_history
         self.bots: Dict[str, RemoteBotClient] = {}
         self.wait_tasks: Dict[str, asyncio.Task] = {}
         self.session_task: Optional[asyncio.Task] = None
@@ -180,7 +343,7 @@ class ABTable:
             else:
                 self.wait_tasks[upper_label] = asyncio.create_task(self._wait_for_disconnect(remote, upper_label))
 
-        await remote.send_json({
+        await remote.send_welcome({
             "type": "welcome",
             "table_id": "PRACTICE",
             "seat": remote.preferred_seat,
@@ -201,7 +364,9 @@ class ABTable:
 
     async def _run_session(self) -> None:
         remotes = sorted(self.bots.values(), key=lambda r: r.preferred_seat)
-        session = PracticeSession(self.config, remotes, house_team=f"{self.team} (HOUSE)")
+        session = PracticeSession(
+            self.config, remotes, house_team=f"{self.team} (HOUSE)", hand_history=self.hand_history
+        )
         try:
             await session.run()
         except Exception as exc:  # noqa: BLE001
@@ -245,23 +410,36 @@ class ABTable:
 
 
 class ABTableManager:
-    def __init__(self, base_config: TableConfig) -> None:
+    def __init__(
+        self,
+        base_config: TableConfig,
+        hand_history: Optional[HandHistoryRecorder] = None,
+        rate_limits: Optional[RateLimitConfig] = None,
+    ) -> None:
         self.base_config = base_config
+        self.hand_history = hand_history
+        self.rate_limits = rate_limits or RateLimitConfig()
         self.tables: Dict[str, ABTable] = {}
         self.lock = asyncio.Lock()
 
-    async def attach(self, team: str, websocket: websockets.WebSocketServerProtocol, bot_label: str) -> None:
+    async def attach(
+        self,
+        team: str,
+        websocket: websockets.WebSocketServerProtocol,
+        bot_label: str,
+        packed: bool = False,
+    ) -> None:
         team_display = team or "REMOTE"
         team_key = team_display.strip().casefold()
         async with self.lock:
             table = self.tables.get(team_key)
             if table is None or table.should_remove():
                 config = replace(self.base_config, seats=len(AB_SEAT_ORDER) + 1)
-                table = ABTable(team=team_display, team_key=team_key, config=config)
+                table = ABTable(team=team_display, team_key=team_key, config=config, hand_history=self.hand_history)
                 self.tables[team_key] = table
             team_display = table.team
         try:
-            await table.attach(bot_label, RemoteBotClient(team_label=team_display, websocket=websocket))
+            await table.attach(bot_label, _remote_client(team_display, websocket, packed, self.rate_limits))
         finally:
             if table.should_remove():
                 async with self.lock:
@@ -270,17 +448,58 @@ class ABTableManager:
                         self.tables.pop(team_key, None)
 
 
+def _remote_client(
+    team: str, websocket: websockets.WebSocketServerProtocol, packed: bool, rate_limits: RateLimitConfig
+) -> RemoteBotClient:
+    return RemoteBotClient(
+        team_label=team,
+        websocket=websocket,
+        compact=packed,
+        bucket=rate_limits.bucket("player"),
+        close_after=rate_limits.close_after,
+    )
+
+
 async def handle_connection(
     websocket: websockets.WebSocketServerProtocol,
     config: TableConfig,
     ab_manager: ABTableManager,
+    hand_history: Optional[HandHistoryRecorder] = None,
+    gate: Optional[AdmissionGate] = None,
 ) -> None:
-    # Basic handshake using same protocol fields.
-    hello_raw = await websocket.recv()
-    hello = json.loads(hello_raw)
-    if hello.get("type") != "hello":
-        await _send_error(websocket, "BAD_HELLO", "Expected hello")
-        return
+    _CONNECTIONS.add(websocket)
+    try:
+        # Basic handshake using same protocol fields.
+        if gate is None:
+            hello = await _read_hello(websocket)
+        else:
+            accepted, hello = await gate.handshake(websocket, _read_hello)
+            if not accepted:
+                return
+        if hello is None or hello.get("type") != "hello":
+            await _send_error(websocket, "BAD_HELLO", "Expected hello")
+            return
+        if gate is None:
+            await _serve_connection(websocket, hello, config, ab_manager, hand_history)
+            return
+        if not await gate.admit(websocket, hello):
+            return
+        try:
+            await _serve_connection(websocket, hello, config, ab_manager, hand_history)
+        finally:
+            gate.release(websocket)
+    finally:
+        _CONNECTIONS.discard(websocket)
+
+
+async def _serve_connection(
+    websocket: websockets.WebSocketServerProtocol,
+    hello: Dict[str, Any],
+    config: TableConfig,
+    ab_manager: ABTableManager,
+    hand_history: Optional[HandHistoryRecorder] = None,
+) -> None:
+    packed = hello.get("encoding") == compact.NAME
 
     team_raw = hello.get("team")
     team = team_raw.strip() if isinstance(team_raw, str) else "REMOTE"
@@ -304,22 +523,22 @@ async def handle_connection(
 
     if bot_label:
         try:
-            await ab_manager.attach(team, websocket, bot_label)
+            await ab_manager.attach(team, websocket, bot_label, packed)
         except PracticeServerError as exc:
             await _send_error(websocket, exc.code, exc.msg)
         except Exception as exc:  # noqa: BLE001
             LOGGER.exception("Practice A/B session crashed for %s (%s): %s", team, bot_label, exc)
         return
 
-    remote = RemoteBotClient(team_label=team, websocket=websocket, preferred_seat=0)
-    await remote.send_json({
+    remote = _remote_client(team, websocket, packed, ab_manager.rate_limits)
+    await remote.send_welcome({
         "type": "welcome",
         "table_id": "PRACTICE",
         "seat": remote.preferred_seat,
         "config": _config_payload(config),
     })
 
-    session = PracticeSession(config, [remote])
+    session = PracticeSession(config, [remote], hand_history=hand_history)
     try:
         await session.run()
     except Exception as exc:  # noqa: BLE001
@@ -327,12 +546,19 @@ async def handle_connection(
 
 
 async def _process_request(path, request_headers):
-    """Return a simple HTTP response for health checks."""
+    """Return a simple HTTP response for health checks and /metrics."""
 
     upgrade_header = request_headers.get("Upgrade", "").lower()
     if upgrade_header == "websocket":
         return None  # let the WebSocket handshake continue
 
+    if path.split("?", 1)[0] == "/metrics":
+        body = METRICS.render().encode()
+        headers = [
+            ("Content-Type", CONTENT_TYPE),
+            ("Content-Length", str(len(body))),
+        ]
+        return HTTPStatus.OK, headers, body
     if path in {"/", "/health", "/healthz"}:
         body = b"practice server running\n"
         headers = [
@@ -348,13 +574,26 @@ async def _process_request(path, request_headers):
     return HTTPStatus.NOT_FOUND, headers, body
 
 
-async def run_server(host: str, port: int, config: TableConfig) -> None:
-    ab_manager = ABTableManager(config)
+async def run_server(
+    host: str,
+    port: int,
+    config: TableConfig,
+    compression: str = "default",
+    hand_history: Optional[HandHistoryRecorder] = None,
+    rate_limits: Optional[RateLimitConfig] = None,
+    admission: Optional[AdmissionConfig] = None,
+) -> None:
+    ab_manager = ABTableManager(config, hand_history, rate_limits)
+    gate = None
+    if admission is not None:
+        gate = AdmissionGate(admission, _send_json)
+        _ADMISSION_GATES.append(gate)
 
     async def _handler(ws):
-        await handle_connection(ws, config, ab_manager)
+        await handle_connection(ws, config, ab_manager, hand_history, gate)
 
-    async with websockets.serve(_handler, host, port, process_request=_process_request):
+    serve_options = CompressionConfig(bots=compression).serve_options()
+    async with websockets.serve(_handler, host, port, process_request=_process_request, **serve_options):
         LOGGER.info("Practice server listening on %s:%s", host, port)
         await asyncio.Future()
 
@@ -366,10 +605,83 @@ def main() -> None:
     parser.add_argument("--starting-stack", type=int, default=6_000)
     parser.add_argument("--sb", type=int, default=50)
     parser.add_argument("--bb", type=int, default=100)
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSION_PROFILES,
+        default="default",
+        help="permessage-deflate profile for bot connections",
+    )
+    parser.add_argument(
+        "--hand-history",
+        metavar="DIR",
+        default=None,
+        help="Record every practice hand as JSON lines under DIR",
+    )
+    parser.add_argument(
+        "--bot-rate-limit",
+        type=float,
+        default=20.0,
+        help="Unprompted messages per second a bot may send (answers to act prompts are free); 0 disables",
+    )
+    parser.add_argument("--bot-burst", type=int, default=40, help="Bot messages accepted back to back")
+    parser.add_argument(
+        "--rate-limit-close-after",
+        type=int,
+        default=500,
+        help="Close a connection after this many rate-limited messages in a row; 0 never closes",
+    )
+    parser.add_argument(
+        "--connection-soft-limit",
+        type=int,
+        default=20,
+        help="Open sockets from which hellos get less time (fly.toml soft_limit; 0 = off)",
+    )
+    parser.add_argument(
+        "--connection-hard-limit",
+        type=int,
+        default=25,
+        help="Open sockets at which new connections are refused (fly.toml hard_limit; 0 = off)",
+    )
+    parser.add_argument("--max-players", type=int, default=None, help="Cap on connected bots (default: no own cap)")
+    parser.add_argument("--hello-timeout-ms", type=int, default=5000, help="Time a new socket gets to send hello")
+    parser.add_argument(
+        "--busy-hello-timeout-ms",
+        type=int,
+        default=1000,
+        help="Time a new socket gets to send hello once the soft limit is reached",
+    )
+    parser.add_argument(
+        "--retry-after-s",
+        type=float,
+        default=5.0,
+        help="Retry hint sent with OVER_CAPACITY refusals (jittered up to 1.5x)",
+    )
     args = parser.parse_args()
 
     config = TableConfig(seats=2, starting_stack=args.starting_stack, sb=args.sb, bb=args.bb)
-    asyncio.run(run_server(args.host, args.port, config))
+    hand_history = None
+    if args.hand_history:
+        hand_history = HandHistoryRecorder(args.hand_history)
+        hand_history.start()
+    try:
+        rate_limits = RateLimitConfig(
+            bot=RateLimit(args.bot_rate_limit, args.bot_burst) if args.bot_rate_limit > 0 else None,
+            close_after=args.rate_limit_close_after,
+        )
+        admission = AdmissionConfig(
+            soft_limit=args.connection_soft_limit or None,
+            hard_limit=args.connection_hard_limit or None,
+            max_players=args.max_players,
+            hello_timeout_s=args.hello_timeout_ms / 1000,
+            busy_hello_timeout_s=args.busy_hello_timeout_ms / 1000,
+            retry_after_s=args.retry_after_s,
+        )
+        asyncio.run(
+            run_server(args.host, args.port, config, args.compression, hand_history, rate_limits, admission)
+        )
+    finally:
+        if hand_history is not None:
+            hand_history.close()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ Usage:
     python sample_bot.py --team TEAM_NAME --url wss://poker-bot-arena.fly.dev/
     # Local A/B testing against the practice server
     python sample_bot.py --team TEAM_NAME --bot A --url wss://poker-bot-arena.fly.dev/
+    # Smaller binary frames instead of JSON text (needs core/compact.py from the repo)
+    python sample_bot.py --team TEAM_NAME --compact --url wss://poker-bot-arena.fly.dev/
 
 This script shows the core loop:
   * handshake with the host
@@ -36,6 +38,16 @@ from typing import Any, Dict, Optional, Tuple
 
 import websockets
 
+try:  # Optional: `pip install orjson` parses host messages several times faster.
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:  # Optional binary frames (--compact); ships with the repo as core/compact.py.
+    from core import compact
+except ImportError:
+    compact = None
+
 LOGGER = logging.getLogger("sample_bot")
 STREAM_HANDLER = logging.StreamHandler()
 STREAM_HANDLER.setFormatter(logging.Formatter("%(message)s"))
@@ -239,10 +251,12 @@ async def play_hand(
         )
 
     async for raw in websocket:
-        message = json.loads(raw)
+        # Binary frames only arrive after the host accepted --compact.
+        message = compact.decode(raw) if compact and compact.is_compact(raw) else json_loads(raw)
         msg_type = message.get("type")
 
         if msg_type == "welcome":
+            state["packed"] = compact is not None and message.get("encoding") == compact.NAME
             state["seat"] = message.get("seat")
             cfg = message.get("config", {})
             state["seat_count"] = cfg.get("seats")
@@ -403,7 +417,7 @@ async def play_hand(
             if amount is not None:
                 payload["amount"] = int(amount)
             LOGGER.debug("Sending action: %s", payload)
-            await websocket.send(json.dumps(payload))
+            await websocket.send(compact.encode(payload) if state.get("packed") else json.dumps(payload))
             continue
 
         if msg_type == "end_hand":
@@ -489,7 +503,7 @@ async def play_hand(
         LOGGER.debug("Ignoring message type=%s", msg_type)
 
 
-async def run_bot(team: str, url: str, bot: Optional[str] = None) -> None:
+async def run_bot(team: str, url: str, bot: Optional[str] = None, use_compact: bool = False) -> None:
     try:
         async with websockets.connect(url) as ws:
             hello = {
@@ -499,6 +513,11 @@ async def run_bot(team: str, url: str, bot: Optional[str] = None) -> None:
             }
             if bot:
                 hello["bot"] = bot
+            if use_compact:
+                if compact is None:
+                    LOGGER.warning("--compact needs core/compact.py next to this script; using JSON")
+                else:
+                    hello["encoding"] = compact.NAME
             await ws.send(json.dumps(hello))
             label = f"{team} ({bot})" if bot else team
             LOGGER.info("[connect] %s as %s", url, label)
@@ -529,13 +548,18 @@ def parse_args() -> argparse.Namespace:
         type=_bot,
         help="Optional practice slot (A or B) to enable in-server A/B testing",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Ask the host for compact binary frames instead of JSON text",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
     LOGGER.setLevel(getattr(logging, args.log_level.upper(), logging.INFO))
-    asyncio.run(run_bot(args.team, args.url, bot=args.bot))
+    asyncio.run(run_bot(args.team, args.url, bot=args.bot, use_compact=args.compact))
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the engine and hosts.
+
+Each subcommand prints one JSON object per scenario so runs can be diffed.
+
+Example:
+    python -m scripts.bench engine --hands 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core import compact
+from core.game import ActionTuple, GameEngine
+from core.models import ActionType, TableConfig
+from core.serialization import EnvelopeEncoder, TickClock, available_serializers, get_serializer
+
+
+class GcPauseMonitor:
+    """Times every cyclic-GC pass through gc.callbacks."""
+
+    def __init__(self) -> None:
+        self.pauses_ns: List[int] = []
+        self._started = 0
+
+    def _callback(self, phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            self._started = time.perf_counter_ns()
+        else:
+            self.pauses_ns.append(time.perf_counter_ns() - self._started)
+
+    def __enter__(self) -> "GcPauseMonitor":
+        gc.collect()
+        self._counts_before = [stats["collections"] for stats in gc.get_stats()]
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        gc.callbacks.remove(self._callback)
+        self.collections = [
+            stats["collections"] - before for stats, before in zip(gc.get_stats(), self._counts_before)
+        ]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "gc_collections": self.collections,
+            "gc_pause_total_ms": round(sum(self.pauses_ns) / 1e6, 3),
+            "gc_pause_max_ms": round(max(self.pauses_ns, default=0) / 1e6, 3),
+        }
+
+
+# Engine ------------------------------------------------------------------
+
+
+def _table(reuse_hands: bool, seats: int = 6) -> GameEngine:
+    engine = GameEngine(TableConfig(seats=seats, starting_stack=2_000, sb=5, bb=10), reuse_hands=reuse_hands)
+    for idx in range(seats):
+        engine.assign_seat(f"Bench{idx}")
+    return engine
+
+
+def play_hands(engine: GameEngine, hands: int, first_seed: int = 0, showdown: bool = False) -> None:
+    """Fold around to the big blind (or check/call to showdown), refilling busted stacks.
+
+    Showdowns are dominated by hand evaluation, so the default fold-around
+    line isolates per-hand setup and teardown cost.
+    """
+    passive = ActionType.CALL if showdown else ActionType.FOLD
+    for seed in range(first_seed, first_seed + hands):
+        if not engine.can_start_hand():
+            for seat in engine.seats:
+                if seat:
+                    seat.stack = engine.config.starting_stack
+        engine.start_hand(seed=seed)
+        engine.consume_pre_events()
+        while not engine.is_hand_complete():
+            actor = engine.next_actor()
+            if actor is None:
+                break
+            window = engine.action_window(actor)
+            if window.allows(ActionType.CHECK):
+                engine.apply_action(actor, ActionType.CHECK, None)
+            elif window.allows(passive):
+                engine.apply_action(actor, passive, None)
+            else:
+                engine.apply_action(actor, ActionType.FOLD, None)
+        engine.hand = None
+
+
+def bench_engine(args: argparse.Namespace) -> List[Dict[str, object]]:
+    results = []
+    for reuse_hands in (False, True):
+        engine = _table(reuse_hands)
+        with GcPauseMonitor() as monitor:
+            started = time.perf_counter()
+            play_hands(engine, args.hands, showdown=args.showdown)
+            elapsed = time.perf_counter() - started
+
+        # tracemalloc is far too slow for the full run; sample a shorter stretch.
+        traced = _table(reuse_hands)
+        play_hands(traced, 10, showdown=args.showdown)
+        tracemalloc.start()
+        baseline_blocks = _traced_blocks()
+        transient = 0
+        for seed in range(10, 10 + args.trace_hands):
+            # Peak minus resting size = memory a hand allocates and throws away.
+            resting, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            play_hands(traced, 1, first_seed=seed, showdown=args.showdown)
+            transient += tracemalloc.get_traced_memory()[1] - resting
+        live_blocks = _traced_blocks() - baseline_blocks
+        tracemalloc.stop()
+
+        result = {
+            "scenario": "engine_pooled" if reuse_hands else "engine_fresh",
+            "hands": args.hands,
+            "showdown": args.showdown,
+            "hands_per_s": round(args.hands / elapsed, 1),
+            "traced_hands": args.trace_hands,
+            "transient_bytes_per_hand": round(transient / max(args.trace_hands, 1), 1),
+            "traced_live_blocks": live_blocks,
+        }
+        result.update(monitor.as_dict())
+        results.append(result)
+    return results
+
+
+def _record_scripts(hands: int) -> List[List[ActionTuple]]:
+    """Check/call every hand to showdown and keep each hand's action list."""
+    engine = _table(reuse_hands=True)
+    scripts: List[List[ActionTuple]] = []
+    for seed in range(hands):
+        if not engine.can_start_hand():
+            for seat in engine.seats:
+                if seat:
+                    seat.stack = engine.config.starting_stack
+        engine.start_hand(seed=seed)
+        script: List[ActionTuple] = []
+        while not engine.is_hand_complete():
+            actor = engine.next_actor()
+            action = ActionType.CHECK if engine.action_window(actor).allows(ActionType.CHECK) else ActionType.CALL
+            engine.apply_action(actor, action, None)
+            script.append((actor, action, None))
+        scripts.append(script)
+        engine.hand = None
+    return scripts
+
+
+def bench_replay(args: argparse.Namespace) -> List[Dict[str, object]]:
+    scripts = _record_scripts(args.hands)
+    actions = sum(len(script) for script in scripts)
+    results = []
+    for mode in ("single", "batch", "batch_summary"):
+        engine = _table(reuse_hands=True)
+        started = time.perf_counter()
+        for seed, script in enumerate(scripts):
+            if not engine.can_start_hand():
+                for seat in engine.seats:
+                    if seat:
+                        seat.stack = engine.config.starting_stack
+            engine.start_hand(seed=seed)
+            if mode == "single":
+                for seat_idx, action, amount in script:
+                    engine.apply_action(seat_idx, action, amount)
+            else:
+                engine.apply_actions(script, collect_events=mode == "batch")
+            engine.hand = None
+        elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "scenario": f"replay_{mode}",
+                "hands": args.hands,
+                "actions": actions,
+                "actions_per_s": round(actions / elapsed, 1),
+                "hands_per_s": round(args.hands / elapsed, 1),
+            }
+        )
+    return results
+
+
+# Multi-table host ---------------------------------------------------------
+
+
+class MemorySocket:
+    """Host-side stand-in for a websocket; the bot end reads ``outbox`` directly."""
+
+    def __init__(self, name: str) -> None:
+        self.remote_address = name
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, message: str) -> None:
+        self.outbox.put_nowait(message)
+
+    async def recv(self) -> str:
+        message = await self.inbox.get()
+        if message is None:
+            raise asyncio.CancelledError
+        return message
+
+    def __aiter__(self) -> "MemorySocket":
+        return self
+
+    async def __anext__(self) -> str:
+        message = await self.inbox.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def close(self, *args: object, **kwargs: object) -> None:
+        if not self.closed:
+            self.closed = True
+            self.inbox.put_nowait(None)
+            self.outbox.put_nowait(None)
+
+
+class _Turnaround:
+    """Time from one bot's action to the next ``act`` prompt on the same table."""
+
+    def __init__(self, samples_ns: List[int]) -> None:
+        self.samples_ns = samples_ns
+        self.acted_at: Optional[int] = None
+
+    def prompted(self) -> None:
+        if self.acted_at is not None:
+            self.samples_ns.append(time.perf_counter_ns() - self.acted_at)
+            self.acted_at = None
+
+    def acted(self) -> None:
+        self.acted_at = time.perf_counter_ns()
+
+
+def _latency_summary(samples_ns: List[int]) -> Dict[str, Optional[float]]:
+    samples = sorted(samples_ns)
+    if not samples:
+        return {"act_turnaround_p50_ms": None, "act_turnaround_p99_ms": None}
+    return {
+        "act_turnaround_p50_ms": round(samples[len(samples) // 2] / 1e6, 3),
+        "act_turnaround_p99_ms": round(samples[len(samples) * 99 // 100] / 1e6, 3),
+    }
+
+
+async def _check_call_bot(
+    socket: MemorySocket,
+    counters: Dict[str, int],
+    count_hands: bool,
+    turnaround: Optional[_Turnaround] = None,
+) -> None:
+    while True:
+        raw = await socket.outbox.get()
+        if raw is None:
+            return
+        counters["messages"] += 1
+        counters["bytes"] += len(raw)
+        if isinstance(raw, bytes):
+            message = compact.decode(raw)
+            if message["type"] == "act":
+                if turnaround is not None:
+                    turnaround.prompted()
+                    turnaround.acted()
+                action = "CHECK" if "CHECK" in message["legal"] else "CALL"
+                socket.inbox.put_nowait(compact.encode({"type": "action", "hand_id": message["hand_id"], "action": action}))
+                counters["actions"] += 1
+            elif count_hands and message["type"] == "end_hand":
+                counters["hands"] += 1
+        # Only prompts need decoding; everything else is just drained.
+        elif raw.startswith('{"type":"act"'):
+            if turnaround is not None:
+                turnaround.prompted()
+                turnaround.acted()
+            message = json.loads(raw)
+            action = "CHECK" if "CHECK" in message["legal"] else "CALL"
+            socket.inbox.put_nowait(json.dumps({"type": "action", "hand_id": message["hand_id"], "action": action}))
+            counters["actions"] += 1
+        elif count_hands and raw.startswith('{"type":"end_hand"'):
+            counters["hands"] += 1
+
+
+async def _drain(socket: MemorySocket, counters: Dict[str, int]) -> None:
+    while await socket.outbox.get() is not None:
+        counters["messages"] += 1
+
+
+async def _run_tables(args: argparse.Namespace, table_count: int) -> Dict[str, object]:
+    from tournament.checkpoint import Checkpointer
+    from tournament.hand_history import HandHistoryRecorder
+    from tournament.multi_table import MultiTableHost
+
+    config = TableConfig(seats=args.seats, starting_stack=10**9, sb=5, bb=10, move_time_ms=15_000)
+    hand_history = None
+    if args.hand_history:
+        hand_history = HandHistoryRecorder(args.hand_history)
+        hand_history.start()
+    checkpointer = None
+    if args.checkpoint_dir:
+        checkpointer = Checkpointer(args.checkpoint_dir, mid_hand=args.checkpoint_mid_hand)
+        checkpointer.start()
+    host = MultiTableHost(
+        config,
+        tables=table_count,
+        serializer=get_serializer(args.serializer),
+        hand_history=hand_history,
+        checkpointer=checkpointer,
+    )
+    counters = {"actions": 0, "hands": 0, "messages": 0, "bytes": 0}
+    turnaround_ns: List[int] = []
+    # Opt every client into one message per action instead of one per event.
+    batch = {"events": "batch"} if args.batch_events else {}
+    encoding = {"encoding": compact.NAME} if args.compact else {}
+    tasks: List[asyncio.Task] = []
+    sockets: List[MemorySocket] = []
+
+    def connect(hello: Dict[str, object], client: Callable[[MemorySocket], object]) -> None:
+        socket = MemorySocket(str(hello.get("team") or "spectator"))
+        socket.inbox.put_nowait(json.dumps(hello))
+        sockets.append(socket)
+        tasks.append(asyncio.create_task(host._handle_connection(socket)))
+        tasks.append(asyncio.create_task(client(socket)))  # type: ignore[arg-type]
+
+    for table_id in host.tables:
+        turnaround = _Turnaround(turnaround_ns)
+        for _ in range(args.spectators_per_table):
+            connect(
+                {"type": "hello", "role": "spectator", "table_id": table_id, "frames": "delta", **batch},
+                lambda socket: _drain(socket, counters),
+            )
+        for seat in range(args.seats):
+            connect(
+                {"type": "hello", "team": f"{table_id}-bot{seat}", "table_id": table_id, **batch, **encoding},
+                lambda socket, first=seat == 0, turnaround=turnaround: _check_call_bot(
+                    socket, counters, first, turnaround
+                ),
+            )
+
+    await asyncio.sleep(args.warmup)
+    start_actions, start_hands, start_messages = counters["actions"], counters["hands"], counters["messages"]
+    start_bytes = counters["bytes"]
+    start_samples = len(turnaround_ns)
+    started = time.perf_counter()
+    await asyncio.sleep(args.seconds)
+    elapsed = time.perf_counter() - started
+    actions = counters["actions"] - start_actions
+    hands = counters["hands"] - start_hands
+    messages = counters["messages"] - start_messages
+    bot_bytes = counters["bytes"] - start_bytes
+    latency = _latency_summary(turnaround_ns[start_samples:])
+
+    for socket in sockets:
+        await socket.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    history: Dict[str, object] = {}
+    if hand_history is not None:
+        hand_history.close()
+        history = {"hand_history": hand_history.stats()}
+    if checkpointer is not None:
+        checkpointer.close()
+        history["checkpoints"] = {"saved": checkpointer.saved, "written": checkpointer.written}
+
+    hands_per_s = hands / elapsed
+    return {
+        "scenario": "tables",
+        "tables": table_count,
+        "seats": args.seats,
+        "spectators_per_table": args.spectators_per_table,
+        "batch_events": args.batch_events,
+        "serializer": get_serializer(args.serializer).name,
+        "compact": args.compact,
+        "hands_per_s": round(hands_per_s, 1),
+        "actions_per_s": round(actions / elapsed, 1),
+        "hands_per_s_per_table": round(hands_per_s / table_count, 2),
+        "messages_per_action": round(messages / actions, 2) if actions else None,
+        # Bytes the bots received (spectator traffic excluded), per action.
+        "bot_bytes_per_action": round(bot_bytes / actions) if actions else None,
+        # Tables one core could keep at the target pace, from saturated throughput.
+        "sustainable_tables": int(hands_per_s / (args.pace_hands_per_min / 60)),
+        # One bot's action to the next act prompt on its table (bots answer instantly).
+        **latency,
+        **history,
+    }
+
+
+def bench_tables(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Saturate one MultiTableHost with in-memory check/call bots (no sockets, one core)."""
+    return [asyncio.run(_run_tables(args, int(count))) for count in args.tables.split(",")]
+
+
+# Encode -------------------------------------------------------------------
+
+
+def _sample_messages(seats: int = 6) -> Dict[str, tuple]:
+    """Representative (msg_type, payload) pairs taken from a live hand."""
+    engine = _table(reuse_hands=False, seats=seats)
+    ctx = engine.start_hand(seed=7)
+    start = engine.start_hand_payload(ctx)
+    engine.consume_pre_events()
+    actor = engine.next_actor()
+    act = engine.act_payload(actor)
+    event = engine.apply_action(actor, ActionType.CALL, None)[0]
+    state = engine.spectator_state("T-1", 15_000)
+    return {
+        "start_hand": ("start_hand", start),
+        "act": ("act", act),
+        "event": ("event", event),
+        "spectator_event": ("spectator/event", {"hand_id": ctx.hand_id, "event": event, "state": state}),
+    }
+
+
+def _legacy_envelope(msg_type: str, payload: Dict[str, object]) -> str:
+    """What the tournament host did before core.serialization: fresh timestamp, merged dict, stdlib json."""
+    body = {"type": msg_type, "v": 1, "ts": datetime.now(timezone.utc).isoformat()}
+    body.update(payload)
+    return json.dumps(body)
+
+
+def bench_encode(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Per-message encode time: the old envelope vs EnvelopeEncoder on each backend, and the compact encoding."""
+    encoders: Dict[str, Callable[[str, Dict[str, object]], str]] = {"legacy": _legacy_envelope}
+    for name in available_serializers():
+        encoders[name] = EnvelopeEncoder(get_serializer(name)).encode
+    clock = TickClock()
+    encoders[compact.NAME] = lambda msg_type, payload: compact.encode_envelope(msg_type, payload, clock.now_iso())
+    results = []
+    for label, (msg_type, payload) in _sample_messages().items():
+        for encoder_name, encode in encoders.items():
+            encode(msg_type, payload)
+            started = time.perf_counter_ns()
+            for _ in range(args.messages):
+                message = encode(msg_type, payload)
+            elapsed = time.perf_counter_ns() - started
+            results.append(
+                {
+                    "scenario": "encode",
+                    "message": label,
+                    "encoder": encoder_name,
+                    "ns_per_message": round(elapsed / args.messages),
+                    "bytes": len(message) if isinstance(message, bytes) else len(message.encode()),
+                }
+            )
+    return results
+
+
+# Compression --------------------------------------------------------------
+
+
+async def _record_traffic(hands: int, seats: int = 6) -> Dict[str, List[object]]:
+    """Frames one bot and one delta spectator receive from a MultiTableHost over ``hands`` hands."""
+    from tournament.multi_table import MultiTableHost
+
+    config = TableConfig(seats=seats, starting_stack=10**9, sb=5, bb=10, move_time_ms=15_000)
+    host = MultiTableHost(config, tables=1)
+    table_id = next(iter(host.tables))
+    counters = {"actions": 0, "hands": 0, "messages": 0, "bytes": 0}
+    recorded: Dict[str, List[object]] = {"bot": [], "spectator": []}
+    tasks: List[asyncio.Task] = []
+    sockets: List[MemorySocket] = []
+
+    def connect(hello: Dict[str, object], client: Callable[[MemorySocket], object], record: Optional[str]) -> None:
+        socket = MemorySocket(str(hello.get("team") or "spectator"))
+        if record is not None:
+            send, frames = socket.send, recorded[record]
+
+            async def recording_send(message: object) -> None:
+                frames.append(message)
+                await send(message)  # type: ignore[arg-type]
+
+            socket.send = recording_send  # type: ignore[method-assign]
+        socket.inbox.put_nowait(json.dumps(hello))
+        sockets.append(socket)
+        tasks.append(asyncio.create_task(host._handle_connection(socket)))
+        tasks.append(asyncio.create_task(client(socket)))  # type: ignore[arg-type]
+
+    connect(
+        {"type": "hello", "role": "spectator", "table_id": table_id, "frames": "delta"},
+        lambda socket: _drain(socket, counters),
+        "spectator",
+    )
+    for seat in range(seats):
+        connect(
+            {"type": "hello", "team": f"bot{seat}", "table_id": table_id},
+            lambda socket, first=seat == 0: _check_call_bot(socket, counters, count_hands=first),
+            "bot" if seat == 0 else None,
+        )
+    while counters["hands"] < hands:
+        await asyncio.sleep(0.01)
+
+    for socket in sockets:
+        await socket.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return recorded
+
+
+def bench_compression(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Bytes and deflate time per frame for each tournament.compression profile, on recorded host traffic."""
+    from websockets.extensions.permessage_deflate import PerMessageDeflate
+    from websockets.frames import OP_BINARY, OP_TEXT, Frame
+
+    from tournament.compression import COMPRESSION_PROFILES, deflate_factory
+
+    recorded = asyncio.run(_record_traffic(args.hands))
+    variants = []
+    for profile in COMPRESSION_PROFILES:
+        factory = deflate_factory(profile)
+        if factory is None:
+            variants.append((profile, None))
+            continue
+        settings = (factory.server_max_window_bits, factory.compress_settings)
+        variants.append((profile, (False, settings)))
+        if profile == "default":
+            # What the frames cost if the window were reset every message.
+            variants.append(("default_no_context_takeover", (True, settings)))
+
+    results = []
+    for connection, messages in recorded.items():
+        frames = [
+            Frame(OP_BINARY, message) if isinstance(message, bytes) else Frame(OP_TEXT, message.encode())  # type: ignore[union-attr]
+            for message in messages
+        ]
+        raw_bytes = sum(len(frame.data) for frame in frames)
+        for profile, deflate in variants:
+            compressed = raw_bytes
+            elapsed = 0
+            if deflate is not None:
+                no_takeover, (window_bits, compress_settings) = deflate
+                extension = PerMessageDeflate(False, no_takeover, 12, window_bits, dict(compress_settings))
+                started = time.perf_counter_ns()
+                compressed = sum(len(extension.encode(frame).data) for frame in frames)
+                elapsed = time.perf_counter_ns() - started
+            results.append(
+                {
+                    "scenario": "compression",
+                    "connection": connection,
+                    "profile": profile,
+                    "frames": len(frames),
+                    "raw_bytes_per_frame": round(raw_bytes / len(frames)),
+                    "bytes_per_frame": round(compressed / len(frames)),
+                    "ratio": round(compressed / raw_bytes, 3),
+                    "ns_per_frame": round(elapsed / len(frames)),
+                }
+            )
+    return results
+
+
+def _traced_blocks() -> int:
+    return sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+
+
+SCENARIOS: Dict[str, Callable[[argparse.Namespace], List[Dict[str, object]]]] = {
+    "engine": bench_engine,
+    "replay": bench_replay,
+    "tables": bench_tables,
+    "encode": bench_encode,
+    "compression": bench_compression,
+}
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Poker Bot Arena benchmarks")
+    sub = parser.add_subparsers(dest="scenario", required=True)
+
+    engine = sub.add_parser("engine", help="hand throughput, allocations and GC pauses (fresh vs pooled)")
+    engine.add_argument("--hands", type=int, default=1_000_000)
+    engine.add_argument("--trace-hands", type=int, default=20_000, help="hands sampled under tracemalloc")
+    engine.add_argument("--showdown", action="store_true", help="check/call every hand to showdown")
+
+    replay = sub.add_parser("replay", help="stored-hand replay: apply_action per step vs apply_actions batches")
+    replay.add_argument("--hands", type=int, default=20_000)
+
+    tables = sub.add_parser("tables", help="concurrent tables on one event loop with in-memory bots")
+    tables.add_argument("--tables", default="1,8,32,128", help="comma-separated table counts")
+    tables.add_argument("--seats", type=int, default=6)
+    tables.add_argument("--spectators-per-table", type=int, default=1)
+    tables.add_argument("--seconds", type=float, default=5.0, help="measured time per table count")
+    tables.add_argument("--warmup", type=float, default=1.0)
+    tables.add_argument("--pace-hands-per-min", type=float, default=60.0, help="target pace for sustainable_tables")
+    tables.add_argument("--batch-events", action="store_true", help="clients negotiate one events message per action")
+    tables.add_argument("--serializer", choices=("auto", "json", "orjson"), default="auto")
+    tables.add_argument("--compact", action="store_true", help="bots negotiate compact binary frames")
+    tables.add_argument("--hand-history", metavar="DIR", help="record every hand under DIR while measuring")
+    tables.add_argument("--checkpoint-dir", metavar="DIR", help="checkpoint every table after each hand")
+    tables.add_argument("--checkpoint-mid-hand", action="store_true", help="also checkpoint after every action")
+
+    encode = sub.add_parser("encode", help="per-message envelope encode time and size per backend and encoding")
+    encode.add_argument("--messages", type=int, default=100_000, help="encodes timed per message type and backend")
+
+    compression = sub.add_parser("compression", help="permessage-deflate bytes and CPU per profile on recorded traffic")
+    compression.add_argument("--hands", type=int, default=200, help="hands recorded from one 6-max table")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    for result in SCENARIOS[args.scenario](args):
+        print(json.dumps(result, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
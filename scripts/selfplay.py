@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Headless self-play runner that shards matches across a process pool.
+
+Unlike ``tourney_sim.py`` nothing goes over websockets: each match drives a
+``GameEngine`` directly with pluggable policies. Every match draws its seed
+from ``(root_seed, match_index)``, so the records are bit-identical for a
+given root seed no matter how many workers share the work.
+
+Example:
+    python -m scripts.selfplay --matches 2000 --workers 8 --policies baseline,random
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.game import GameEngine
+from core.models import ActionType, TableConfig
+from practice.bots import baseline_strategy
+
+LOGGER = logging.getLogger("selfplay")
+
+# Compact per-match record: (index, seed, hands, winner_seat or -1, final stacks).
+MatchRecord = Tuple[int, int, int, int, Tuple[int, ...]]
+
+
+# Policies ----------------------------------------------------------------
+
+
+class Policy:
+    """One instance per seat per match; reset() hands it a seeded RNG."""
+
+    name = "policy"
+
+    def reset(self, seat_idx: int, config: TableConfig, rng: random.Random) -> None:
+        self.seat_idx = seat_idx
+        self.rng = rng
+
+    def observe(self, msg_type: str, payload: Dict[str, object]) -> None:
+        pass
+
+    def decide(self, engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Optional[int]]:
+        raise NotImplementedError
+
+
+class BaselinePolicy(Policy):
+    name = "baseline"
+
+    def decide(self, engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Optional[int]]:
+        return baseline_strategy(engine, seat_idx, rng=self.rng)
+
+
+class RandomPolicy(Policy):
+    name = "random"
+
+    def decide(self, engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Optional[int]]:
+        window = engine.action_window(seat_idx)
+        # Folding with a free check available just shortens matches; skip it.
+        choices = [
+            action for action in window.legal if not (action == ActionType.FOLD and window.allows(ActionType.CHECK))
+        ]
+        action = self.rng.choice(choices)
+        if action == ActionType.RAISE_TO:
+            assert window.min_raise_to is not None and window.max_raise_to is not None
+            return action, self.rng.randint(window.min_raise_to, window.max_raise_to)
+        return action, None
+
+
+class StrategicPolicy(Policy):
+    """StrategicBot's decision core fed with engine payloads instead of sockets."""
+
+    name = "strategic"
+
+    def reset(self, seat_idx: int, config: TableConfig, rng: random.Random) -> None:
+        super().reset(seat_idx, config, rng)
+        from bots.strategic_bot import StrategicBot
+
+        self.bot = StrategicBot(team_name=f"Seat{seat_idx}", log_hands=False)
+        self.bot.engine.rng.seed(rng.getrandbits(64))
+        self.bot.builder.rng = random.Random(rng.getrandbits(64))
+        self.bot.tracker.set_seat(seat_idx)
+        self.bot.tracker.update_table_config({"seats": config.seats, "sb": config.sb, "bb": config.bb})
+
+    def observe(self, msg_type: str, payload: Dict[str, object]) -> None:
+        if msg_type == "start_hand":
+            self.bot.tracker.start_hand(payload)
+        elif msg_type == "event":
+            self.bot._handle_event(payload)
+        elif msg_type == "end_hand" and self.bot.tracker.hand:
+            self.bot.tracker.finalize_hand()
+
+    def decide(self, engine: GameEngine, seat_idx: int) -> Tuple[ActionType, Optional[int]]:
+        payload = engine.act_payload(seat_idx)
+        # The MCTS refinement is wall-clock budgeted; a zero clock keeps runs reproducible.
+        payload["you"]["time_ms"] = 0  # type: ignore[index]
+        decision = self.bot.decide(payload)
+        # The bot's sanitizer yields floats; the engine keeps integer chips.
+        amount = int(decision.amount) if decision.amount is not None else None
+        return ActionType(decision.action), amount
+
+
+POLICIES: Dict[str, Callable[[], Policy]] = {
+    BaselinePolicy.name: BaselinePolicy,
+    RandomPolicy.name: RandomPolicy,
+    StrategicPolicy.name: StrategicPolicy,
+}
+
+
+# Seeding -----------------------------------------------------------------
+
+
+def match_seed(root_seed: int, match_index: int) -> int:
+    """Stable 64-bit seed for one match, independent of process and shard layout."""
+    digest = hashlib.blake2b(f"{root_seed}:{match_index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+# Match driver ------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SelfPlaySpec:
+    root_seed: int
+    policies: Tuple[str, ...]
+    starting_stack: int = 2_000
+    sb: int = 10
+    bb: int = 20
+    max_hands: int = 500
+
+    def table_config(self) -> TableConfig:
+        return TableConfig(
+            seats=len(self.policies),
+            starting_stack=self.starting_stack,
+            sb=self.sb,
+            bb=self.bb,
+            move_time_ms=0,
+        )
+
+
+def play_match(spec: SelfPlaySpec, match_index: int) -> MatchRecord:
+    seed = match_seed(spec.root_seed, match_index)
+    rng = random.Random(seed)
+    config = spec.table_config()
+    engine = GameEngine(config, reuse_hands=True)
+    # Rotate policy seating so no policy keeps a fixed position across matches.
+    offset = match_index % len(spec.policies)
+    seat_policies: List[Policy] = []
+    for seat_idx in range(config.seats):
+        name = spec.policies[(seat_idx + offset) % len(spec.policies)]
+        engine.assign_seat(f"{name}#{seat_idx}")
+        policy = POLICIES[name]()
+        policy.reset(seat_idx, config, random.Random(rng.getrandbits(64)))
+        seat_policies.append(policy)
+
+    observers = [policy for policy in seat_policies if type(policy).observe is not Policy.observe]
+
+    def notify(msg_type: str, payload: Dict[str, object]) -> None:
+        for policy in observers:
+            policy.observe(msg_type, payload)
+
+    hands = 0
+    while hands < spec.max_hands and engine.can_start_hand():
+        ctx = engine.start_hand(seed=rng.getrandbits(32))
+        hands += 1
+        if observers:
+            notify("start_hand", engine.start_hand_payload(ctx))
+        pre_events = engine.consume_pre_events()
+        for event in pre_events:
+            notify("event", event)
+        while not engine.is_hand_complete():
+            actor = engine.next_actor()
+            if actor is None:
+                break
+            action, amount = seat_policies[actor].decide(engine, actor)
+            events = engine.apply_action(actor, action, amount)
+            if observers:
+                for event in events:
+                    notify("event", event)
+        if observers:
+            notify("end_hand", engine.end_hand_payload())
+        engine.hand = None
+
+    stacks = tuple(seat.stack if seat else 0 for seat in engine.seats)
+    alive = [idx for idx, stack in enumerate(stacks) if stack > 0]
+    winner = alive[0] if len(alive) == 1 else -1
+    # Report winners by policy position, not by rotated seat.
+    if winner >= 0:
+        winner = (winner + offset) % len(spec.policies)
+    unrotated = tuple(stacks[(idx - offset) % len(stacks)] for idx in range(len(stacks)))
+    return (match_index, seed, hands, winner, unrotated)
+
+
+def run_shard(spec: SelfPlaySpec, start: int, stop: int) -> List[MatchRecord]:
+    return [play_match(spec, idx) for idx in range(start, stop)]
+
+
+def _shards(matches: int, chunk: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, matches, chunk):
+        yield start, min(matches, start + chunk)
+
+
+def run_selfplay(
+    spec: SelfPlaySpec,
+    matches: int,
+    workers: int = 1,
+    chunk: int = 16,
+) -> Iterator[MatchRecord]:
+    """Yield match records in index order; work is spread over ``workers`` processes."""
+    if workers <= 1:
+        for start, stop in _shards(matches, chunk):
+            yield from run_shard(spec, start, stop)
+        return
+
+    pending: Dict[int, List[MatchRecord]] = {}
+    next_start = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_shard, spec, start, stop): start for start, stop in _shards(matches, chunk)}
+        for future in as_completed(futures):
+            pending[futures[future]] = future.result()
+            # Release shards as soon as every earlier shard has arrived.
+            while next_start in pending:
+                records = pending.pop(next_start)
+                yield from records
+                next_start += len(records)
+
+
+def summarize(spec: SelfPlaySpec, records: Sequence[MatchRecord]) -> Dict[str, object]:
+    wins: Dict[str, int] = {}
+    chips: Dict[str, int] = {}
+    for _, _, _, winner, stacks in records:
+        if winner >= 0:
+            key = f"{winner}:{spec.policies[winner]}"
+            wins[key] = wins.get(key, 0) + 1
+        for idx, stack in enumerate(stacks):
+            key = f"{idx}:{spec.policies[idx]}"
+            chips[key] = chips.get(key, 0) + stack - spec.starting_stack
+    return {
+        "matches": len(records),
+        "hands": sum(record[2] for record in records),
+        "wins": wins,
+        "chip_delta": chips,
+        "unfinished": sum(1 for record in records if record[3] < 0),
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parallel headless self-play runner")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=16, help="matches per submitted shard")
+    parser.add_argument(
+        "--policies",
+        default="baseline,random",
+        help=f"comma-separated seat policies ({', '.join(sorted(POLICIES))})",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="root seed")
+    parser.add_argument("--starting-stack", type=int, default=2_000)
+    parser.add_argument("--sb", type=int, default=10)
+    parser.add_argument("--bb", type=int, default=20)
+    parser.add_argument("--max-hands", type=int, default=500, help="hand cap per match")
+    parser.add_argument("--out", help="write one JSON record per match to this file ('-' for stdout)")
+    parser.add_argument("--log-level", default="INFO")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
+    policies = tuple(name.strip() for name in args.policies.split(",") if name.strip())
+    unknown = [name for name in policies if name not in POLICIES]
+    if len(policies) < 2 or unknown:
+        raise SystemExit(f"Need at least two known policies (unknown: {unknown})")
+
+    spec = SelfPlaySpec(
+        root_seed=args.seed,
+        policies=policies,
+        starting_stack=args.starting_stack,
+        sb=args.sb,
+        bb=args.bb,
+        max_hands=args.max_hands,
+    )
+    sink = None
+    if args.out == "-":
+        sink = sys.stdout
+    elif args.out:
+        sink = open(args.out, "w", encoding="utf-8")
+
+    started = time.perf_counter()
+    records: List[MatchRecord] = []
+    try:
+        for record in run_selfplay(spec, args.matches, workers=args.workers, chunk=args.chunk):
+            records.append(record)
+            if sink is not None:
+                sink.write(json.dumps(record, separators=(",", ":")))
+                sink.write("\n")
+    finally:
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - started
+    summary = summarize(spec, records)
+    LOGGER.info(
+        "%s matches / %s hands in %.2fs (%.0f hands/s, workers=%s)",
+        summary["matches"],
+        summary["hands"],
+        elapsed,
+        summary["hands"] / elapsed if elapsed else 0.0,
+        args.workers,
+    )
+    LOGGER.info("Summary: %s", json.dumps(summary, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
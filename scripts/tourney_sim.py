@@ -16,14 +16,17 @@ import asyncio
 import contextlib
 import json
 import logging
+import math
 import random
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 import websockets
 
+from core.instrumentation import EngineStatsCollector
 from core.models import ActionType, TableConfig
 from tournament.server import HostServer
+from tournament.sharding import Supervisor, WorkerOptions
 
 LOGGER = logging.getLogger("tourney_sim")
 
@@ -88,7 +91,12 @@ def safe_action(message: Dict[str, Any]) -> tuple[str, Optional[int]]:
     return "FOLD", None
 
 
-async def run_bot(profile: BotProfile, url: str, stop_event: asyncio.Event) -> None:
+async def run_bot(
+    profile: BotProfile,
+    url: str,
+    stop_event: asyncio.Event,
+    table_id: Optional[str] = None,
+) -> None:
     """Connect a single random bot to the host until the tournament ends."""
 
     try:
@@ -98,6 +106,8 @@ async def run_bot(profile: BotProfile, url: str, stop_event: asyncio.Event) -> N
                 "v": 1,
                 "team": profile.name,
             }
+            if table_id is not None:
+                hello["table_id"] = table_id
             await ws.send(json.dumps(hello))
 
             pending_ctx: Optional[Dict[str, Any]] = None
@@ -172,45 +182,72 @@ async def run_simulation(args: argparse.Namespace) -> None:
         move_time_ms=args.move_time,
     )
 
-    host = HostServer(config)
-
-    server_task = asyncio.create_task(host.start(args.host, args.port))
+    engine_stats = EngineStatsCollector() if args.engine_stats else None
+    supervisor: Optional[Supervisor] = None
+    if args.workers > 0:
+        # Real worker processes behind the router; bots pick tables by id.
+        supervisor = Supervisor(
+            WorkerOptions(
+                config=config,
+                workers=args.workers,
+                tables=max(1, math.ceil(args.tables / args.workers)),
+                engine_stats=args.engine_stats,
+            ),
+            worker_base_port=args.port + 1,
+        )
+        server_task = asyncio.create_task(supervisor.start(args.host, args.port))
+        await asyncio.sleep(0.5)
+        await supervisor.wait_ready()
+    else:
+        host = HostServer(config, engine_stats=engine_stats)
+        server_task = asyncio.create_task(host.start(args.host, args.port))
     await asyncio.sleep(0.5)  # give the socket time to bind
 
-    stop_event = asyncio.Event()
+    table_ids: list[Optional[str]] = [f"T-{idx + 1}" for idx in range(args.tables)] if supervisor else [None]
+    # One stop event per table; the run ends once every table's match is over.
+    stop_events = [asyncio.Event() for _ in table_ids]
 
-    profiles = [
-        BotProfile(
-            name=f"SimBot{i}",
-            rng=random.Random(args.seed + i),
-        )
-        for i in range(args.players)
-    ]
+    bot_tasks = []
+    for table_idx, table_id in enumerate(table_ids):
+        for i in range(args.players):
+            bot_number = table_idx * args.players + i
+            profile = BotProfile(name=f"SimBot{bot_number}", rng=random.Random(args.seed + bot_number))
+            url = f"ws://{args.host}:{args.port}/ws"
+            bot_tasks.append(asyncio.create_task(run_bot(profile, url, stop_events[table_idx], table_id)))
+
+    all_done = asyncio.Event()
 
-    bot_tasks = [
-        asyncio.create_task(run_bot(profile, f"ws://{args.host}:{args.port}/ws", stop_event))
-        for profile in profiles
-    ]
+    async def watch_tables() -> None:
+        await asyncio.gather(*(event.wait() for event in stop_events))
+        all_done.set()
 
+    watcher = asyncio.create_task(watch_tables())
     # Stop once the desired number of hands have completed or a timeout occurs.
-    heartbeat = asyncio.create_task(progress_logger(stop_event, interval=5.0))
+    heartbeat = asyncio.create_task(progress_logger(all_done, interval=5.0))
 
     try:
-        await asyncio.wait_for(stop_event.wait(), timeout=args.timeout)
+        await asyncio.wait_for(all_done.wait(), timeout=args.timeout)
     except asyncio.TimeoutError:
         LOGGER.warning("Simulation timed out; stopping bots")
     finally:
-        stop_event.set()
+        for event in stop_events:
+            event.set()
         for task in bot_tasks:
             task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await asyncio.gather(*bot_tasks, return_exceptions=True)
+        if supervisor is not None:
+            status = await supervisor.router.cluster_status()
+            LOGGER.info("Shard status: %s", json.dumps(status["shards"]))
         server_task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await server_task
-        heartbeat.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await heartbeat
+        for task in (heartbeat, watcher):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if engine_stats is not None and supervisor is None:
+            LOGGER.info("Engine-side cost: %s", engine_stats.summary_line(host.table_id))
 
 
 def parse_args() -> argparse.Namespace:
@@ -225,6 +262,14 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--timeout", type=float, default=60.0, help="max seconds to run before stopping")
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--engine-stats", action="store_true", help="report engine-side timings at the end")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="run the sharded host: N worker processes behind a router on --port (workers use port+1..)",
+    )
+    parser.add_argument("--tables", type=int, default=1, help="tables to fill with bots in sharded mode")
     return parser.parse_args()
 
 
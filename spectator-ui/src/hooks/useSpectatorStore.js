@@ -15,6 +15,35 @@ function framesEqual(a, b) {
     }
     return false;
 }
+// Client side of the host's keyframe/delta contract (tournament/spectator_frames.py).
+function applyDelta(state, delta) {
+    const next = { ...state, ...delta.set };
+    if (delta.seats?.length) {
+        const patches = new Map(delta.seats.map((entry) => [entry.seat, entry]));
+        next.seats = state.seats.map((seat) => {
+            const patch = patches.get(seat.seat);
+            return patch ? { ...seat, ...patch } : seat;
+        });
+    }
+    return next;
+}
+function expandFrames(frames) {
+    const expanded = [];
+    let current;
+    for (const { seq: _seq, delta, state, ...rest } of frames) {
+        if (state) {
+            current = state;
+        }
+        else if (current && delta) {
+            current = applyDelta(current, delta);
+        }
+        else {
+            continue;
+        }
+        expanded.push({ ...rest, state: current });
+    }
+    return expanded;
+}
 function applyLobby(state, message) {
     return {
         ...state,
@@ -44,9 +73,21 @@ function applyStart(state, message) {
 function applyEvent(state, message) {
     const handId = message.hand_id;
     const existing = state.hands[handId];
+    let frameState = message.state;
+    if (!frameState && message.delta) {
+        const base = existing?.frames.at(-1)?.state;
+        if (!base) {
+            // Missed the keyframe; wait for the next one.
+            return state;
+        }
+        frameState = applyDelta(base, message.delta);
+    }
+    if (!frameState) {
+        return state;
+    }
     const frame = {
         ts: message.ts,
-        state: message.state,
+        state: frameState,
         event: message.event
     };
     let frames;
@@ -109,7 +150,7 @@ function applySnapshot(state, message) {
     const handId = message.hand_id;
     const timeline = {
         handId,
-        frames: message.frames,
+        frames: message.encoding === "delta" ? expandFrames(message.frames) : message.frames,
         results: message.results,
         closed: Boolean(message.results)
     };
@@ -398,6 +439,7 @@ export function useSpectatorStore(options = {}) {
             const hello = {
                 type: "hello",
                 role: controlEnabled ? "operator" : "spectator",
+                frames: "delta",
             };
             if (controlEnabled) {
                 hello["control"] = true;
@@ -4,13 +4,16 @@ import type {
   SpectatorEndHandMessage,
   SpectatorEventMessage,
   SpectatorFrame,
+  SpectatorFrameState,
   SpectatorHandTimeline,
   SpectatorLobbyMessage,
   SpectatorMessage,
   SpectatorSnapshotMessage,
   SpectatorStatusMessage,
   SpectatorStartHandMessage,
-  SpectatorStoreState
+  SpectatorStateDelta,
+  SpectatorStoreState,
+  SpectatorWireFrame
 } from "../types";
 
 type StoreAction =
@@ -37,6 +40,35 @@ function framesEqual(a: SpectatorFrame, b: SpectatorFrame) {
   return false;
 }
 
+// Client side of the host's keyframe/delta contract (tournament/spectator_frames.py).
+function applyDelta(state: SpectatorFrameState, delta: SpectatorStateDelta): SpectatorFrameState {
+  const next: SpectatorFrameState = { ...state, ...delta.set };
+  if (delta.seats?.length) {
+    const patches = new Map(delta.seats.map((entry) => [entry.seat, entry]));
+    next.seats = state.seats.map((seat) => {
+      const patch = patches.get(seat.seat);
+      return patch ? { ...seat, ...patch } : seat;
+    });
+  }
+  return next;
+}
+
+function expandFrames(frames: SpectatorWireFrame[]): SpectatorFrame[] {
+  const expanded: SpectatorFrame[] = [];
+  let current: SpectatorFrameState | undefined;
+  for (const { seq: _seq, delta, state, ...rest } of frames) {
+    if (state) {
+      current = state;
+    } else if (current && delta) {
+      current = applyDelta(current, delta);
+    } else {
+      continue;
+    }
+    expanded.push({ ...rest, state: current });
+  }
+  return expanded;
+}
+
 function applyLobby(state: SpectatorStoreState, message: SpectatorLobbyMessage): SpectatorStoreState {
   return {
     ...state,
@@ -68,9 +100,21 @@ function applyStart(state: SpectatorStoreState, message: SpectatorStartHandMessa
 function applyEvent(state: SpectatorStoreState, message: SpectatorEventMessage): SpectatorStoreState {
   const handId = message.hand_id;
   const existing = state.hands[handId];
+  let frameState = message.state;
+  if (!frameState && message.delta) {
+    const base = existing?.frames.at(-1)?.state;
+    if (!base) {
+      // Missed the keyframe; wait for the next one.
+      return state;
+    }
+    frameState = applyDelta(base, message.delta);
+  }
+  if (!frameState) {
+    return state;
+  }
   const frame: SpectatorFrame = {
     ts: message.ts,
-    state: message.state,
+    state: frameState,
     event: message.event
   };
   let frames: SpectatorFrame[];
@@ -133,7 +177,7 @@ function applySnapshot(state: SpectatorStoreState, message: SpectatorSnapshotMes
   const handId = message.hand_id;
   const timeline: SpectatorHandTimeline = {
     handId,
-    frames: message.frames,
+    frames: message.encoding === "delta" ? expandFrames(message.frames) : (message.frames as SpectatorFrame[]),
     results: message.results,
     closed: Boolean(message.results)
   };
@@ -451,6 +495,7 @@ export function useSpectatorStore(options: SpectatorStoreOptions = {}): Spectato
       const hello: Record<string, unknown> = {
         type: "hello",
         role: controlEnabled ? "operator" : "spectator",
+        frames: "delta",
       };
       if (controlEnabled) {
         hello["control"] = true;
@@ -36,6 +36,20 @@ export interface SpectatorFrame {
     event?: SpectatorEvent;
     label?: string;
 }
+export interface SpectatorStateDelta {
+    set?: Partial<Omit<SpectatorFrameState, "seats">>;
+    seats?: (Partial<SpectatorSeatState> & {
+        seat: number;
+    })[];
+}
+export interface SpectatorWireFrame {
+    ts?: string;
+    seq?: number;
+    state?: SpectatorFrameState;
+    delta?: SpectatorStateDelta;
+    event?: SpectatorEvent;
+    label?: string;
+}
 export interface SpectatorHandTimeline {
     handId: string;
     frames: SpectatorFrame[];
@@ -66,7 +80,9 @@ export interface SpectatorStartHandMessage {
 export interface SpectatorEventMessage {
     type: "spectator/event";
     hand_id: string;
-    state: SpectatorFrameState;
+    seq?: number;
+    state?: SpectatorFrameState;
+    delta?: SpectatorStateDelta;
     event: SpectatorEvent;
     ts?: string;
 }
@@ -80,7 +96,8 @@ export interface SpectatorEndHandMessage {
 export interface SpectatorSnapshotMessage {
     type: "spectator/snapshot";
     hand_id: string;
-    frames: SpectatorFrame[];
+    encoding?: "delta";
+    frames: SpectatorWireFrame[];
     results?: SpectatorHandTimeline["results"];
     ts?: string;
 }
@@ -41,6 +41,21 @@ export interface SpectatorFrame {
   label?: string;
 }
 
+export interface SpectatorStateDelta {
+  set?: Partial<Omit<SpectatorFrameState, "seats">>;
+  seats?: (Partial<SpectatorSeatState> & { seat: number })[];
+}
+
+// Wire form when the hello negotiated `frames: "delta"`: exactly one of state/delta.
+export interface SpectatorWireFrame {
+  ts?: string;
+  seq?: number;
+  state?: SpectatorFrameState;
+  delta?: SpectatorStateDelta;
+  event?: SpectatorEvent;
+  label?: string;
+}
+
 export interface SpectatorHandTimeline {
   handId: string;
   frames: SpectatorFrame[];
@@ -75,7 +90,9 @@ export interface SpectatorStartHandMessage {
 export interface SpectatorEventMessage {
   type: "spectator/event";
   hand_id: string;
-  state: SpectatorFrameState;
+  seq?: number;
+  state?: SpectatorFrameState;
+  delta?: SpectatorStateDelta;
   event: SpectatorEvent;
   ts?: string;
 }
@@ -91,7 +108,8 @@ export interface SpectatorEndHandMessage {
 export interface SpectatorSnapshotMessage {
   type: "spectator/snapshot";
   hand_id: string;
-  frames: SpectatorFrame[];
+  encoding?: "delta";
+  frames: SpectatorWireFrame[];
   results?: SpectatorHandTimeline["results"];
   ts?: string;
 }
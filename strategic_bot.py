@@ -13,6 +13,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--team", required=True, help="Registered team name")
     parser.add_argument("--url", default="ws://127.0.0.1:9876/ws", help="WebSocket URL")
     parser.add_argument("--bot", choices=["A", "B"], help="Optional practice slot label")
+    parser.add_argument("--compact", action="store_true", help="Negotiate binary frames instead of JSON text")
     parser.add_argument("--log-level", default="INFO", help="Logging level (INFO, DEBUG, ...)")
     return parser.parse_args()
 
@@ -20,7 +21,7 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO), format="%(message)s")
-    bot = StrategicBot(team_name=args.team, bot_label=args.bot)
+    bot = StrategicBot(team_name=args.team, bot_label=args.bot, compact_frames=args.compact)
     asyncio.run(bot.connect_and_play(args.url))
 
 
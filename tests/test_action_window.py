@@ -0,0 +1,48 @@
+import pytest
+
+from core.models import ACTION_BITS, ActionType
+
+from .helpers import create_engine, start_hand
+
+
+def test_window_is_computed_once_per_turn():
+    engine = create_engine(seats=3)
+    start_hand(engine, seed=7)
+    actor = engine.next_actor()
+
+    window = engine.action_window(actor)
+    engine.act_payload(actor)
+    engine.snapshot_payload(actor, time_ms_remaining=1_000)
+    assert engine.action_window(actor) is window
+    assert engine.legal_actions(actor) == window.as_tuple()
+
+    engine.apply_action(actor, ActionType.CALL, None)
+    next_window = engine.action_window(engine.next_actor())
+    assert next_window is not window
+    assert next_window.seat == engine.next_actor()
+
+
+def test_window_mask_matches_legal_actions():
+    engine = create_engine(seats=2)
+    start_hand(engine, seed=3)
+    actor = engine.next_actor()
+    window = engine.action_window(actor)
+
+    assert window.mask == sum(ACTION_BITS[action] for action in window.legal)
+    assert window.allows(ActionType.CALL)
+    assert not window.allows(ActionType.CHECK)
+    payload = engine.act_payload(actor)
+    assert payload["legal"] == [action.value for action in window.legal]
+    assert payload["call_amount"] == window.call_amount
+
+
+def test_window_is_immutable_and_checks_seat():
+    engine = create_engine(seats=2)
+    start_hand(engine, seed=3)
+    window = engine.action_window(engine.next_actor())
+    with pytest.raises(AttributeError):
+        window.call_amount = 0  # type: ignore[misc]
+
+    engine.hand = None
+    with pytest.raises(RuntimeError, match="Hand not in progress"):
+        engine.action_window(0)
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+
+from core.models import TableConfig
+from tournament.actor import TableActor
+from tournament.server import ClientSession, HostServer
+
+
+def test_jobs_run_one_at_a_time_in_order():
+    async def scenario():
+        actor = TableActor("T-1")
+        log: list[str] = []
+
+        async def job(name: str) -> str:
+            log.append(f"start {name}")
+            await asyncio.sleep(0)
+            log.append(f"end {name}")
+            return name
+
+        actor.post(job, "a")
+        result = await asyncio.gather(actor.call(job, "b"), actor.call(job, "c"))
+        await actor.close()
+        return log, result, actor.stats()
+
+    log, result, stats = asyncio.run(scenario())
+    assert log == ["start a", "end a", "start b", "end b", "start c", "end c"]
+    assert result == ["b", "c"]
+    assert stats["processed"] == 3 and stats["depth"] == 0
+
+
+def test_nested_calls_run_inline_and_failures_do_not_stop_the_actor():
+    async def scenario():
+        actor = TableActor("T-1")
+
+        async def inner() -> str:
+            return "inner"
+
+        async def outer() -> str:
+            # Would deadlock if the actor queued a call to itself.
+            return await actor.call(inner)
+
+        async def broken() -> None:
+            raise ValueError("boom")
+
+        actor.post(broken)
+        with pytest.raises(ValueError):
+            await actor.call(broken)
+        value = await actor.call(outer)
+        await actor.close()
+        return value, actor.failed
+
+    value, failed = asyncio.run(scenario())
+    assert value == "inner"
+    assert failed == 2
+
+
+class FakeWebSocket:
+    def __init__(self, hang_on_close: bool = False) -> None:
+        self.sent: list = []
+        self.close_code = None
+        self.hang_on_close = hang_on_close
+
+    async def send(self, message) -> None:
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.close_code = code
+        if self.hang_on_close:
+            # A peer that never answers the closing handshake.
+            await asyncio.Event().wait()
+
+
+async def _seat(server: HostServer, team: str, websocket: FakeWebSocket) -> ClientSession:
+    seat = await server.actor.call(server._claim_seat, team)
+    session = ClientSession(seat=seat.seat, team=seat.team, websocket=websocket)
+    await server.actor.call(server._register_player, session)
+    return session
+
+
+def test_replaced_connection_does_not_disconnect_its_successor():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, move_time_ms=0))
+        old = await _seat(server, "A", FakeWebSocket())
+        new = await _seat(server, "A", FakeWebSocket())
+        assert new.seat == old.seat
+        # The old handler's cleanup runs after the new session registered.
+        await server.actor.call(server._unregister_player, old)
+        replaced = (server.sessions.get(new.seat), server.engine.seats[new.seat].connected)
+        await server.actor.call(server._unregister_player, new)
+        return server, new.seat, replaced
+
+    server, seat, replaced = asyncio.run(scenario())
+    assert replaced[0] is not None and replaced[1]
+    assert seat not in server.sessions and not server.engine.seats[seat].connected
+    assert not server.outboxes
+
+
+def test_stale_expiry_leaves_the_rearmed_clock_alone():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, move_time_ms=60_000))
+        for team in ("A", "B"):
+            await _seat(server, team, FakeWebSocket())
+        seat = server.engine.next_actor()
+        stale = server.pending_action
+        assert stale is not None and stale.seat == seat
+        # The bot is prompted again before the first expiry reaches the actor.
+        await server._schedule_timer(seat)
+        current = server.pending_action
+        await server._timer_expired(seat, time.monotonic(), stale)
+        after_stale = (server.pending_action, server.engine.next_actor())
+        await server._timer_expired(seat, time.monotonic(), current)
+        after_current = (server.pending_action, server.engine.next_actor())
+        server._clear_pending_action_locked()
+        return seat, current, after_stale, after_current
+
+    seat, current, after_stale, after_current = asyncio.run(scenario())
+    assert after_stale == (current, seat)
+    assert after_current[0] is not current and after_current[1] != seat
+
+
+def test_forfeit_does_not_wait_for_the_socket_to_close():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, move_time_ms=0))
+        websocket = FakeWebSocket(hang_on_close=True)
+        session = await _seat(server, "A", websocket)
+        result = await asyncio.wait_for(server.actor.call(server._command_forfeit_seat, session.seat), timeout=1)
+        await asyncio.sleep(0)
+        return server, session.seat, result, websocket.close_code
+
+    server, seat, result, close_code = asyncio.run(scenario())
+    assert result == "removed" and close_code == 4401
+    assert seat not in server.sessions and server.engine.seats[seat].stack == 0
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import pytest
+
+from core.models import TableConfig
+from tournament.admission import ADMISSION_CLOSE_CODE, AdmissionConfig, AdmissionGate
+from tournament.metrics import HostMetrics
+from tournament.server import HostServer
+
+
+class DummyWebSocket:
+    def __init__(self, hello=None) -> None:
+        self.hello = hello
+        self.sent: list = []
+        self.close_code = None
+
+    async def recv(self):
+        return json.dumps(self.hello)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def send(self, message) -> None:
+        self.sent.append(json.loads(message))
+
+    async def close(self, code=1000, reason="") -> None:
+        self.close_code = code
+
+
+async def _send_json(websocket, msg_type, payload) -> None:
+    await websocket.send(json.dumps({"type": msg_type, **payload}))
+
+
+async def _read(websocket, timeout):
+    return json.loads(await asyncio.wait_for(websocket.recv(), timeout))
+
+
+def test_spectators_keep_out_of_the_slots_reserved_for_players():
+    async def scenario():
+        gate = AdmissionGate(AdmissionConfig(soft_limit=2, hard_limit=3, busy_hello_timeout_s=0.5), _send_json)
+        spectator = {"type": "hello", "role": "spectator"}
+        admitted = []
+        for hello in (spectator, spectator, spectator, {"type": "hello", "team": "A"}):
+            websocket = DummyWebSocket(hello)
+            accepted, hello = await gate.handshake(websocket, _read)
+            if accepted and await gate.admit(websocket, hello):
+                admitted.append(websocket)
+        # The third spectator arrived at the soft limit; the bot still got in.
+        assert gate.admitted == {"player": 1, "operator": 0, "spectator": 2}
+        assert gate.refused == {("spectator", "busy"): 1}
+        assert gate.hello_timeout() == 0.5
+
+        # At the hard limit a bot takes the newest spectator's slot ...
+        bot = DummyWebSocket({"type": "hello", "team": "B"})
+        accepted, hello = await gate.handshake(bot, _read)
+        assert accepted and await gate.admit(bot, hello)
+        await asyncio.sleep(0)
+        assert admitted[1].close_code == ADMISSION_CLOSE_CODE and admitted[0].close_code is None
+        assert gate.shed == 1
+        gate.release(admitted[1])
+
+        # ... and so does the next one, leaving only bots ...
+        second = DummyWebSocket({"type": "hello", "team": "C"})
+        accepted, hello = await gate.handshake(second, _read)
+        assert accepted and await gate.admit(second, hello)
+        await asyncio.sleep(0)
+        assert admitted[0].close_code == ADMISSION_CLOSE_CODE and gate.shed == 2
+        gate.release(admitted[0])
+
+        # ... after which a new socket is refused before its hello.
+        refused = DummyWebSocket({"type": "hello", "team": "D"})
+        assert await gate.handshake(refused, _read) == (False, None)
+        assert refused.close_code == ADMISSION_CLOSE_CODE
+        (error,) = refused.sent
+        assert error["code"] == "OVER_CAPACITY" and 5_000 <= error["retry_after_ms"] <= 7_500
+        assert gate.refused[("unknown", "full")] == 1
+
+        for websocket in (admitted[2], bot, second):
+            gate.release(websocket)
+        assert gate.open == 0
+
+    asyncio.run(scenario())
+
+
+def test_role_caps_and_config_validation():
+    async def scenario():
+        gate = AdmissionGate(AdmissionConfig(max_players=1, max_spectators=0), _send_json)
+        assert await gate.admit(DummyWebSocket(), {"type": "hello", "team": "A"})
+        assert not await gate.admit(DummyWebSocket(), {"type": "hello", "team": "B"})
+        assert not await gate.admit(DummyWebSocket(), {"type": "hello", "role": "spectator"})
+        # Operators are not spectators for admission purposes.
+        assert await gate.admit(DummyWebSocket(), {"type": "hello", "role": "operator"})
+        assert gate.refused == {("player", "role_limit"): 1, ("spectator", "role_limit"): 1}
+
+    asyncio.run(scenario())
+    with pytest.raises(ValueError):
+        AdmissionConfig(soft_limit=30, hard_limit=25)
+
+
+def test_host_counts_connections_until_the_session_ends():
+    metrics = HostMetrics()
+    server = HostServer(TableConfig(seats=2), metrics=metrics)
+    server.admission = AdmissionGate(AdmissionConfig(soft_limit=0, hard_limit=1), server._send_json)
+    metrics.attach_admission(server.admission)
+
+    spectator = DummyWebSocket({"type": "hello", "role": "spectator"})
+    asyncio.run(server._handle_connection(spectator))
+    assert spectator.close_code == ADMISSION_CLOSE_CODE
+    assert [message["code"] for message in spectator.sent] == ["OVER_CAPACITY"]
+    assert not server.spectators
+
+    bot = DummyWebSocket({"type": "hello", "team": "A"})
+    asyncio.run(server._handle_connection(bot))
+    assert bot.close_code != ADMISSION_CLOSE_CODE and bot.sent[0]["type"] == "welcome"
+    assert server.admission.open == 0
+
+    text = metrics.render()
+    assert 'poker_connections_refused_total{reason="busy",role="spectator"} 1' in text
+    assert "poker_connections_pending 0" in text
+
+
+class SilentWebSocket(DummyWebSocket):
+    async def recv(self):
+        await asyncio.sleep(3600)
+
+
+def test_practice_host_applies_the_same_gate():
+    from practice.server import ABTableManager, _send_json as practice_send_json, handle_connection
+
+    config = TableConfig(seats=2)
+    gate = AdmissionGate(AdmissionConfig(soft_limit=0, hard_limit=1, busy_hello_timeout_s=0.05), practice_send_json)
+
+    async def scenario():
+        manager = ABTableManager(config)
+        # Above the soft limit a silent socket gets the short deadline.
+        silent = SilentWebSocket()
+        await asyncio.wait_for(handle_connection(silent, config, manager, gate=gate), timeout=1)
+        assert [message["code"] for message in silent.sent] == ["BAD_HELLO"]
+
+        assert await gate.admit(DummyWebSocket(), {"type": "hello", "team": "A"})
+        refused = DummyWebSocket({"type": "hello", "team": "B"})
+        await handle_connection(refused, config, manager, gate=gate)
+        assert refused.close_code == ADMISSION_CLOSE_CODE
+        assert [message["code"] for message in refused.sent] == ["OVER_CAPACITY"]
+
+    asyncio.run(scenario())
+    assert gate.pending == 0 and gate.refused == {("unknown", "full"): 1}
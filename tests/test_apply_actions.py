@@ -0,0 +1,67 @@
+import pytest
+
+from core.game import IllegalActionError
+from core.models import ActionType, Phase
+
+from .helpers import create_engine, start_hand
+
+
+def _record_hand(seed: int):
+    engine = create_engine(seats=3)
+    start_hand(engine, seed=seed)
+    script = []
+    events = []
+    while not engine.is_hand_complete():
+        actor = engine.next_actor()
+        window = engine.action_window(actor)
+        if window.allows(ActionType.RAISE_TO) and len(script) == 1:
+            step = (actor, ActionType.RAISE_TO, window.min_raise_to)
+        elif window.allows(ActionType.CHECK):
+            step = (actor, ActionType.CHECK, None)
+        else:
+            step = (actor, ActionType.CALL, None)
+        script.append(step)
+        events.extend(engine.apply_action(*step))
+    return script, events, [seat.stack for seat in engine.seats]
+
+
+def test_batch_replay_matches_single_steps():
+    script, events, stacks = _record_hand(seed=11)
+
+    engine = create_engine(seats=3)
+    start_hand(engine, seed=11)
+    result = engine.apply_actions(script)
+
+    assert result.applied == len(script)
+    assert result.events == events
+    assert result.stacks == stacks
+    assert result.hand_complete
+    assert result.phase == Phase.SHOWDOWN
+
+
+def test_batch_without_events_returns_summary_only():
+    script, _, stacks = _record_hand(seed=12)
+    engine = create_engine(seats=3)
+    start_hand(engine, seed=12)
+    # Stored histories carry plain strings; they are accepted as-is.
+    result = engine.apply_actions([(seat, action.value, amount) for seat, action, amount in script], collect_events=False)
+    assert result.events is None
+    assert result.stacks == stacks
+
+
+def test_batch_stops_at_first_illegal_action():
+    engine = create_engine(seats=3)
+    start_hand(engine, seed=5)
+    first = engine.next_actor()
+    second = (first + 1) % 3
+
+    with pytest.raises(IllegalActionError) as excinfo:
+        engine.apply_actions([(first, ActionType.CALL, None), (second, ActionType.CHECK, None)])
+    assert excinfo.value.index == 1
+    assert excinfo.value.seat == second
+    assert "Cannot check" in str(excinfo.value)
+    # The legal prefix stays applied and the actor is unchanged.
+    assert engine.next_actor() == second
+
+    with pytest.raises(IllegalActionError, match=f"seat {second} is to act"):
+        engine.apply_actions([(first, ActionType.CALL, None)])
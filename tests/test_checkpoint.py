@@ -0,0 +1,128 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from core.game import GameEngine
+from core.models import ActionType, TableConfig
+from tests.helpers import create_engine
+from tournament.checkpoint import Checkpointer, boundary_snapshot, load_checkpoints, restore_engine
+from tournament.server import ClientSession, HostServer
+
+
+def _table_state(engine):
+    ctx = engine.hand
+    seats = [
+        (seat.team, seat.stack, seat.committed, seat.has_folded, list(seat.hole_cards)) if seat else None
+        for seat in engine.seats
+    ]
+    if ctx is None:
+        return seats, engine.button, engine.hand_counter, None
+    hand = (ctx.hand_id, ctx.phase, ctx.pot, ctx.current_bet, [card.label for card in ctx.community])
+    return seats, engine.button, engine.hand_counter, (hand, engine.next_actor())
+
+
+def _random_action(engine, rng):
+    seat = engine.next_actor()
+    payload = engine.act_payload(seat)
+    if "RAISE_TO" in payload["legal"] and rng.random() < 0.3:
+        return seat, ActionType.RAISE_TO, payload["min_raise_to"]
+    return seat, ActionType(rng.choice([name for name in payload["legal"] if name != "RAISE_TO"])), None
+
+
+@pytest.mark.parametrize("stop_after", [0, 1, 3, 6])
+def test_mid_hand_checkpoint_restores_the_same_table(tmp_path, stop_after):
+    checkpointer = Checkpointer(str(tmp_path), mid_hand=True)
+    checkpointer.start()
+    engine = create_engine(seats=4, starting_stack=100_000)
+    checkpointer.attach(engine, "T-3")
+    rng = random.Random(stop_after)
+    for seed in range(3):
+        engine.start_hand(seed=seed)
+        while not engine.is_hand_complete():
+            engine.apply_action(*_random_action(engine, rng))
+        engine.hand = None
+    engine.start_hand(seed=99)
+    for _ in range(stop_after):
+        engine.apply_action(*_random_action(engine, rng))
+    assert not engine.is_hand_complete()
+    checkpointer.close()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["T-3.json"]
+    snapshot = load_checkpoints(str(tmp_path))["T-3"]
+    restored = create_engine(seats=4, starting_stack=100_000)
+    restored.seats = [None] * 4
+    restore_engine(restored, snapshot)
+    if stop_after == 0:
+        # No action yet this hand: the last checkpoint is the previous boundary.
+        assert snapshot["hand"] is None and restored.hand is None
+        assert [seat.stack for seat in restored.seats] == [seat.stack + seat.total_in_pot for seat in engine.seats]
+    else:
+        assert _table_state(restored) == _table_state(engine)
+        assert not any(seat.connected for seat in restored.seats)
+
+
+def test_restore_rejects_a_different_table(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path))
+    checkpointer.start()
+    for _ in range(3):
+        checkpointer.save("T-1", boundary_snapshot(create_engine(seats=2), "T-1"))
+    checkpointer.close()
+    # Only the newest snapshot is written, and no temporary file is left behind.
+    assert [path.name for path in tmp_path.iterdir()] == ["T-1.json"] and checkpointer.written <= 3
+    snapshot = load_checkpoints(str(tmp_path))["T-1"]
+    with pytest.raises(ValueError):
+        restore_engine(GameEngine(TableConfig(seats=3)), snapshot)
+    with pytest.raises(RuntimeError):
+        restore_engine(create_engine(seats=2), snapshot)
+    engine = GameEngine(TableConfig(seats=2, starting_stack=1_000, sb=10, bb=20))
+    assert restore_engine(engine, snapshot) is None
+    assert [seat.team for seat in engine.seats] == ["Player0", "Player1"]
+
+
+class DummyWebSocket:
+    def __init__(self) -> None:
+        self.sent: list = []
+
+    async def send(self, message) -> None:
+        self.sent.append(message)
+
+    async def close(self, *args, **kwargs) -> None:
+        pass
+
+
+def test_host_resumes_a_hand_and_seats_returning_bots(tmp_path):
+    config = TableConfig(seats=2, starting_stack=1_000, sb=5, bb=10, move_time_ms=0)
+
+    async def play_then_crash():
+        checkpointer = Checkpointer(str(tmp_path), mid_hand=True)
+        checkpointer.start()
+        server = HostServer(config, checkpointer=checkpointer)
+        sessions = {}
+        for team in ("A", "B"):
+            seat = await server._claim_seat(team)
+            sessions[seat.seat] = ClientSession(seat.seat, team, DummyWebSocket())
+            await server._register_player(sessions[seat.seat])
+        actor = server.engine.next_actor()
+        await server._handle_action(sessions[actor], {"hand_id": server.engine.hand.hand_id, "action": "CALL"})
+        checkpointer.close()
+        return _table_state(server.engine)
+
+    async def restart():
+        server = HostServer(config)
+        server.restore_checkpoint(load_checkpoints(str(tmp_path))["T-1"])
+        restored = _table_state(server.engine)
+        websocket = DummyWebSocket()
+        seat = await server._claim_seat("b")
+        await server._register_player(ClientSession(seat.seat, "B", websocket))
+        for outbox in server.outboxes.values():
+            await outbox.flush()
+        return restored, seat.seat, [json.loads(message)["type"] for message in websocket.sent]
+
+    before = asyncio.run(play_then_crash())
+    restored, seat, sent = asyncio.run(restart())
+    assert restored == before
+    assert seat == 1 and sent[0] == "welcome"
+    # The hand is still running, so the returning bot gets a snapshot and, on its turn, the prompt.
+    assert "snapshot" in sent and sent[-1] == "act"
@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from core import compact
+from core.game import GameEngine
+from core.models import ActionType, TableConfig
+from tournament.server import ClientSession, HostServer
+
+
+def _engine_messages():
+    engine = GameEngine(TableConfig(seats=3, starting_stack=1_000, sb=5, bb=10))
+    for idx in range(3):
+        engine.assign_seat(f"Team{idx}")
+    ctx = engine.start_hand(seed=3)
+    messages = [{"type": "start_hand", **engine.start_hand_payload(ctx)}]
+    messages += [{"type": "event", **event} for event in engine.consume_pre_events()]
+    while not engine.is_hand_complete():
+        actor = engine.next_actor()
+        if actor is None:
+            break
+        messages.append({"type": "act", **engine.act_payload(actor)})
+        window = engine.action_window(actor)
+        action = ActionType.CHECK if window.allows(ActionType.CHECK) else ActionType.CALL
+        messages += [{"type": "event", **event} for event in engine.apply_action(actor, action, None)]
+    return messages
+
+
+def test_round_trips_a_whole_hand_smaller_than_json():
+    messages = _engine_messages()
+    assert any(msg.get("ev") == "SHOWDOWN" for msg in messages)
+    for message in messages:
+        packed = compact.encode(message)
+        assert compact.is_compact(packed)
+        assert compact.decode(packed) == json.loads(json.dumps(message))
+        assert len(packed) < len(json.dumps(message, separators=(",", ":")))
+
+
+def test_cards_travel_as_integers():
+    packed = compact.encode({"hole": ["As", "Kd"], "card": "2h"})
+    assert packed == bytes([0x82, compact.KEYS.index("hole"), 0xC4, 2, 51, 45,
+                            compact.KEYS.index("card"), 0xD4, compact.CARD_EXT, 0])
+    # Anything that is not a card label stays a string.
+    assert compact.decode(compact.encode({"hand": "H-1", "board": ["Xx"]})) == {"hand": "H-1", "board": ["Xx"]}
+
+
+def test_values_outside_the_fast_paths_round_trip():
+    message = {
+        "n": [0, 127, 128, -1, -33, 70_000, -70_000, 2**40, -(2**40), 1.5, None, True, False],
+        "s": ["", "x" * 40, "é" * 200, "y" * 70_000],
+        "deep": {"list": list(range(20)), "map": {str(idx): idx for idx in range(20)}},
+        7: "int keys become strings",
+    }
+    assert compact.decode(compact.encode(message)) == json.loads(json.dumps(message))
+    assert compact.encode_envelope("event", {"ev": "CHECK"}, "ts", 4) == compact.encode(
+        {"type": "event", "v": 1, "ts": "ts", "log_seq": 4, "ev": "CHECK"}
+    )
+
+
+def test_rejects_what_it_cannot_carry():
+    assert not compact.is_compact(b'{"type":"action"}')
+    assert not compact.is_compact("text")
+    with pytest.raises(TypeError):
+        compact.encode({"x": object()})
+    with pytest.raises(ValueError):
+        compact.decode(compact.encode({"a": 1}) + b"\x00")
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        b"\x81\x91\xc0\xc0",  # array as a map key
+        b"\x81\xc0\x01",  # nil as a map key
+        b"\x91" * 5_000 + b"\xc0",  # nesting past MAX_DEPTH
+        b"\x91\xc0",  # top level is not a map
+        b"\x81\x7f\x01",  # key id past the end of KEYS
+        b"\x81\x00\xcb\x00",  # truncated float
+    ],
+)
+def test_malformed_frames_raise_value_error(frame):
+    with pytest.raises(ValueError):
+        compact.decode(frame)
+
+
+def test_hosts_answer_malformed_frames_instead_of_dying():
+    from practice.server import _decode as practice_decode
+
+    server = HostServer(TableConfig(seats=2))
+    for frame in (b"\x81\x91\xc0\xc0", b"\x91" * 5_000 + b"\xc0", b"\x91\xc0", "[1]", "[" * 5_000):
+        assert server._decode(frame) == {}
+        assert practice_decode(frame) == {}
+
+
+class DummyWebSocket:
+    def __init__(self) -> None:
+        self.sent: list = []
+
+    async def send(self, message) -> None:
+        self.sent.append(message)
+
+
+def test_host_sends_binary_frames_after_a_text_welcome():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, starting_stack=500, sb=5, bb=10, move_time_ms=0))
+        packed_bot, text_bot = DummyWebSocket(), DummyWebSocket()
+        for team, websocket, packed in (("A", packed_bot, True), ("B", text_bot, False)):
+            seat = await server._claim_seat(team)
+            await server._register_player(ClientSession(seat.seat, team, websocket, compact=packed))
+        for outbox in server.outboxes.values():
+            await outbox.flush()
+        return server, packed_bot.sent, text_bot.sent
+
+    server, packed_sent, text_sent = asyncio.run(scenario())
+    welcome = json.loads(packed_sent[0])
+    assert welcome["type"] == "welcome" and welcome["encoding"] == "compact"
+    assert "encoding" not in json.loads(text_sent[0])
+    assert all(isinstance(message, bytes) for message in packed_sent[1:])
+    assert all(isinstance(message, str) for message in text_sent)
+    # Seat 0 also saw the lobby before B joined, and acts first.
+    packed_types = [compact.decode(m)["type"] for m in packed_sent[1:]]
+    text_types = [json.loads(m)["type"] for m in text_sent[1:]]
+    assert packed_types[-1] == "act" and packed_types[-1 - len(text_types):-1] == text_types
+    assert server._decode(compact.encode({"type": "action", "action": "CALL"})) == {"type": "action", "action": "CALL"}
+    assert server._decode(b"\x85\x00") == {}
+
+
+def test_compact_bot_plays_a_hand_over_websockets():
+    from tournament.multi_table import MultiTableHost
+
+    async def scenario():
+        host = MultiTableHost(TableConfig(seats=2, starting_stack=10_000, sb=5, bb=10, move_time_ms=0), tables=1)
+        server = await websockets.serve(host._handle_connection, "127.0.0.1", 0)
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}/ws"
+        frames = []
+
+        async def bot(team: str) -> None:
+            async with websockets.connect(url) as ws:
+                await ws.send(json.dumps({"type": "hello", "team": team, "encoding": "compact", "events": "batch"}))
+                assert json.loads(await ws.recv())["encoding"] == "compact"
+                while True:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=5)
+                    frames.append(type(raw))
+                    message = compact.decode(raw)
+                    if message["type"] == "act":
+                        action = "CHECK" if "CHECK" in message["legal"] else "CALL"
+                        await ws.send(compact.encode({"type": "action", "hand_id": message["hand_id"], "action": action}))
+                    elif message["type"] == "end_hand":
+                        return
+
+        try:
+            await asyncio.gather(bot("A"), bot("B"))
+        finally:
+            server.close()
+            await server.wait_closed()
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert frames and set(frames) == {bytes}
@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from tournament.compression import CompressionConfig, deflate_factory, is_spectator_path
+
+
+def test_profiles_are_picked_by_path():
+    config = CompressionConfig(bots="off", spectators="max")
+    assert config.extensions_for("/ws") == []
+    (factory,) = config.extensions_for("/spectate?table_id=T-1")
+    assert factory.server_max_window_bits == 15 and factory.compress_settings == {"level": 9, "memLevel": 9}
+    assert is_spectator_path("/spectate/") and not is_spectator_path("/spectators")
+    assert deflate_factory("off") is None
+    with pytest.raises(ValueError):
+        CompressionConfig(bots="zstd")
+
+
+def test_server_negotiates_per_connection_type():
+    async def scenario():
+        async def echo(websocket, *args):
+            async for message in websocket:
+                await websocket.send(message)
+
+        config = CompressionConfig(bots="off", spectators="fast")
+        server = await websockets.serve(echo, "127.0.0.1", 0, **config.serve_options())
+        base = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        negotiated = {}
+        try:
+            for path in ("/ws", "/spectate"):
+                async with websockets.connect(base + path) as ws:
+                    await ws.send(json.dumps({"type": "hello"}))
+                    assert json.loads(await ws.recv()) == {"type": "hello"}
+                    negotiated[path] = ws.response_headers.get("Sec-WebSocket-Extensions")
+        finally:
+            server.close()
+            await server.wait_closed()
+        return negotiated
+
+    negotiated = asyncio.run(scenario())
+    assert negotiated["/ws"] is None
+    assert negotiated["/spectate"].startswith("permessage-deflate")
+    assert "server_max_window_bits=15" in negotiated["/spectate"]
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+
+from core.models import TableConfig
+from tournament.deadlines import DeadlineScheduler
+from tournament.server import ClientSession, HostServer
+
+
+class RecordingWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    async def close(self, *args, **kwargs) -> None:
+        pass
+
+
+def test_scheduler_fires_in_deadline_order_with_one_task():
+    async def scenario():
+        scheduler = DeadlineScheduler()
+        fired: list[str] = []
+        tasks_before = len(asyncio.all_tasks())
+        now = time.monotonic()
+        for name, delay in (("c", 0.03), ("a", 0.01), ("b", 0.02)):
+            scheduler.schedule(now + delay, lambda _now, name=name: fired.append(name))
+        dropped = scheduler.schedule(now + 0.015, lambda _now: fired.append("cancelled"))
+        dropped.cancel()
+        assert len(asyncio.all_tasks()) == tasks_before + 1
+        assert len(scheduler) == 3
+        await asyncio.sleep(0.06)
+        await scheduler.close()
+        return fired, scheduler.fired
+
+    fired, count = asyncio.run(scenario())
+    assert fired == ["a", "b", "c"]
+    assert count == 3
+
+
+def test_earlier_deadline_wakes_a_sleeping_scheduler():
+    async def scenario():
+        scheduler = DeadlineScheduler()
+        fired: list[float] = []
+        scheduler.call_later(10, lambda now: fired.append(now))
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        scheduler.call_later(0.01, lambda now: fired.append(now))
+        await asyncio.sleep(0.05)
+        await scheduler.close()
+        return started, fired
+
+    started, fired = asyncio.run(scenario())
+    assert len(fired) == 1
+    assert fired[0] - started < 0.04
+
+
+def test_stalled_bot_gets_fallback_and_true_remaining_time():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, starting_stack=200, sb=5, bb=10, move_time_ms=50))
+        sockets = []
+        for idx in range(2):
+            seat = server.engine.assign_seat(f"Team{idx}")
+            socket = RecordingWebSocket()
+            server.sessions[seat.seat] = ClientSession(seat=seat.seat, team=seat.team, websocket=socket)
+            server.engine.set_connected(seat.seat, True)
+            sockets.append(socket)
+        server.engine.start_hand(seed=11)
+        actor = server.engine.next_actor()
+        await server._prompt_next_actor()
+        assert server.pending_action is not None and server.pending_action.seat == actor
+
+        await asyncio.sleep(0.02)
+        remaining = server._time_remaining_ms()
+        snapshot = server.engine.snapshot_payload(actor, remaining)
+        # Nobody answers: the scheduler applies the fallback on its own.
+        await asyncio.sleep(0.06)
+        return server, actor, sockets, remaining, snapshot
+
+    server, actor, sockets, remaining, snapshot = asyncio.run(scenario())
+    assert 0 < remaining < 50
+    assert snapshot["time_ms_remaining"] == remaining
+    admin = [msg for msg in sockets[0].sent if msg["type"] == "admin"]
+    assert admin and admin[0] == {**admin[0], "event": "TIMEOUT", "seat": actor}
+    acted = [msg for msg in sockets[0].sent if msg["type"] == "event" and msg.get("seat") == actor]
+    assert acted, "fallback action was not broadcast"
@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+from core.models import TableConfig
+from tournament.event_log import EventLog, parse_resume
+from tournament.server import ClientSession, HostServer
+
+
+class DummyWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+
+def test_log_replays_the_gap_and_gives_up_past_eviction():
+    log = EventLog("T-1/players", max_events=3)
+    for n in range(1, 6):
+        log.record("event", {"n": n})
+    assert [entry.payload["n"] for entry in log.since(3)] == [4, 5]
+    assert log.since(5) == []
+    assert [entry.seq for entry in log.since(2)] == [3, 4, 5]
+    assert log.since(1) is None
+    assert log.since(9) is None
+    assert log.since(3, stream="T-1/players:old") is None
+
+
+def test_logged_messages_are_encoded_once():
+    calls = []
+
+    def encode(msg_type, payload, seq):
+        calls.append(seq)
+        return json.dumps({"type": msg_type, "log_seq": seq, **payload})
+
+    entry = EventLog("T-1/players").record("event", {"ev": "CHECK"})
+    assert json.loads(entry.message(encode)) == {"type": "event", "log_seq": 1, "ev": "CHECK"}
+    entry.message(encode)
+    assert calls == [1]
+
+
+def test_parse_resume_accepts_only_non_negative_ints():
+    assert parse_resume({"resume_from": 4}) == 4
+    assert parse_resume({"resume_from": True}) is None
+    assert parse_resume({"resume_from": "4"}) is None
+    assert parse_resume({}) is None
+
+
+async def _seat(server: HostServer, team: str, websocket, resume=None) -> None:
+    seat = await server._claim_seat(team)
+    await server._register_player(ClientSession(seat=seat.seat, team=team, websocket=websocket), resume)
+    await server.outboxes[websocket].flush()
+
+
+async def _miss_some_actions(server: HostServer, websocket) -> int:
+    """Disconnect seat 0, play until it is its turn again; returns the last log_seq it saw."""
+    last_seen = max(msg["log_seq"] for msg in websocket.sent if "log_seq" in msg and msg["type"] != "welcome")
+    await server._unregister_player(server.sessions[0])
+    await server._handle_skip_request()
+    while server.engine.next_actor() != 0:
+        await server._handle_skip_request()
+    return last_seen
+
+
+def test_reconnecting_bot_receives_only_missed_messages():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, starting_stack=500, sb=5, bb=10, move_time_ms=0))
+        first, other = DummyWebSocket(), DummyWebSocket()
+        await _seat(server, "A", first)
+        await _seat(server, "B", other)
+        last_seen = await _miss_some_actions(server, first)
+        resumed = DummyWebSocket()
+        await _seat(server, "A", resumed, (last_seen, server.player_log.stream))
+        return server, last_seen, resumed.sent
+
+    server, last_seen, sent = asyncio.run(scenario())
+    assert sent[0]["type"] == "welcome" and sent[0]["resume"] == "replay"
+    assert "snapshot" not in [msg["type"] for msg in sent]
+    replayed = [msg["log_seq"] for msg in sent[1:] if "log_seq" in msg]
+    assert replayed == list(range(last_seen + 1, server.player_log.last_seq + 1))
+    assert sent[-1]["type"] == "act"
+
+
+def test_reconnect_falls_back_to_snapshot_when_the_gap_was_evicted():
+    async def scenario():
+        server = HostServer(
+            TableConfig(seats=2, starting_stack=500, sb=5, bb=10, move_time_ms=0),
+            event_log_size=1,
+        )
+        first, other = DummyWebSocket(), DummyWebSocket()
+        await _seat(server, "A", first)
+        await _seat(server, "B", other)
+        last_seen = await _miss_some_actions(server, first)
+        resumed = DummyWebSocket()
+        await _seat(server, "A", resumed, (last_seen, server.player_log.stream))
+        return resumed.sent
+
+    sent = asyncio.run(scenario())
+    assert sent[0]["resume"] == "snapshot"
+    assert [msg["type"] for msg in sent].count("snapshot") == 1
+    assert sent[-1]["type"] == "act"
+
+
+def test_spectator_resume_skips_the_catchup_snapshot():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, starting_stack=500, sb=5, bb=10, move_time_ms=0))
+        await _seat(server, "A", DummyWebSocket())
+        await _seat(server, "B", DummyWebSocket())
+        seen = server.spectator_log.last_seq
+        await server._handle_skip_request()
+        watcher = DummyWebSocket()
+        await server._register_spectator(watcher, False, False, (seen, None))
+        await server.outboxes[watcher].flush()
+        return server, seen, watcher.sent
+
+    server, seen, sent = asyncio.run(scenario())
+    types = [msg["type"] for msg in sent]
+    assert sent[0]["type"] == "spectator/lobby" and sent[0]["resume"] == "replay"
+    assert "spectator/snapshot" not in types
+    replayed = [msg["log_seq"] for msg in sent if "log_seq" in msg and msg["type"] != "spectator/lobby"]
+    assert replayed == list(range(seen + 1, server.spectator_log.last_seq + 1))
+
+
+def test_batch_clients_get_one_message_per_action_and_others_one_per_event():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, starting_stack=500, sb=5, bb=10, move_time_ms=0))
+        batch_bot, plain_bot = DummyWebSocket(), DummyWebSocket()
+        seat = await server._claim_seat("A")
+        await server._register_player(ClientSession(seat.seat, "A", batch_bot, batch_events=True))
+        await _seat(server, "B", plain_bot)
+        batch_watcher, plain_watcher = DummyWebSocket(), DummyWebSocket()
+        await server._register_spectator(batch_watcher, False, True, None, True)
+        await server._register_spectator(plain_watcher, False, False)
+        for socket in (batch_bot, batch_watcher, plain_watcher):
+            socket.sent.clear()
+        # Check/call down: the last call of each street also deals the next one.
+        hand_id = server.engine.hand.hand_id
+        while server.engine.hand is not None and server.engine.hand.hand_id == hand_id:
+            await server._handle_skip_request()
+        for outbox in server.outboxes.values():
+            await outbox.flush()
+        return server, batch_bot.sent, plain_bot.sent, batch_watcher.sent, plain_watcher.sent
+
+    server, batch_bot, plain_bot, batch_watcher, plain_watcher = asyncio.run(scenario())
+    batches = [msg for msg in batch_bot if msg["type"] == "events"]
+    assert batches and "event" not in [msg["type"] for msg in batch_bot]
+    assert any(len(msg["events"]) > 1 for msg in batches)
+    flattened = [event for msg in batches for event in msg["events"]]
+    singles = [msg for msg in plain_bot if msg["type"] == "event"]
+    assert [event["ev"] for event in flattened] == [msg["ev"] for msg in singles[-len(flattened):]]
+    # A batch carries the log_seq of its last event, so resuming works the same way.
+    assert batches[-1]["log_seq"] == max(msg["log_seq"] for msg in singles)
+
+    spectator_batches = [msg for msg in batch_watcher if msg["type"] == "spectator/events"]
+    assert spectator_batches and "spectator/event" not in [msg["type"] for msg in batch_watcher]
+    per_event = [msg for msg in plain_watcher if msg["type"] == "spectator/event"]
+    assert sum(len(msg["events"]) for msg in spectator_batches) == len(per_event)
+    assert len(spectator_batches) < len(per_event)
@@ -431,3 +431,23 @@ def test_spectator_state_includes_omniscient_view():
     assert state["next_actor"] in seats
     # Since spectator view is omniscient, each seat exposes committed stack data.
     assert all("committed" in entry for entry in seats.values())
+
+
+def test_player_joining_mid_hand_sits_out_until_next_deal():
+    engine = GameEngine(TableConfig(seats=4, starting_stack=1_000, sb=10, bb=20))
+    engine.assign_seat("Alpha")
+    engine.assign_seat("Beta")
+    engine.start_hand(seed=1)
+    late = engine.assign_seat("Gamma")
+    assert late.has_folded and not late.hole_cards
+
+    # Heads-up fold ends the hand; the new seat is neither prompted nor a live opponent.
+    actor = engine.next_actor()
+    assert actor != late.seat
+    engine.apply_action(actor, ActionType.FOLD, None)
+    assert engine.is_hand_complete()
+
+    engine.hand = None
+    engine.start_hand(seed=2)
+    assert not late.has_folded
+    assert len(late.hole_cards) == 2
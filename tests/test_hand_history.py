@@ -0,0 +1,116 @@
+import json
+import random
+
+from core.models import ActionType, TableConfig
+from tests.helpers import create_engine
+from tournament.hand_history import HandHistoryRecorder
+from tournament.metrics import HostMetrics
+from tournament.server import HostServer
+
+
+def _play_hand(engine, rng: random.Random, seed: int) -> None:
+    engine.start_hand(seed=seed)
+    while not engine.is_hand_complete():
+        seat = engine.next_actor()
+        payload = engine.act_payload(seat)
+        legal = payload["legal"]
+        if "RAISE_TO" in legal and rng.random() < 0.3:
+            amount = rng.randint(payload["min_raise_to"], payload["max_raise_to"])
+            engine.apply_action(seat, ActionType.RAISE_TO, amount)
+        else:
+            choice = rng.choice([name for name in legal if name != "RAISE_TO"])
+            engine.apply_action(seat, ActionType(choice), None)
+    engine.hand = None
+
+
+def _read_records(directory) -> list:
+    records = []
+    for path in sorted(directory.glob("hands-*.jsonl")):
+        records += [json.loads(line) for line in path.read_text().splitlines()]
+    return records
+
+
+def test_records_replay_to_the_same_result(tmp_path):
+    recorder = HandHistoryRecorder(str(tmp_path), fsync_interval_s=0.01)
+    recorder.start()
+    engine = create_engine(seats=4, starting_stack=5_000)
+    recorder.attach(engine, "T-9")
+    rng = random.Random(5)
+    for seed in range(30):
+        if not engine.can_start_hand():
+            break
+        _play_hand(engine, rng, seed)
+    hands = engine.hand_counter
+    recorder.close()
+
+    records = _read_records(tmp_path)
+    assert len(records) == hands == recorder.written
+    assert recorder.fsyncs >= 1 and recorder.dropped == 0
+    assert any(action[1] == "RAISE_TO" for record in records for action in record["actions"])
+
+    # Same seats and seed, then the recorded actions, give the recorded outcome.
+    first = records[0]
+    assert first["table_id"] == "T-9" and [p["stack"] for p in first["players"]] == [5_000] * 4
+    replay = create_engine(seats=4, starting_stack=5_000)
+    replay.start_hand(seed=first["seed"])
+    assert [seat.hole_cards for seat in replay.seats] == [p["hole"] for p in first["players"]]
+    result = replay.apply_actions([tuple(action) for action in first["actions"]])
+    assert result.hand_complete
+    assert [{"seat": idx, "stack": stack} for idx, stack in enumerate(result.stacks)] == first["stacks"]
+    awards = [{"seat": e["seat"], "amount": e["amount"]} for e in result.events if e["ev"] == "POT_AWARD"]
+    assert awards == first["payouts"]
+
+
+def test_segments_roll_and_restarts_continue_numbering(tmp_path):
+    for run in range(2):
+        recorder = HandHistoryRecorder(str(tmp_path), segment_bytes=1_000)
+        recorder.start()
+        engine = create_engine(seats=2, starting_stack=100_000)
+        recorder.attach(engine, f"T-{run}")
+        for seed in range(10):
+            _play_hand(engine, random.Random(seed), seed)
+        recorder.close()
+        assert recorder.segments > 1
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == [f"hands-{index:06d}.jsonl" for index in range(1, len(names) + 1)]
+    for run in range(2):
+        segments = [path.read_bytes().splitlines(keepends=True) for path in sorted(tmp_path.iterdir())]
+        segments = [lines for lines in segments if b'"T-%d"' % run in lines[0]]
+        assert sum(len(lines) for lines in segments) == 10
+        # Every closed segment ends on the record that filled it, never earlier or later.
+        for lines in segments[:-1]:
+            size = sum(len(line) for line in lines)
+            assert size >= 1_000 > size - len(lines[-1])
+    assert [record["table_id"] for record in _read_records(tmp_path)] == ["T-0"] * 10 + ["T-1"] * 10
+
+
+def test_segments_hold_exactly_what_fits(tmp_path):
+    recorder = HandHistoryRecorder(str(tmp_path), segment_bytes=300)
+    for index in range(20):
+        # 60 bytes per line, so five records fill a segment.
+        assert recorder.submit({"hand_id": f"H-{index:02d}", "pad": "x" * 32})
+    recorder.start()
+    recorder.close()
+    sizes = [(path.stat().st_size, len(path.read_bytes().splitlines())) for path in sorted(tmp_path.iterdir())]
+    assert sizes == [(300, 5)] * 4 and recorder.segments == 4
+
+
+def test_full_backlog_drops_instead_of_blocking(tmp_path):
+    recorder = HandHistoryRecorder(str(tmp_path), max_pending=2)
+    assert recorder.submit({"hand_id": "a"}) and recorder.submit({"hand_id": "b"})
+    assert not recorder.submit({"hand_id": "c"})
+    recorder.start()
+    recorder.close()
+    assert recorder.stats()["written"] == 2 and recorder.stats()["dropped"] == 1
+
+
+def test_host_exports_history_metrics(tmp_path):
+    recorder = HandHistoryRecorder(str(tmp_path))
+    metrics = HostMetrics()
+    HostServer(TableConfig(seats=2), metrics=metrics, hand_history=recorder)
+    HostServer(TableConfig(seats=2), table_id="T-2", metrics=metrics, hand_history=recorder)
+    text = metrics.render()
+    assert 'poker_hand_history_hands_total{state="written"} 0' in text
+    assert "poker_hand_history_pending 0" in text
+    assert len(metrics.hand_histories) == 1
@@ -0,0 +1,51 @@
+from core.game import GameEngine
+from core.models import ActionType, TableConfig
+
+
+def play_recorded_hands(engine: GameEngine, hands: int) -> list:
+    transcript = []
+    for seed in range(hands):
+        if not engine.can_start_hand():
+            break
+        ctx = engine.start_hand(seed=seed)
+        transcript.append((ctx.button, [list(seat.hole_cards) for seat in engine.seats if seat]))
+        transcript.append(engine.consume_pre_events())
+        while not engine.is_hand_complete():
+            actor = engine.next_actor()
+            legal, _, min_raise_to, _ = engine.legal_actions(actor)
+            if ActionType.RAISE_TO in legal and seed % 3 == 0:
+                transcript.append(engine.apply_action(actor, ActionType.RAISE_TO, min_raise_to))
+            elif ActionType.CHECK in legal:
+                transcript.append(engine.apply_action(actor, ActionType.CHECK, None))
+            else:
+                transcript.append(engine.apply_action(actor, ActionType.CALL, None))
+        transcript.append(engine.end_hand_payload())
+        engine.hand = None
+    return transcript
+
+
+def make_engine(reuse_hands: bool) -> GameEngine:
+    engine = GameEngine(TableConfig(seats=4, starting_stack=600, sb=5, bb=10), reuse_hands=reuse_hands)
+    for name in ("A", "B", "C", "D"):
+        engine.assign_seat(name)
+    return engine
+
+
+def test_pooled_engine_matches_fresh_engine():
+    fresh = play_recorded_hands(make_engine(False), 60)
+    pooled = play_recorded_hands(make_engine(True), 60)
+    assert pooled == fresh
+
+
+def test_pooled_engine_recycles_hand_context_in_place():
+    engine = make_engine(True)
+    first = engine.start_hand(seed=1)
+    deck, queue, callers = first.deck, first.actor_queue, first.pending_callers
+    engine.apply_action(engine.next_actor(), ActionType.FOLD, None)
+    engine.hand = None
+
+    second = engine.start_hand(seed=2)
+    assert second is first
+    assert second.deck is deck and second.actor_queue is queue and second.pending_callers is callers
+    assert second.seed == 2 and second.phase.value == "PRE_FLOP"
+    assert len(second.deck) == 52 - 2 * 4
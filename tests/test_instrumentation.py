@@ -0,0 +1,87 @@
+from core.instrumentation import EngineHooks, EngineStatsCollector, LatencyHistogram
+from core.models import ActionType
+
+from .helpers import auto_complete_hand, create_engine, start_hand
+
+
+class RecordingHooks(EngineHooks):
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int]] = []
+
+    def on_hand_start(self, engine, ctx, elapsed_ns):
+        self.calls.append(("hand_start", elapsed_ns))
+
+    def on_action(self, engine, seat_idx, action, events, elapsed_ns):
+        self.calls.append(("action", elapsed_ns))
+
+    def on_phase_advanced(self, engine, phase, elapsed_ns):
+        self.calls.append((f"phase:{phase.value}", elapsed_ns))
+
+    def on_showdown(self, engine, ctx, elapsed_ns):
+        self.calls.append(("showdown", elapsed_ns))
+
+    def on_pots_awarded(self, engine, awards, elapsed_ns):
+        self.calls.append(("pots", len(awards)))
+
+
+def test_hooks_receive_every_lifecycle_stage():
+    engine = create_engine(seats=3)
+    hooks = RecordingHooks()
+    engine.add_hooks(hooks)
+    start_hand(engine, seed=5)
+    auto_complete_hand(engine)
+
+    names = [name for name, _ in hooks.calls]
+    assert names[0] == "hand_start"
+    assert "action" in names
+    assert ["phase:FLOP", "phase:TURN", "phase:RIVER"] == [n for n in names if n.startswith("phase:")]
+    assert "showdown" in names
+    assert any(name == "pots" and count >= 1 for name, count in hooks.calls)
+    assert all(elapsed >= 0 for name, elapsed in hooks.calls if name != "pots")
+
+
+def test_fold_win_reports_single_award_and_removed_hooks_go_quiet():
+    engine = create_engine(seats=2)
+    hooks = RecordingHooks()
+    engine.add_hooks(hooks)
+    start_hand(engine, seed=9)
+    engine.apply_action(engine.next_actor(), ActionType.FOLD, None)
+    assert ("pots", 1) in hooks.calls
+
+    engine.remove_hooks(hooks)
+    hooks.calls.clear()
+    engine.hand = None
+    start_hand(engine, seed=10)
+    assert hooks.calls == []
+
+
+def test_stats_collector_aggregates_per_table():
+    collector = EngineStatsCollector()
+    first = create_engine(seats=2)
+    second = create_engine(seats=2)
+    collector.attach(first, "T-1")
+    collector.attach(second, "T-2")
+
+    for seed in range(3):
+        start_hand(first, seed=seed)
+        auto_complete_hand(first)
+        first.hand = None
+    start_hand(second, seed=99)
+
+    snapshot = collector.snapshot()
+    assert snapshot["T-1"]["counters"]["hands"] == 3
+    assert snapshot["T-1"]["counters"]["actions"] > 0
+    assert snapshot["T-1"]["latency"]["apply_action"]["count"] == snapshot["T-1"]["counters"]["actions"]
+    assert snapshot["T-2"]["counters"]["hands"] == 1
+    assert "apply_action" not in snapshot["T-2"]["latency"]
+    assert "hands=3" in collector.summary_line("T-1")
+
+
+def test_latency_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(bounds_us=(10, 100))
+    for elapsed_ns in (5_000, 50_000, 50_000, 500_000):
+        histogram.observe_ns(elapsed_ns)
+    assert histogram.counts == [1, 2, 1]
+    assert histogram.quantile_us(0.5) == 100
+    assert histogram.quantile_us(1.0) == 500
+    assert histogram.as_dict()["count"] == 4
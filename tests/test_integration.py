@@ -59,6 +59,25 @@ def test_handle_action_rejects_out_of_turn():
     assert payload["code"] == "OUT_OF_TURN"
 
 
+def test_next_actor_gets_events_then_act_before_anyone_else():
+    server, sessions, sockets = setup_server(num_players=3)
+    ctx = server.engine.start_hand(seed=50)
+    order: list[tuple[int, str]] = []
+    for idx, socket in enumerate(sockets):
+        socket.send = lambda message, idx=idx: _record(order, idx, message)
+    first = server.engine.next_actor()
+
+    asyncio.run(server._handle_action(sessions[first], {"hand_id": ctx.hand_id, "action": ActionType.CALL.value}))
+
+    following = server.engine.next_actor()
+    assert order[: order.index((following, "act")) + 1] == [(following, "event"), (following, "act")]
+    assert sorted(seat for seat, kind in order if kind == "event") == [0, 1, 2]
+
+
+async def _record(order: list, idx: int, message: str) -> None:
+    order.append((idx, json.loads(message)["type"]))
+
+
 def test_timer_expired_prefers_check(monkeypatch):
     server, _, _ = setup_server()
     start_ctx = server.engine.start_hand(seed=60)
@@ -70,7 +89,7 @@ def test_timer_expired_prefers_check(monkeypatch):
 
     events: list[dict[str, object]] = []
 
-    async def capture_events(payload):
+    async def capture_events(payload, actor=None):
         events.extend(payload)
 
     async def noop_prompt():
@@ -97,7 +116,7 @@ def test_timer_expired_prefers_call_when_check_not_available(monkeypatch):
 
     events: list[dict[str, object]] = []
 
-    async def capture_events(payload):
+    async def capture_events(payload, actor=None):
         events.extend(payload)
 
     async def noop_prompt():
@@ -126,7 +145,7 @@ def test_timer_expired_folds_when_no_stack(monkeypatch):
 
     events: list[dict[str, object]] = []
 
-    async def capture_events(payload):
+    async def capture_events(payload, actor=None):
         events.extend(payload)
 
     async def noop_prompt():
@@ -182,7 +201,7 @@ def test_skip_request_applies_fallback(monkeypatch):
     events: list[dict[str, object]] = []
     messages: list[tuple[str, dict[str, object]]] = []
 
-    async def capture_events(payload):
+    async def capture_events(payload, actor=None):
         events.extend(payload)
 
     async def capture_broadcast(msg_type, payload, **kwargs):
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import websockets
+
+from core.metrics import MetricsRegistry, RateMeter, merge_expositions
+from core.models import TableConfig
+from practice.server import _process_request
+from tournament.metrics import http_handler
+from tournament.multi_table import MultiTableHost
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Things.")
+    counter.inc(table="T-1")
+    counter.inc(2, table="T-1")
+    histogram = registry.histogram("demo_seconds", "Latency.", bounds_us=(10, 100))
+    histogram.observe_ns(5_000, table='a"b')
+    histogram.observe_ns(50_000, table='a"b')
+    histogram.observe_ns(500_000, table='a"b')
+    registry.collect("demo_depth", "gauge", "Depth.", lambda: [({"kind": "player"}, 4)])
+
+    lines = registry.render().splitlines()
+    assert "# TYPE demo_total counter" in lines
+    assert 'demo_total{table="T-1"} 3' in lines
+    assert 'demo_seconds_bucket{table="a\\"b",le="1e-05"} 1' in lines
+    assert 'demo_seconds_bucket{table="a\\"b",le="0.0001"} 2' in lines
+    assert 'demo_seconds_bucket{table="a\\"b",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{table="a\\"b"} 3' in lines
+    assert "# TYPE demo_depth gauge" in lines
+    assert 'demo_depth{kind="player"} 4' in lines
+
+
+def test_merged_expositions_share_headers_and_label_each_part():
+    text = "# HELP demo_total Things.\n# TYPE demo_total counter\ndemo_total 2\ndemo_total{table=\"T-1\"} 1\n"
+    merged = merge_expositions([({}, text), ({"shard": "1"}, text)]).splitlines()
+    assert merged == [
+        "# HELP demo_total Things.",
+        "# TYPE demo_total counter",
+        "demo_total 2",
+        'demo_total{table="T-1"} 1',
+        'demo_total{shard="1"} 2',
+        'demo_total{shard="1",table="T-1"} 1',
+    ]
+
+
+def test_rate_meter_uses_a_sliding_window():
+    meter = RateMeter(window_s=10)
+    start = meter._started
+    for offset in range(5):
+        meter.mark(start + offset)
+    assert meter.rate(start + 5) == 1.0
+    assert meter.rate(start + 30) == 0.0
+
+
+async def _http_get(port: int, path: str) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response.decode()
+
+
+def test_host_serves_metrics_next_to_the_websocket():
+    async def scenario():
+        host = MultiTableHost(TableConfig(seats=2, starting_stack=10_000, sb=5, bb=10, move_time_ms=0), tables=1)
+        handler = http_handler(host.metrics)
+        server = await websockets.serve(host._handle_connection, "127.0.0.1", 0, process_request=handler)
+        port = server.sockets[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}/ws"
+
+        async def bot(team: str) -> None:
+            async with websockets.connect(url) as ws:
+                await ws.send(json.dumps({"type": "hello", "team": team}))
+                while True:
+                    message = json.loads(await asyncio.wait_for(ws.recv(), timeout=5))
+                    if message["type"] == "act":
+                        action = "CHECK" if "CHECK" in message["legal"] else "CALL"
+                        await ws.send(json.dumps({"type": "action", "hand_id": message["hand_id"], "action": action}))
+                    elif message["type"] == "end_hand":
+                        return
+
+        try:
+            await asyncio.gather(bot("A"), bot("B"))
+            return await _http_get(port, "/metrics")
+        finally:
+            server.close()
+
+    response = asyncio.run(scenario())
+    head, body = response.split("\r\n\r\n", 1)
+    assert head.startswith("HTTP/1.1 200")
+    assert "text/plain; version=0.0.4" in head
+    assert 'poker_hands_total{table="T-1"}' in body
+    assert 'poker_act_roundtrip_seconds_count{seat="0",table="T-1"}' in body
+    assert 'poker_engine_apply_seconds_count{table="T-1"}' in body
+    assert 'poker_broadcast_fanout_seconds_count{audience="players",table="T-1"}' in body
+    assert 'poker_messages_sent_total{kind="player",table="T-1"}' in body
+    assert 'poker_actor_mailbox_depth{table="T-1"}' in body
+
+
+def test_practice_server_exposes_metrics():
+    status, headers, body = asyncio.run(_process_request("/metrics", {}))
+    assert status == 200
+    assert dict(headers)["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert b"# TYPE poker_connections gauge" in body
+    assert b"# TYPE poker_act_roundtrip_seconds histogram" in body
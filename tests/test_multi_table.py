@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from core.models import TableConfig
+from tournament.multi_table import MultiTableHost
+
+
+class DummyWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    async def close(self, *args, **kwargs) -> None:
+        pass
+
+
+def make_host(**kwargs) -> MultiTableHost:
+    return MultiTableHost(TableConfig(seats=2, starting_stack=200, sb=5, bb=10, move_time_ms=0), **kwargs)
+
+
+def hello(**fields) -> dict:
+    return {"type": "hello", **fields}
+
+
+def test_tables_are_isolated():
+    host = make_host(tables=2)
+    first, second = host.tables["T-1"], host.tables["T-2"]
+    assert first.engine is not second.engine
+    assert first.actor is not second.actor
+    assert second.table_id == "T-2"
+
+
+def test_route_by_table_id_and_unknown_table():
+    host = make_host(tables=2)
+    table, error = host.route(hello(team="A", table_id="T-2"))
+    assert table is host.tables["T-2"] and error is None
+
+    table, error = host.route(hello(team="A", table_id="T-9"))
+    assert table is None
+    assert error is not None and error[0] == "UNKNOWN_TABLE"
+
+    table, _ = host.route(hello(role="spectator", table_id="T-2"))
+    assert table is host.tables["T-2"]
+
+
+def test_players_fill_tables_and_open_new_ones_up_to_the_limit():
+    host = make_host(tables=1, max_tables=2)
+    for team in ("A", "B"):
+        table, _ = host.route(hello(team=team))
+        assert table is host.tables["T-1"]
+        table.engine.assign_seat(team)
+
+    # A reconnecting team goes back to its own table.
+    assert host.route(hello(team="a"))[0] is host.tables["T-1"]
+
+    table, _ = host.route(hello(team="C"))
+    assert table is host.tables["T-2"]
+    table.engine.assign_seat("C")
+    table.engine.assign_seat("D")
+
+    table, error = host.route(hello(team="E"))
+    assert table is None and error is not None and error[0] == "TABLE_FULL"
+
+
+def test_operator_can_list_every_table():
+    host = make_host(tables=3)
+    host.tables["T-2"].engine.assign_seat("A")
+    # Summaries come from the view each table publishes after a change.
+    host.tables["T-2"]._refresh_view()
+    socket = DummyWebSocket()
+
+    asyncio.run(host.tables["T-1"]._handle_control_command({"type": "control", "command": "LIST_TABLES"}, socket))
+
+    ack = socket.sent[-1]
+    assert ack["type"] == "control/ack"
+    assert [entry["table_id"] for entry in ack["tables"]] == ["T-1", "T-2", "T-3"]
+    assert ack["tables"][1]["seated"] == 1
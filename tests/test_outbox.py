@@ -0,0 +1,96 @@
+import asyncio
+
+from core.models import TableConfig
+from tournament.outbox import SLOW_CONSUMER_CLOSE_CODE, Outbox, SendQueueConfig
+from tournament.server import HostServer
+
+
+class GatedWebSocket:
+    """Socket whose sends block until the test opens the gate."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.gate = asyncio.Event()
+        self.close_code = None
+
+    async def send(self, message: str) -> None:
+        await self.gate.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.close_code = code
+
+
+def test_coalesce_keeps_control_messages_and_latest_frame():
+    async def scenario():
+        socket = GatedWebSocket()
+        outbox = Outbox(socket, SendQueueConfig(max_messages=3, policy="coalesce"), "spectator")
+        outbox.put("status")
+        for idx in range(5):
+            outbox.put(f"frame-{idx}", frame=True)
+        socket.gate.set()
+        await outbox.flush()
+        await asyncio.sleep(0)
+        await outbox.close()
+        return socket, outbox
+
+    socket, outbox = asyncio.run(scenario())
+    assert socket.sent == ["status", "frame-4"]
+    assert outbox.dropped_frames == 4
+    assert outbox.stats()["high_water"] == 3
+
+
+def test_delta_frames_wait_for_keyframe_after_a_drop():
+    async def scenario():
+        socket = GatedWebSocket()
+        outbox = Outbox(socket, SendQueueConfig(max_messages=1, policy="drop"), "spectator")
+        await asyncio.sleep(0)
+        outbox.put("key-0", frame=True)
+        assert not outbox.put("delta-1", frame=True, self_contained=False)
+        assert outbox.needs_keyframe
+        socket.gate.set()
+        await outbox.flush()
+        assert not outbox.put("delta-2", frame=True, self_contained=False)
+        assert outbox.put("key-3", frame=True)
+        assert not outbox.needs_keyframe
+        await outbox.flush()
+        await asyncio.sleep(0)
+        await outbox.close()
+        return socket
+
+    socket = asyncio.run(scenario())
+    assert socket.sent == ["key-0", "key-3"]
+
+
+def test_disconnect_policy_closes_slow_bot():
+    async def scenario():
+        socket = GatedWebSocket()
+        outbox = Outbox(socket, SendQueueConfig(max_messages=2, policy="disconnect"), "seat 0")
+        for idx in range(4):
+            outbox.put(f"msg-{idx}")
+        await asyncio.sleep(0)
+        return socket
+
+    socket = asyncio.run(scenario())
+    assert socket.close_code == SLOW_CONSUMER_CLOSE_CODE
+
+
+def test_slow_spectator_does_not_block_bot_broadcast():
+    async def scenario():
+        server = HostServer(TableConfig(seats=2, starting_stack=200, sb=5, bb=10))
+        slow = GatedWebSocket()
+        server.spectators.add(slow)
+        server.outboxes[slow] = Outbox(slow, server.spectator_queue, "spectator slow")
+        # Must return even though the spectator socket never drains.
+        for _ in range(3):
+            await asyncio.wait_for(server._broadcast_spectator("spectator/status", {"in_hand": False}), timeout=1)
+        await asyncio.sleep(0)
+        stats = server.queue_stats()
+        await server._close_outbox(slow)
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats[0]["client"] == "spectator slow"
+    # One message is stuck in send(), the rest wait in the queue.
+    assert stats[0]["depth"] == 2
+    assert stats[0]["sent"] == 0
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+from core.models import TableConfig
+from tournament.metrics import HostMetrics
+from tournament.rate_limit import RATE_LIMIT_CLOSE_CODE, RateLimit, RateLimitConfig, TokenBucket
+from tournament.server import HostServer
+
+
+def test_bucket_refills_over_time_and_on_credit():
+    bucket = TokenBucket(RateLimit(rate=10, burst=3), now=0.0)
+    assert [bucket.take(now=0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.streak == 1 and bucket.rejected == 1
+    # 0.1 s at 10/s is one token.
+    assert bucket.take(now=0.1) and not bucket.take(now=0.1)
+    bucket.credit()
+    assert bucket.take(now=0.1) and bucket.streak == 0
+    # Idle time never banks more than the burst.
+    assert sum(bucket.take(now=60.0) for _ in range(10)) == 3
+    with pytest.raises(ValueError):
+        RateLimit(rate=0, burst=1)
+
+
+class FloodingWebSocket:
+    """Sends ``messages`` as fast as the server reads them."""
+
+    def __init__(self, messages) -> None:
+        self.messages = list(messages)
+        self.read = 0
+        self.sent: list = []
+        self.close_code = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.close_code is not None or self.read == len(self.messages):
+            raise StopAsyncIteration
+        self.read += 1
+        return self.messages[self.read - 1]
+
+    async def send(self, message) -> None:
+        self.sent.append(json.loads(message))
+
+    async def close(self, code=1000, reason="") -> None:
+        self.close_code = code
+
+
+def test_flooding_bot_is_cut_off_before_the_table_sees_it():
+    metrics = HostMetrics()
+    limits = RateLimitConfig(bot=RateLimit(rate=0.001, burst=5), close_after=10)
+    server = HostServer(TableConfig(seats=2), metrics=metrics, rate_limits=limits)
+    websocket = FloodingWebSocket([json.dumps({"type": "ping"})] * 100)
+
+    asyncio.run(server.handle_client(websocket, {"type": "hello", "team": "spammer"}))
+
+    errors = [message["code"] for message in websocket.sent if message["type"] == "error"]
+    # Five within the burst reach the error path, then one notice for the whole run.
+    assert errors == ["UNKNOWN_TYPE"] * 5 + ["RATE_LIMITED"]
+    assert websocket.close_code == RATE_LIMIT_CLOSE_CODE and websocket.read == 15
+    assert server.rate_limited["player"] == 10 and server.rate_limit_closes["player"] == 1
+    text = metrics.render()
+    assert 'poker_messages_rate_limited_total{role="player",table="T-1"} 10' in text
+    assert 'poker_rate_limit_disconnects_total{role="player",table="T-1"} 1' in text
+
+
+def test_control_commands_are_limited_per_connection():
+    limits = RateLimitConfig(control=RateLimit(rate=0.001, burst=2), close_after=0)
+    server = HostServer(TableConfig(seats=2), hand_control="operator", rate_limits=limits)
+    command = json.dumps({"type": "control", "command": "start_hand"})
+    websocket = FloodingWebSocket([command] * 20)
+
+    asyncio.run(server.handle_client(websocket, {"type": "hello", "role": "operator"}))
+
+    assert websocket.close_code is None and websocket.read == 20
+    assert server.rate_limited["spectator"] == 18
+    assert [m["code"] for m in websocket.sent if m["type"] == "error"] == ["RATE_LIMITED"]
+
+
+class ScriptedWebSocket(FloodingWebSocket):
+    async def recv(self):
+        if self.close_code is not None:
+            raise ConnectionError("closed")
+        return await self.__anext__()
+
+
+def _prompt_practice_bot(websocket, limits, spent=0):
+    from practice.server import PracticeSession, _remote_client
+
+    remote = _remote_client("A", websocket, False, limits)
+    for _ in range(spent):
+        remote.bucket.take()
+
+    async def scenario():
+        session = PracticeSession(TableConfig(seats=2, starting_stack=1_000, sb=10, bb=20), [remote])
+        await session._assign_seats()
+        session.engine.start_hand(seed=1)
+        return await session._prompt_remote(remote)
+
+    return remote, asyncio.run(scenario())
+
+
+def test_practice_host_limits_bots_but_not_their_answers():
+    limits = RateLimitConfig(bot=RateLimit(rate=0.001, burst=3), close_after=3)
+    # An empty bucket still has room for the answer to the prompt.
+    answer = ScriptedWebSocket([json.dumps({"type": "action", "action": "FOLD"})])
+    remote, (action, _) = _prompt_practice_bot(answer, limits, spent=3)
+    assert action.value == "FOLD" and remote.bucket.rejected == 0
+
+    flood = ScriptedWebSocket([json.dumps({"type": "ping"})] * 20)
+    with pytest.raises(ConnectionError):
+        _prompt_practice_bot(flood, limits)
+    # Three within the burst, then three dropped: one notice and the close.
+    assert flood.read == 6 and flood.close_code == RATE_LIMIT_CLOSE_CODE
+    assert [m["code"] for m in flood.sent if m["type"] == "error"] == ["RATE_LIMITED"]
@@ -0,0 +1,35 @@
+from scripts.selfplay import SelfPlaySpec, match_seed, play_match, run_selfplay, summarize
+
+
+def test_match_seed_is_stable_and_distinct():
+    assert match_seed(42, 0) == match_seed(42, 0)
+    assert match_seed(42, 0) != match_seed(42, 1)
+    assert match_seed(42, 0) != match_seed(43, 0)
+
+
+def test_play_match_conserves_chips():
+    spec = SelfPlaySpec(root_seed=7, policies=("baseline", "random", "random"), max_hands=150)
+    index, seed, hands, winner, stacks = play_match(spec, 3)
+    assert index == 3
+    assert seed == match_seed(7, 3)
+    assert 0 < hands <= 150
+    assert sum(stacks) == spec.starting_stack * 3
+    assert winner == -1 or stacks[winner] == spec.starting_stack * 3
+
+
+def test_strategic_policy_keeps_integer_chips():
+    spec = SelfPlaySpec(root_seed=3, policies=("strategic", "baseline", "random"), max_hands=150)
+    _, _, _, _, stacks = play_match(spec, 0)
+    assert all(type(stack) is int for stack in stacks)
+    assert sum(stacks) == spec.starting_stack * 3
+
+
+def test_results_identical_regardless_of_worker_count():
+    spec = SelfPlaySpec(root_seed=11, policies=("baseline", "random"), max_hands=100)
+    serial = list(run_selfplay(spec, matches=12, workers=1, chunk=5))
+    parallel = list(run_selfplay(spec, matches=12, workers=2, chunk=2))
+    assert serial == parallel
+    assert [record[0] for record in parallel] == list(range(12))
+    summary = summarize(spec, parallel)
+    assert summary["matches"] == 12
+    assert sum(summary["chip_delta"].values()) == 0
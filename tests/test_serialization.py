@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.models import TableConfig
+from core.serialization import EnvelopeEncoder, TickClock, available_serializers, get_serializer
+from tournament.server import ClientSession, HostServer
+
+BACKENDS = available_serializers()
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backends_agree_on_output(name):
+    payload = {"hand_id": "H-1", "seats": [{"seat": 0, "hole": ["As", "Kd"]}], "team": "Équipe", "pot": 0}
+    assert get_serializer(name).dumps(payload) == get_serializer("json").dumps(payload)
+    assert get_serializer(name).loads(memoryview(b'{"a":[1,2]}')) == {"a": [1, 2]}
+
+
+def test_unknown_serializer_is_rejected():
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
+
+
+def test_bad_environment_falls_back_to_json_instead_of_failing_imports():
+    script = "from core.serialization import default_serializer, dumps; print(default_serializer().name, dumps({'a': 1}))"
+    env = {**os.environ, "POKER_SERIALIZER": "yaml"}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["json", '{"a":1}']
+    assert "Ignoring POKER_SERIALIZER='yaml'" in result.stderr
+
+
+def test_tick_clock_reuses_the_stamp_within_a_tick():
+    now = [1_700_000_000.0]
+    clock = TickClock(tick_s=0.001, clock=lambda: now[0])
+    first = clock.now_iso()
+    now[0] += 0.0004
+    assert clock.now_iso() is first
+    now[0] += 0.001
+    assert clock.now_iso() != first
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_envelope_splices_payload_seq_and_fragments(name):
+    encoder = EnvelopeEncoder(get_serializer(name), TickClock(clock=lambda: 0.0))
+    message = encoder.encode("welcome", {"seat": 2}, log_seq=9, fragments={"config": '{"sb":5}'})
+    assert json.loads(message) == {
+        "type": "welcome",
+        "v": 1,
+        "ts": "1970-01-01T00:00:00+00:00",
+        "log_seq": 9,
+        "seat": 2,
+        "config": {"sb": 5},
+    }
+    assert json.loads(encoder.encode("ping", {}))["type"] == "ping"
+
+
+class DummyWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def test_welcome_carries_the_pre_encoded_config():
+    async def scenario():
+        server = HostServer(TableConfig(seats=3, starting_stack=500, sb=5, bb=10, move_time_ms=250))
+        websocket = DummyWebSocket()
+        seat = await server._claim_seat("A")
+        await server._register_player(ClientSession(seat=seat.seat, team="A", websocket=websocket))
+        await server.outboxes[websocket].flush()
+        return websocket.sent[0]
+
+    welcome = json.loads(asyncio.run(scenario()))
+    assert welcome["type"] == "welcome" and welcome["seat"] == 0
+    assert welcome["config"] == {
+        "variant": "HUNL",
+        "seats": 3,
+        "starting_stack": 500,
+        "sb": 5,
+        "bb": 10,
+        "move_time_ms": 250,
+    }
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import socket
+
+import websockets
+
+from core.models import TableConfig
+from tournament.metrics import http_handler
+from tournament.multi_table import MultiTableHost
+from tournament.sharding import ShardRouter, ShardSpec, Supervisor, WorkerOptions, shard_for_table
+
+
+def test_table_ids_interleave_across_shards():
+    config = TableConfig(seats=2, starting_stack=200, sb=5, bb=10, move_time_ms=0)
+    shards = [MultiTableHost(config, tables=2, table_offset=idx, table_stride=3) for idx in range(3)]
+    for index, shard in enumerate(shards):
+        for table_id in shard.tables:
+            assert shard_for_table(table_id, 3) == index
+    assert list(shards[1].tables) == ["T-2", "T-5"]
+    assert shard_for_table("T-0", 3) is None
+    assert shard_for_table("lobby", 3) is None
+
+
+def test_router_pins_teams_to_the_least_loaded_shard():
+    router = ShardRouter([ShardSpec(idx, "127.0.0.1", 1) for idx in range(2)])
+    first, _ = router.route({"type": "hello", "team": "A"})
+    second, _ = router.route({"type": "hello", "team": "B"})
+    assert {first.index, second.index} == {0, 1}
+    assert router.route({"type": "hello", "team": "a"})[0] is first
+    assert router.route({"type": "hello", "team": "C", "table_id": "T-2"})[0].index == 1
+    shard, error = router.route({"type": "hello", "team": "C", "table_id": "bogus"})
+    assert shard is None and error[0] == "UNKNOWN_TABLE"
+
+
+async def _check_call_bot(url: str, team: str, table_id: str, hands: int) -> int:
+    finished = 0
+    async with websockets.connect(url) as ws:
+        await ws.send(json.dumps({"type": "hello", "team": team, "table_id": table_id}))
+        while finished < hands:
+            message = json.loads(await asyncio.wait_for(ws.recv(), timeout=5))
+            if message["type"] == "act":
+                action = "CHECK" if "CHECK" in message["legal"] else "CALL"
+                await ws.send(json.dumps({"type": "action", "hand_id": message["hand_id"], "action": action}))
+            elif message["type"] == "end_hand":
+                finished += 1
+            elif message["type"] == "welcome":
+                assert message["table_id"] == table_id
+    return finished
+
+
+def test_router_relays_bots_and_aggregates_operator_commands():
+    async def scenario():
+        config = TableConfig(seats=2, starting_stack=10_000, sb=5, bb=10, move_time_ms=2_000)
+        shard_hosts = [MultiTableHost(config, tables=1, table_offset=idx, table_stride=2) for idx in range(2)]
+        servers = [await websockets.serve(host._handle_connection, "127.0.0.1", 0) for host in shard_hosts]
+        specs = [
+            ShardSpec(idx, "127.0.0.1", server.sockets[0].getsockname()[1]) for idx, server in enumerate(servers)
+        ]
+        router = ShardRouter(specs)
+        front = await websockets.serve(router._handle_connection, "127.0.0.1", 0)
+        url = f"ws://127.0.0.1:{front.sockets[0].getsockname()[1]}/ws"
+        try:
+            hands = await asyncio.gather(
+                *(_check_call_bot(url, f"Bot{idx}", "T-2", hands=2) for idx in range(2))
+            )
+            async with websockets.connect(url) as operator:
+                await operator.send(json.dumps({"type": "hello", "role": "operator"}))
+                status = json.loads(await operator.recv())
+                await operator.send(json.dumps({"type": "control", "command": "LIST_TABLES"}))
+                listing = json.loads(await operator.recv())
+        finally:
+            front.close()
+            for server in servers:
+                server.close()
+        return hands, status, listing, shard_hosts
+
+    hands, status, listing, shard_hosts = asyncio.run(scenario())
+    assert hands == [2, 2]
+    assert shard_hosts[1].tables["T-2"].engine.hand_counter >= 2
+    assert shard_hosts[0].tables["T-1"].engine.find_team("Bot0") is None
+    assert status["type"] == "router/status"
+    assert [shard["up"] for shard in status["shards"]] == [True, True]
+    tables = {entry["table_id"]: entry for entry in listing["tables"]}
+    assert set(tables) == {"T-1", "T-2"}
+    assert tables["T-2"]["shard"] == 1 and tables["T-2"]["seated"] == 2
+
+
+class _FakeProcess:
+    def __init__(self, alive: bool) -> None:
+        self.alive = alive
+        self.exitcode = None if alive else -9
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+
+def test_supervisor_restarts_crashed_workers_from_their_checkpoints(tmp_path):
+    config = TableConfig(seats=2)
+    for checkpoint_dir, resumed in ((None, False), (str(tmp_path), True)):
+        supervisor = Supervisor(WorkerOptions(config=config, workers=2, checkpoint_dir=checkpoint_dir))
+        spawned = []
+
+        def spawn(shard, options=None, supervisor=supervisor, spawned=spawned):
+            spawned.append((shard.index, options or supervisor.options))
+            supervisor.processes[shard.index] = _FakeProcess(alive=True)
+
+        supervisor._spawn = spawn
+        supervisor.processes = {0: _FakeProcess(alive=False)}
+
+        async def scenario(supervisor=supervisor, spawned=spawned):
+            monitor = asyncio.create_task(supervisor._monitor(interval=0.01))
+            while not spawned:
+                await asyncio.sleep(0.01)
+            monitor.cancel()
+
+        asyncio.run(scenario())
+        ((index, options),) = spawned
+        assert index == 0 and supervisor.restarts == 1
+        assert options.resume is resumed
+        assert options.checkpoint_dir == checkpoint_dir and not supervisor.options.resume
+
+
+async def _http_get(port: int, path: str) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response.decode()
+
+
+def test_router_serves_health_and_merged_shard_metrics():
+    async def scenario():
+        config = TableConfig(seats=2, starting_stack=10_000, sb=5, bb=10, move_time_ms=0)
+        shard_hosts = [MultiTableHost(config, tables=1, table_offset=idx, table_stride=2) for idx in range(2)]
+        servers = [
+            await websockets.serve(host._handle_connection, "127.0.0.1", 0, process_request=http_handler(host.metrics))
+            for host in shard_hosts
+        ]
+        specs = [
+            ShardSpec(idx, "127.0.0.1", server.sockets[0].getsockname()[1]) for idx, server in enumerate(servers)
+        ]
+        # A third shard that is down still leaves the scrape intact.
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            specs.append(ShardSpec(2, "127.0.0.1", probe.getsockname()[1]))
+        router = ShardRouter(specs)
+        front = await websockets.serve(
+            router._handle_connection,
+            "127.0.0.1",
+            0,
+            process_request=http_handler(router.metrics, router.scrape_metrics),
+        )
+        port = front.sockets[0].getsockname()[1]
+        try:
+            return await _http_get(port, "/health"), await _http_get(port, "/metrics")
+        finally:
+            front.close()
+            for server in servers:
+                server.close()
+
+    health, metrics = asyncio.run(scenario())
+    assert health.startswith("HTTP/1.1 200")
+    head, body = metrics.split("\r\n\r\n", 1)
+    assert head.startswith("HTTP/1.1 200")
+    lines = body.splitlines()
+    assert lines.count("# TYPE poker_connections gauge") == 1
+    assert 'poker_connections{shard="0",role="player",table="T-1"} 0' in lines
+    assert 'poker_connections{shard="1",role="player",table="T-2"} 0' in lines
+    assert "poker_router_connections 0" in lines
+    assert [line for line in lines if line.startswith("poker_shard_up")] == [
+        'poker_shard_up{shard="0"} 1',
+        'poker_shard_up{shard="1"} 1',
+        'poker_shard_up{shard="2"} 0',
+    ]
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+from core.models import ActionType, TableConfig
+from tournament.server import HostServer
+from tournament.spectator_frames import (
+    KEYFRAME_INTERVAL,
+    SpectatorHandRecord,
+    SpectatorHistory,
+    apply_delta,
+    diff_state,
+    expand_frames,
+)
+
+from .helpers import create_engine, start_hand
+
+
+class DummyWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def test_delta_round_trips_engine_states():
+    engine = create_engine(seats=6)
+    start_hand(engine, seed=21)
+    previous = engine.spectator_state("T-1", 1_000)
+    while not engine.is_hand_complete():
+        actor = engine.next_actor()
+        window = engine.action_window(actor)
+        action = ActionType.CHECK if window.allows(ActionType.CHECK) else ActionType.CALL
+        engine.apply_action(actor, action, None)
+        current = engine.spectator_state("T-1", 1_000)
+        patch = diff_state(previous, current)
+        assert patch is not None
+        assert apply_delta(previous, patch) == current
+        # Only changed seats travel, so patches stay far smaller than the state.
+        assert len(json.dumps(patch)) < len(json.dumps(current)) / 2
+        previous = current
+
+
+def test_host_stores_keyframes_and_deltas_and_serves_both_encodings():
+    server = HostServer(TableConfig(seats=6, starting_stack=500, sb=5, bb=10))
+    for idx in range(6):
+        server.engine.assign_seat(f"Team{idx}")
+    legacy, delta = DummyWebSocket(), DummyWebSocket()
+    server.spectators.update({legacy, delta})
+    server.delta_spectators.add(delta)
+
+    async def play() -> None:
+        server.engine.start_hand(seed=3)
+        server._start_spectator_hand_locked({})
+        for _ in range(KEYFRAME_INTERVAL + 2):
+            actor = server.engine.next_actor()
+            if actor is None:
+                break
+            window = server.engine.action_window(actor)
+            action = ActionType.CALL if window.allows(ActionType.CALL) else ActionType.CHECK
+            events = server.engine.apply_action(actor, action, None)
+            await server._publish_spectator_events(events)
+
+    asyncio.run(play())
+
+    record = server.spectator_history.get(server.active_hand_id)
+    keyframes = [frame["seq"] for frame in record.frames if "state" in frame]
+    assert keyframes[0] == 0 and KEYFRAME_INTERVAL in keyframes
+    assert all("delta" in frame for frame in record.frames[1:KEYFRAME_INTERVAL])
+
+    legacy_msgs = [json.loads(raw) for raw in legacy.sent]
+    delta_msgs = [json.loads(raw) for raw in delta.sent]
+    assert all("state" in msg for msg in legacy_msgs)
+    assert any("delta" in msg for msg in delta_msgs)
+    assert sum(map(len, delta.sent)) < sum(map(len, legacy.sent)) / 2
+
+    # Legacy snapshots are expanded server-side; delta clients rebuild the same states.
+    full = server._latest_snapshot_locked()
+    compact = server._latest_snapshot_locked(delta_frames=True)
+    assert compact["encoding"] == "delta"
+    assert [frame["state"] for frame in expand_frames(compact["frames"])] == [
+        frame["state"] for frame in full["frames"]
+    ]
+    assert full["frames"][-1]["state"] == server.engine.spectator_state(server.table_id, server._time_remaining_ms())
+
+
+def test_history_evicts_oldest_by_count_and_bytes_but_keeps_newest():
+    history = SpectatorHistory(max_hands=3, max_bytes=10_000)
+    for idx in range(5):
+        record = SpectatorHandRecord(hand_id=f"H-{idx}", opening_stacks={})
+        history.add(record)
+        history.append_frame(record, {"seq": 0, "state": {"pot": idx}})
+    assert history.hand_ids() == ["H-2", "H-3", "H-4"]
+
+    big = SpectatorHandRecord(hand_id="H-big", opening_stacks={})
+    history.add(big)
+    history.append_frame(big, {"seq": 0, "state": {"blob": "x" * 20_000}})
+    # Over budget on its own, but the newest hand survives.
+    assert history.hand_ids() == ["H-big"]
+    assert history.total_bytes == big.size_bytes
+
+
+def test_catchup_payload_is_shared_until_the_hand_moves():
+    history = SpectatorHistory()
+    record = SpectatorHandRecord(hand_id="H-1", opening_stacks={})
+    history.add(record)
+    history.append_frame(record, {"seq": 0, "state": {"pot": 0, "seats": []}})
+    first = history.catchup_payload(record, delta_frames=False)
+    assert history.catchup_payload(record, delta_frames=False) is first
+
+    history.append_frame(record, {"seq": 1, "delta": {"set": {"pot": 30}}})
+    updated = history.catchup_payload(record, delta_frames=False)
+    assert updated is not first
+    assert updated["frames"][-1]["state"]["pot"] == 30
@@ -0,0 +1,81 @@
+import copy
+import random
+
+from core.game import GameEngine
+from core.models import ActionType, TableConfig
+from tournament.spectator_frames import diff_state
+from tournament.spectator_view import SpectatorView
+
+from .helpers import create_engine
+
+
+def _random_action(engine, rng):
+    seat = engine.next_actor()
+    payload = engine.act_payload(seat)
+    if "RAISE_TO" in payload["legal"] and rng.random() < 0.3:
+        return seat, ActionType.RAISE_TO, rng.randint(payload["min_raise_to"], payload["max_raise_to"])
+    return seat, ActionType(rng.choice([name for name in payload["legal"] if name != "RAISE_TO"])), None
+
+
+def test_view_tracks_engine_states_and_patches():
+    engine = create_engine(seats=5, starting_stack=2_000)
+    view = SpectatorView(engine, "T-1")
+    rng = random.Random(8)
+    for seed in range(25):
+        if not engine.can_start_hand():
+            break
+        engine.start_hand(seed=seed)
+        opening = {seat.seat: seat.stack + seat.total_in_pot for seat in engine.seats if seat}
+        state = view.start_hand(opening, 1_000)
+        assert state == engine.spectator_state("T-1", 1_000)
+        published = [(state, copy.deepcopy(state))]
+        ranks = {}
+        while not engine.is_hand_complete():
+            events = engine.apply_action(*_random_action(engine, rng))
+            ranks.update({event["seat"]: event["rank"] for event in events if event["ev"] == "SHOWDOWN"})
+            previous = state
+            state = view.update(events, 900)
+            assert state == engine.spectator_state("T-1", 900)
+            assert view.delta_from(previous) == diff_state(previous, state)
+            published.append((state, copy.deepcopy(state)))
+        # Updates are copy-on-write: nothing already published was changed.
+        assert all(state == snapshot for state, snapshot in published)
+
+        final = engine.end_hand_payload()["stacks"]
+        results = view.results(final)
+        assert [(row["seat"], row["stack"]) for row in results] == [(e["seat"], e["stack"]) for e in final]
+        assert all(row["amount"] == row["stack"] - opening[row["seat"]] for row in results)
+        assert {row["seat"]: row["rank"] for row in results if "rank" in row} == ranks
+        engine.hand = None
+
+
+def test_touched_seats_are_refreshed():
+    engine = GameEngine(TableConfig(seats=3, starting_stack=1_000, sb=10, bb=20))
+    for team in ("A", "B"):
+        engine.assign_seat(team)
+    view = SpectatorView(engine, "T-1")
+    engine.start_hand(seed=1)
+    view.start_hand({}, None)
+    engine.set_connected(1, True)
+    view.touch(1)
+    state = view.update([], None)
+    assert state["seats"][1]["connected"] is True
+    assert view.delta_from(view.state) == {}
+    # A seat taken mid-hand is not in the state yet; touching it rebuilds.
+    view.touch(engine.assign_seat("C").seat)
+    state = view.update([], None)
+    assert state == engine.spectator_state("T-1", None) and len(state["seats"]) == 3
+
+
+def test_reconnect_under_a_new_team_spelling_patches_the_name():
+    engine = GameEngine(TableConfig(seats=3, starting_stack=1_000, sb=10, bb=20))
+    for team in ("Alpha", "Beta"):
+        engine.assign_seat(team)
+    view = SpectatorView(engine, "T-1")
+    engine.start_hand(seed=1)
+    previous = view.start_hand({}, None)
+    view.touch(engine.assign_seat("ALPHA").seat)
+    state = view.update([], None)
+    assert state == engine.spectator_state("T-1", None)
+    assert view.delta_from(previous) == diff_state(previous, state)
+    assert [seat["team"] for seat in state["seats"]] == ["ALPHA", "Beta"]
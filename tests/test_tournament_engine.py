@@ -0,0 +1,69 @@
+import pytest
+
+from core.models import TableConfig
+from core.tournament import BlindLevel, BlindSchedule, TournamentEngine
+
+from .helpers import create_engine
+
+
+def make_tournament(entrants: int, seats: int = 6, seed: int = 1) -> TournamentEngine:
+    engine = TournamentEngine(
+        TableConfig(seats=seats, starting_stack=1_000, sb=10, bb=20),
+        BlindSchedule.doubling(10, 20, rounds=5),
+        seed=seed,
+    )
+    engine.seat_entrants([f"Team{idx}" for idx in range(entrants)])
+    return engine
+
+
+def test_seat_player_and_remove_seat_between_hands():
+    engine = create_engine(seats=3)
+    engine.remove_seat(1)
+    moved = engine.seat_player("Mover", 1_234)
+    assert moved.seat == 1 and moved.stack == 1_234
+    with pytest.raises(ValueError, match="TEAM_ALREADY_SEATED"):
+        engine.seat_player("mover", 10)
+    engine.start_hand(seed=3)
+    with pytest.raises(RuntimeError, match="during a hand"):
+        engine.remove_seat(0)
+
+
+def test_entrants_are_spread_evenly():
+    tournament = make_tournament(20)
+    assert sorted(tournament.table_sizes().values()) == [5, 5, 5, 5]
+
+
+def test_tables_stay_balanced_and_chips_are_conserved():
+    tournament = make_tournament(20, seed=3)
+    total = 20 * 1_000
+    while not tournament.is_complete():
+        tournament.play_round()
+        sizes = tournament.table_sizes().values()
+        assert max(sizes) - min(sizes) <= 1
+        assert len(tournament.tables) == max(1, -(-tournament.players_remaining() // 6))
+        chips = sum(seat.stack for engine in tournament.tables.values() for seat in engine.seats if seat)
+        assert chips == total
+
+    result = tournament.run()
+    assert len(result.standings) == 20
+    assert len(set(result.standings)) == 20
+    assert any(move.reason == "break" for move in result.moves)
+
+
+def test_blind_levels_advance_by_rounds():
+    schedule = BlindSchedule((BlindLevel(10, 20, rounds=2), BlindLevel(25, 50, rounds=2)))
+    assert [schedule.level_index(rounds) for rounds in range(5)] == [0, 0, 1, 1, 1]
+
+    tournament = TournamentEngine(TableConfig(seats=6, starting_stack=5_000), schedule, seed=9)
+    tournament.seat_entrants([f"Team{idx}" for idx in range(12)])
+    tournament.play_round()
+    tournament.play_round()
+    assert tournament.level == 1
+    assert all(engine.config.bb == 50 for engine in tournament.tables.values())
+
+
+def test_same_seed_reproduces_result():
+    first = make_tournament(14, seed=21).run()
+    second = make_tournament(14, seed=21).run()
+    assert first.standings == second.standings
+    assert first.hands == second.hands
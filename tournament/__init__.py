@@ -1,5 +1,6 @@
 """Tournament host package: wraps the poker engine with networking."""
 
+from .multi_table import MultiTableHost
 from .server import HostServer
 
-__all__ = ["HostServer"]
+__all__ = ["HostServer", "MultiTableHost"]
@@ -1,9 +1,19 @@
 import argparse
 import asyncio
 import logging
+import math
 
+from core.instrumentation import EngineStatsCollector
 from core.models import TableConfig
-from .server import HostServer
+from core.serialization import default_serializer, get_serializer
+from .admission import AdmissionConfig
+from .checkpoint import Checkpointer, load_checkpoints
+from .compression import COMPRESSION_PROFILES, CompressionConfig
+from .hand_history import HandHistoryRecorder
+from .multi_table import MultiTableHost
+from .outbox import POLICIES, SendQueueConfig
+from .rate_limit import RateLimit, RateLimitConfig
+from .sharding import Supervisor, WorkerOptions
 
 logging.basicConfig(level=logging.INFO)
 
@@ -14,6 +24,13 @@ def main() -> None:
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8765)
     parser.add_argument("--seats", type=int, default=6)
+    parser.add_argument("--tables", type=int, default=1, help="Tables opened at startup")
+    parser.add_argument(
+        "--max-tables",
+        type=int,
+        default=None,
+        help="Open more tables on demand when bots find every seat taken (default: --tables)",
+    )
     parser.add_argument("--starting-stack", type=int, default=8_000)
     parser.add_argument("--sb", type=int, default=100)
     parser.add_argument("--bb", type=int, default=200)
@@ -34,7 +51,147 @@ def main() -> None:
         action="store_true",
         help="Enable manual timeout control (equivalent to --move-time 0)",
     )
+    parser.add_argument(
+        "--engine-stats",
+        action="store_true",
+        help="Collect engine-side timings (apply/showdown latency) and log them at match end",
+    )
+    parser.add_argument(
+        "--spectator-history-mb",
+        type=float,
+        default=8.0,
+        help="Memory budget for recent spectator hands (the current hand is always kept)",
+    )
+    parser.add_argument("--bot-queue-size", type=int, default=256, help="Outbound messages buffered per bot")
+    parser.add_argument("--spectator-queue-size", type=int, default=64, help="Outbound messages buffered per spectator")
+    parser.add_argument(
+        "--spectator-queue-policy",
+        choices=POLICIES,
+        default="coalesce",
+        help="What to do when a spectator falls behind: drop frames, coalesce to latest, or disconnect",
+    )
+    parser.add_argument(
+        "--bot-rate-limit",
+        type=float,
+        default=20.0,
+        help="Unprompted messages per second a bot may send (answers to act prompts are free); 0 disables",
+    )
+    parser.add_argument("--bot-burst", type=int, default=40, help="Bot messages accepted back to back")
+    parser.add_argument(
+        "--control-rate-limit",
+        type=float,
+        default=5.0,
+        help="Control commands per second per operator connection; 0 disables",
+    )
+    parser.add_argument("--control-burst", type=int, default=20, help="Control commands accepted back to back")
+    parser.add_argument(
+        "--rate-limit-close-after",
+        type=int,
+        default=500,
+        help="Close a connection after this many rate-limited messages in a row; 0 never closes",
+    )
+    parser.add_argument(
+        "--connection-soft-limit",
+        type=int,
+        default=20,
+        help="Open sockets from which spectators are refused and hellos get less time (fly.toml soft_limit; 0 = off)",
+    )
+    parser.add_argument(
+        "--connection-hard-limit",
+        type=int,
+        default=25,
+        help="Open sockets at which new connections are refused (fly.toml hard_limit; 0 = off)",
+    )
+    parser.add_argument("--max-players", type=int, default=None, help="Cap on connected bots (default: no own cap)")
+    parser.add_argument(
+        "--max-spectators", type=int, default=None, help="Cap on read-only spectators (default: no own cap)"
+    )
+    parser.add_argument("--hello-timeout-ms", type=int, default=5000, help="Time a new socket gets to send hello")
+    parser.add_argument(
+        "--busy-hello-timeout-ms",
+        type=int,
+        default=1000,
+        help="Time a new socket gets to send hello once the soft limit is reached",
+    )
+    parser.add_argument(
+        "--retry-after-s",
+        type=float,
+        default=5.0,
+        help="Retry hint sent with OVER_CAPACITY refusals (jittered up to 1.5x)",
+    )
+    parser.add_argument(
+        "--event-log-size",
+        type=int,
+        default=512,
+        help="Broadcasts kept per table so reconnecting clients can resume with resume_from",
+    )
+    parser.add_argument(
+        "--bot-compression",
+        choices=COMPRESSION_PROFILES,
+        default="default",
+        help="permessage-deflate profile for bot connections (off saves CPU on busy hosts)",
+    )
+    parser.add_argument(
+        "--spectator-compression",
+        choices=COMPRESSION_PROFILES,
+        default="fast",
+        help="permessage-deflate profile for spectators connecting to /spectate",
+    )
+    parser.add_argument(
+        "--serializer",
+        choices=("auto", "json", "orjson"),
+        default=None,
+        help="JSON backend for client messages (default: $POKER_SERIALIZER, else orjson when installed)",
+    )
+    parser.add_argument(
+        "--hand-history",
+        metavar="DIR",
+        default=None,
+        help="Record every hand as JSON lines under DIR (written off the event loop; off by default)",
+    )
+    parser.add_argument(
+        "--hand-history-segment-mb",
+        type=float,
+        default=64.0,
+        help="Start a new hand history file once the current one reaches this size",
+    )
+    parser.add_argument(
+        "--hand-history-fsync-ms",
+        type=int,
+        default=500,
+        help="Longest time a finished hand waits before it is synced to disk",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        metavar="DIR",
+        default=None,
+        help="Checkpoint every table to DIR when a hand ends (atomic writes, off the event loop)",
+    )
+    parser.add_argument(
+        "--checkpoint-mid-hand",
+        action="store_true",
+        help="Also checkpoint after every action so a restart resumes the hand in progress",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Restore tables from --checkpoint-dir at startup; bots reconnect to their seats by team name",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Supervisor mode: run tables in N worker processes behind a router on --port (0 = single process)",
+    )
+    parser.add_argument(
+        "--worker-base-port",
+        type=int,
+        default=9100,
+        help="Worker k listens on 127.0.0.1:(base + k) in supervisor mode",
+    )
     args = parser.parse_args()
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume needs --checkpoint-dir")
 
     move_time = 0 if args.manual_control else args.move_time
 
@@ -46,8 +203,86 @@ def main() -> None:
         move_time_ms=move_time,
     )
 
-    server = HostServer(config, hand_control=args.hand_control)
-    asyncio.run(server.start(host=args.host, port=args.port))
+    table_options = {
+        "hand_control": args.hand_control,
+        "spectator_history_bytes": int(args.spectator_history_mb * 1024 * 1024),
+        "player_queue": SendQueueConfig(max_messages=args.bot_queue_size, policy="disconnect"),
+        "spectator_queue": SendQueueConfig(max_messages=args.spectator_queue_size, policy=args.spectator_queue_policy),
+        "event_log_size": args.event_log_size,
+        "serializer": get_serializer(args.serializer) if args.serializer else default_serializer(),
+        "rate_limits": RateLimitConfig(
+            bot=RateLimit(args.bot_rate_limit, args.bot_burst) if args.bot_rate_limit > 0 else None,
+            control=RateLimit(args.control_rate_limit, args.control_burst) if args.control_rate_limit > 0 else None,
+            close_after=args.rate_limit_close_after,
+        ),
+    }
+
+    admission = AdmissionConfig(
+        soft_limit=args.connection_soft_limit or None,
+        hard_limit=args.connection_hard_limit or None,
+        max_players=args.max_players,
+        max_spectators=args.max_spectators,
+        hello_timeout_s=args.hello_timeout_ms / 1000,
+        busy_hello_timeout_s=args.busy_hello_timeout_ms / 1000,
+        retry_after_s=args.retry_after_s,
+    )
+    compression = CompressionConfig(bots=args.bot_compression, spectators=args.spectator_compression)
+    hand_history_options = {
+        "segment_bytes": int(args.hand_history_segment_mb * 1024 * 1024),
+        "fsync_interval_s": args.hand_history_fsync_ms / 1000,
+    }
+
+    if args.workers > 0:
+        # --tables / --max-tables are totals; each worker gets an even share.
+        per_worker = max(1, math.ceil(args.tables / args.workers))
+        max_per_worker = math.ceil(args.max_tables / args.workers) if args.max_tables else None
+        supervisor = Supervisor(
+            WorkerOptions(
+                config=config,
+                workers=args.workers,
+                tables=per_worker,
+                max_tables=max_per_worker,
+                engine_stats=args.engine_stats,
+                table_options=tuple(table_options.items()),
+                hand_history_dir=args.hand_history,
+                hand_history_options=tuple(hand_history_options.items()),
+                checkpoint_dir=args.checkpoint_dir,
+                checkpoint_mid_hand=args.checkpoint_mid_hand,
+                resume=args.resume,
+            ),
+            worker_base_port=args.worker_base_port,
+        )
+        asyncio.run(supervisor.start(host=args.host, port=args.port, compression=compression, admission=admission))
+        return
+
+    engine_stats = EngineStatsCollector() if args.engine_stats else None
+    hand_history = None
+    if args.hand_history:
+        hand_history = HandHistoryRecorder(args.hand_history, **hand_history_options)  # type: ignore[arg-type]
+        hand_history.start()
+    checkpointer = None
+    if args.checkpoint_dir:
+        checkpointer = Checkpointer(args.checkpoint_dir, mid_hand=args.checkpoint_mid_hand)
+    server = MultiTableHost(
+        config,
+        tables=args.tables,
+        max_tables=args.max_tables,
+        engine_stats=engine_stats,
+        hand_history=hand_history,
+        checkpointer=checkpointer,
+        **table_options,  # type: ignore[arg-type]
+    )
+    if checkpointer is not None:
+        if args.resume:
+            server.restore(load_checkpoints(args.checkpoint_dir))
+        checkpointer.start()
+    try:
+        asyncio.run(server.start(host=args.host, port=args.port, compression=compression, admission=admission))
+    finally:
+        if hand_history is not None:
+            hand_history.close()
+        if checkpointer is not None:
+            checkpointer.close()
 
 
 if __name__ == "__main__":
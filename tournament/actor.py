@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+LOGGER = logging.getLogger("poker_host")
+
+# Each table owns one TableActor: a mailbox drained by a single task, so every
+# state change on the table runs one at a time without a lock. Connection
+# handlers either post() work and move on (bot actions) or call() it and wait
+# for the result (seat claims, operator commands). Work already running on the
+# actor that calls back into it runs inline, and so does everything when no
+# actor task has been started yet (tests driving HostServer internals).
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class TableActor:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._mailbox: Deque[Tuple[Job, Optional[asyncio.Future]]] = deque()
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.processed = 0
+        self.failed = 0
+        self.high_water = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._mailbox)
+
+    def on_actor(self) -> bool:
+        task = self._task
+        return task is not None and asyncio.current_task() is task
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the actor and return its result."""
+        if self.on_actor():
+            return await fn(*args)
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(partial(fn, *args), future)
+        return await future
+
+    def post(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        """Queue ``fn(*args)`` without waiting; failures are logged."""
+        self._enqueue(partial(fn, *args), None)
+
+    def _enqueue(self, job: Job, future: Optional[asyncio.Future]) -> None:
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(), name=f"table-actor-{self.name}")
+        self._mailbox.append((job, future))
+        if len(self._mailbox) > self.high_water:
+            self.high_water = len(self._mailbox)
+        assert self._ready is not None
+        self._ready.set()
+
+    async def _run(self) -> None:
+        mailbox = self._mailbox
+        ready = self._ready
+        assert ready is not None
+        while True:
+            await ready.wait()
+            while mailbox:
+                job, future = mailbox.popleft()
+                try:
+                    result = await job()
+                except asyncio.CancelledError:
+                    if future is not None and not future.done():
+                        future.cancel()
+                    raise
+                except Exception as exc:
+                    self.failed += 1
+                    if future is None:
+                        LOGGER.exception("Table %s command failed", self.name)
+                    elif not future.done():
+                        future.set_exception(exc)
+                else:
+                    if future is not None and not future.done():
+                        future.set_result(result)
+                self.processed += 1
+            ready.clear()
+
+    async def close(self) -> None:
+        task = self._task
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        for _, future in self._mailbox:
+            if future is not None and not future.done():
+                future.cancel()
+        self._mailbox.clear()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "table": self.name,
+            "depth": len(self._mailbox),
+            "high_water": self.high_water,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
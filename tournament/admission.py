@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from websockets.server import WebSocketServerProtocol
+
+# Connection admission. fly.toml gives the machine a soft limit of 20
+# connections and a hard limit of 25; the gate applies the same two numbers
+# at the listener, so the host sheds load the way the platform expects
+# instead of letting a spike of sockets queue up behind the proxy.
+#
+# Every socket is counted from accept until its handler returns: first as
+# pending while it has yet to send ``hello``, then under its role. Roles,
+# highest priority first:
+#
+#   player     bots; admitted up to the hard limit (and ``max_players``)
+#   operator   operators and spectators asking for control; same as players
+#   spectator  admitted only while fewer than ``soft_limit`` sockets are open
+#              (and under ``max_spectators``)
+#
+# Spectators therefore never hold the slots between the soft and the hard
+# limit. Only players, operators and pending handshakes count against the
+# hard limit when a socket arrives; a player or operator whose hello finds the
+# host full takes the newest spectator's slot (that spectator is closed with a
+# retry hint) and is refused only when there is none. A spike of spectators
+# is refused at hello and never sheds other spectators, let alone a bot.
+# Above the soft limit the hello deadline drops from ``hello_timeout_s`` to
+# ``busy_hello_timeout_s``, so idle handshakes give their slots back quickly.
+#
+# Refused sockets get an OVER_CAPACITY error carrying ``retry_after_ms`` and
+# are closed with 1013 (Try Again Later). The retry hint is jittered up to
+# half again its length so refused clients do not all return at once.
+
+ADMISSION_CLOSE_CODE = 1013
+
+ROLES = ("player", "operator", "spectator")
+
+SendJson = Callable[[WebSocketServerProtocol, str, Dict[str, object]], Awaitable[None]]
+ReadHello = Callable[[WebSocketServerProtocol, float], Awaitable[Optional[Dict[str, object]]]]
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    # Open sockets (pending and admitted). None disables the limit.
+    soft_limit: Optional[int] = 20
+    hard_limit: Optional[int] = 25
+    # Admitted connections per role; None leaves only the shared limits.
+    max_players: Optional[int] = None
+    max_spectators: Optional[int] = None
+    # Time a new socket gets to send hello, normally and above the soft limit.
+    hello_timeout_s: float = 5.0
+    busy_hello_timeout_s: float = 1.0
+    retry_after_s: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.soft_limit is not None and self.hard_limit is not None and self.soft_limit > self.hard_limit:
+            raise ValueError("The soft connection limit cannot be above the hard limit")
+        if self.hello_timeout_s <= 0 or self.busy_hello_timeout_s <= 0 or self.retry_after_s <= 0:
+            raise ValueError("Hello deadlines and the retry hint must be positive")
+
+
+def connection_role(hello: Dict[str, object]) -> str:
+    """Admission role of a hello: ``player``, ``operator`` or ``spectator``."""
+    role_raw = hello.get("role") or "player"
+    role = role_raw.strip().casefold() if isinstance(role_raw, str) else "player"
+    if role in ("spectator", "operator"):
+        return "operator" if role == "operator" or hello.get("control") else "spectator"
+    return "player"
+
+
+class AdmissionGate:
+    """Counts the sockets of one listener and decides which ones it serves."""
+
+    def __init__(self, config: AdmissionConfig, send_json: SendJson) -> None:
+        self.config = config
+        self._send_json = send_json
+        self.pending = 0
+        self.admitted: Dict[str, int] = {role: 0 for role in ROLES}
+        self._roles: Dict[WebSocketServerProtocol, str] = {}
+        # Admitted spectators that can still be shed, oldest first.
+        self._sheddable: Dict[WebSocketServerProtocol, None] = {}
+        # Shed spectators whose handlers have not returned yet.
+        self._shedding: Set[WebSocketServerProtocol] = set()
+        self._closing: Set["asyncio.Future[None]"] = set()
+        # Refusals keyed by (role, reason); role is "unknown" before hello.
+        self.refused: Dict[Tuple[str, str], int] = {}
+        self.shed = 0
+
+    @property
+    def open(self) -> int:
+        return self.pending + len(self._roles)
+
+    def _occupied(self) -> int:
+        # Open sockets, less the spectators already on their way out.
+        return self.open - len(self._shedding)
+
+    def hello_timeout(self) -> float:
+        limit = self.config.soft_limit
+        if limit is not None and self.open >= limit:
+            return self.config.busy_hello_timeout_s
+        return self.config.hello_timeout_s
+
+    async def handshake(
+        self, websocket: WebSocketServerProtocol, read_hello: ReadHello
+    ) -> Tuple[bool, Optional[Dict[str, object]]]:
+        """Read the hello of a new socket; (False, None) means it was refused and closed."""
+        # Admitted spectators can make room later, so only the rest count here.
+        limit = self.config.hard_limit
+        if limit is not None and self._occupied() - len(self._sheddable) >= limit:
+            await self.refuse(websocket, "unknown", "full")
+            return False, None
+        timeout = self.hello_timeout()
+        self.pending += 1
+        try:
+            hello = await read_hello(websocket, timeout)
+        finally:
+            self.pending -= 1
+        return True, hello
+
+    async def admit(self, websocket: WebSocketServerProtocol, hello: Dict[str, object]) -> bool:
+        """Count the socket under its role, or refuse and close it; pair with ``release``."""
+        config = self.config
+        role = connection_role(hello)
+        reason = None
+        if role == "spectator":
+            if config.max_spectators is not None and self.admitted[role] >= config.max_spectators:
+                reason = "role_limit"
+            elif config.soft_limit is not None and self.open >= config.soft_limit:
+                reason = "busy"
+        elif role == "player" and config.max_players is not None and self.admitted[role] >= config.max_players:
+            reason = "role_limit"
+        elif config.hard_limit is not None and self._occupied() >= config.hard_limit and not self._shed_spectator():
+            reason = "full"
+        if reason is not None:
+            await self.refuse(websocket, role, reason)
+            return False
+        self.admitted[role] += 1
+        self._roles[websocket] = role
+        if role == "spectator":
+            self._sheddable[websocket] = None
+        return True
+
+    def release(self, websocket: WebSocketServerProtocol) -> None:
+        role = self._roles.pop(websocket, None)
+        if role is not None:
+            self.admitted[role] -= 1
+        self._sheddable.pop(websocket, None)
+        self._shedding.discard(websocket)
+
+    def retry_after_ms(self) -> int:
+        return int(self.config.retry_after_s * random.uniform(1.0, 1.5) * 1000)
+
+    async def refuse(self, websocket: WebSocketServerProtocol, role: str, reason: str) -> None:
+        key = (role, reason)
+        self.refused[key] = self.refused.get(key, 0) + 1
+        retry_ms = self.retry_after_ms()
+        await self._send_json(
+            websocket,
+            "error",
+            {"code": "OVER_CAPACITY", "msg": "Host is at capacity, try again later", "retry_after_ms": retry_ms},
+        )
+        await websocket.close(code=ADMISSION_CLOSE_CODE, reason=f"retry after {retry_ms} ms")
+
+    def _shed_spectator(self) -> bool:
+        if not self._sheddable:
+            return False
+        websocket = next(reversed(self._sheddable))
+        del self._sheddable[websocket]
+        self._shedding.add(websocket)
+        self.shed += 1
+        # The closing handshake can take a while; the new socket does not wait
+        # for it. The spectator stays open until its handler returns, but no
+        # longer holds a slot against the hard limit.
+        closing = asyncio.ensure_future(
+            websocket.close(code=ADMISSION_CLOSE_CODE, reason=f"retry after {self.retry_after_ms()} ms")
+        )
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+        return True
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from core.models import TableConfig
+from core.serialization import Serializer, default_serializer
+
+from .hand_history import HandRecordHooks
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from core.game import GameEngine, HandContext
+
+LOGGER = logging.getLogger("poker_host")
+
+# Crash-safe table checkpoints. A checkpoint holds what a table needs to pick
+# up where it stopped: seats (team and stack), button, hand counter and,
+# mid-hand, the seed and actions of the hand in progress. It does not hold
+# the deck, pots or betting state: restoring deals the hand again from its
+# seed and replays the actions through GameEngine.apply_actions, which gives
+# the same cards and the same bets.
+#
+# Snapshots are taken on the event loop when a hand completes and, with
+# ``mid_hand``, after every action. A mid-hand snapshot reuses a base built
+# once per hand and adds a tuple of the actions so far, so the action path
+# pays for one tuple copy. Serializing and writing happen on a writer thread.
+# That thread keeps only the newest snapshot per table and writes at most
+# once per ``min_interval_s``, so a busy table costs a few writes per second
+# however fast it plays. Each write goes to a
+# temporary file, is fsynced and then renamed over ``<table_id>.json``, so a
+# crash leaves either the old checkpoint or the new one, never a torn file.
+
+CHECKPOINT_VERSION = 1
+_STOP = object()
+
+
+def _config_payload(config: TableConfig) -> Dict[str, object]:
+    return {
+        "variant": config.variant,
+        "seats": config.seats,
+        "starting_stack": config.starting_stack,
+        "sb": config.sb,
+        "bb": config.bb,
+    }
+
+
+class _CheckpointHooks(HandRecordHooks):
+    def __init__(self, checkpointer: "Checkpointer", engine: "GameEngine", table_id: str) -> None:
+        super().__init__(table_id, self._hand_complete)
+        self.checkpointer = checkpointer
+        self.engine = engine
+        # Mid-hand base for the current hand and the seat count it was built with.
+        self._base: Optional[Dict[str, object]] = None
+        self._base_seated = 0
+
+    def _hand_complete(self, record: Dict[str, object]) -> None:
+        self.checkpointer.save(self.table_id, boundary_snapshot(self.engine, self.table_id))
+
+    def on_hand_start(self, engine, ctx, elapsed_ns):
+        super().on_hand_start(engine, ctx, elapsed_ns)
+        self._base = None
+
+    def on_action(self, engine, seat_idx, action, events, elapsed_ns):
+        super().on_action(engine, seat_idx, action, events, elapsed_ns)
+        record = self.record
+        if record is None or not self.checkpointer.mid_hand:
+            return
+        seated = sum(1 for seat in engine.seats if seat is not None)
+        if self._base is None or seated != self._base_seated:
+            self._base = mid_hand_snapshot(engine, self.table_id, record)
+            self._base_seated = seated
+        self.checkpointer.save(self.table_id, self._base, tuple(record["actions"]))  # type: ignore[arg-type]
+
+
+def boundary_snapshot(engine: "GameEngine", table_id: str) -> Dict[str, object]:
+    """Table state between hands (the current hand, if any, counts as finished)."""
+    return {
+        "version": CHECKPOINT_VERSION,
+        "table_id": table_id,
+        "config": _config_payload(engine.config),
+        "button": engine.button,
+        "hand_counter": engine.hand_counter,
+        "seats": [{"seat": seat.seat, "team": seat.team, "stack": seat.stack} for seat in engine.seats if seat],
+        "hand": None,
+    }
+
+
+def mid_hand_snapshot(engine: "GameEngine", table_id: str, record: Dict[str, object]) -> Dict[str, object]:
+    """State at the start of the hand in ``record``; ``Checkpointer.save`` adds the actions so far."""
+    snapshot = boundary_snapshot(engine, table_id)
+    # Stacks and counter as they were before the deal. Seats that joined
+    # since then sit out the replay and are seated after it.
+    opening = {player["seat"]: player["stack"] for player in record["players"]}  # type: ignore[index]
+    for seat in snapshot["seats"]:  # type: ignore[union-attr]
+        if seat["seat"] in opening:
+            seat["stack"] = opening[seat["seat"]]
+        else:
+            seat["joined_mid_hand"] = True
+    snapshot["hand_counter"] = engine.hand_counter - 1
+    snapshot["hand"] = {
+        "hand_id": record["hand_id"],
+        "seed": record["seed"],
+        "button": record["button"],
+        "actions": [],
+    }
+    return snapshot
+
+
+def restore_engine(engine: "GameEngine", snapshot: Dict[str, object]) -> Optional["HandContext"]:
+    """Seat the checkpointed teams on a fresh engine and replay the hand in progress, if any."""
+    if snapshot.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {snapshot.get('version')!r}")
+    if snapshot["config"] != _config_payload(engine.config):
+        raise ValueError("Checkpoint was taken with a different table config")
+    if any(seat is not None for seat in engine.seats) or engine.hand is not None:
+        raise RuntimeError("Restore needs an empty table")
+    seats: List[Dict[str, object]] = snapshot["seats"]  # type: ignore[assignment]
+    for entry in seats:
+        if not entry.get("joined_mid_hand"):
+            _seat(engine, entry)
+    engine.button = snapshot["button"]  # type: ignore[assignment]
+    engine.hand_counter = snapshot["hand_counter"]  # type: ignore[assignment]
+    hand = snapshot.get("hand")
+    if not hand:
+        return None
+    # start_hand moves the button to the next live seat; start just before it.
+    engine.button = (hand["button"] - 1) % engine.config.seats
+    ctx = engine.start_hand(seed=hand["seed"])
+    if ctx.button != hand["button"]:
+        raise ValueError("Checkpoint hand does not match the restored seats")
+    ctx.hand_id = hand["hand_id"]
+    engine.apply_actions([tuple(action) for action in hand["actions"]], collect_events=False)
+    for entry in seats:
+        if entry.get("joined_mid_hand"):
+            _seat(engine, entry)
+    return ctx
+
+
+def _seat(engine: "GameEngine", entry: Dict[str, object]) -> None:
+    seat = engine.seat_player(entry["team"], entry["stack"], entry["seat"])  # type: ignore[arg-type]
+    # Seats count as disconnected until their bots come back.
+    seat.connected = False
+
+
+def load_checkpoints(directory: str, serializer: Optional[Serializer] = None) -> Dict[str, Dict[str, object]]:
+    """Every ``<table_id>.json`` checkpoint in ``directory``, keyed by table id."""
+    serializer = serializer or default_serializer()
+    checkpoints: Dict[str, Dict[str, object]] = {}
+    if not os.path.isdir(directory):
+        return checkpoints
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), "rb") as handle:
+            snapshot = serializer.loads(handle.read())
+        checkpoints[str(snapshot["table_id"])] = snapshot
+    return checkpoints
+
+
+class Checkpointer:
+    """Writes the newest snapshot of each attached table atomically, off the event loop."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        mid_hand: bool = False,
+        min_interval_s: float = 0.25,
+        serializer: Optional[Serializer] = None,
+    ) -> None:
+        self.directory = directory
+        self.mid_hand = mid_hand
+        self.min_interval_s = min_interval_s
+        self.serializer = serializer or default_serializer()
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self.saved = 0
+        self.written = 0
+        self.errors = 0
+
+    def attach(self, engine: "GameEngine", table_id: str) -> _CheckpointHooks:
+        hooks = _CheckpointHooks(self, engine, table_id)
+        engine.add_hooks(hooks)
+        return hooks
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def save(self, table_id: str, snapshot: Dict[str, object], actions: Optional[Sequence[object]] = None) -> None:
+        """Queue ``snapshot`` (with ``actions`` for its hand) as the table's newest checkpoint; never blocks.
+
+        The snapshot must not be changed afterwards; the writer reads it later.
+        """
+        self.saved += 1
+        self._queue.put((table_id, snapshot, actions))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write the newest snapshot of every table, then stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def path_for(self, table_id: str) -> str:
+        return os.path.join(self.directory, f"{table_id}.json")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            started = time.monotonic()
+            latest: Dict[str, tuple] = {}
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                latest[item[0]] = item  # type: ignore[index]
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            for _, snapshot, actions in latest.values():
+                self._write(snapshot, actions)
+            if stop:
+                return
+            # Let snapshots pile up (and coalesce) instead of waking per action.
+            time.sleep(max(0.0, started + self.min_interval_s - time.monotonic()))
+
+    def _write(self, snapshot: Dict[str, object], actions: Optional[Sequence[object]]) -> None:
+        table_id = str(snapshot["table_id"])
+        path = self.path_for(table_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            if actions is not None:
+                snapshot = {**snapshot, "hand": {**snapshot["hand"], "actions": list(actions)}}  # type: ignore[dict-item]
+            data = self.serializer.dumps({**snapshot, "saved_at": datetime.now(timezone.utc).isoformat()}).encode()
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, path)
+            self._sync_directory()
+            self.written += 1
+        except (OSError, TypeError, ValueError):
+            self.errors += 1
+            LOGGER.exception("Checkpoint for %s failed; keeping the previous one", table_id)
+
+    def _sync_directory(self) -> None:
+        # Makes the rename itself durable; not every platform can open a directory.
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def table_ids(checkpoints: Dict[str, Dict[str, object]]) -> List[str]:
+    """Checkpointed table ids in table order (T-2 before T-10)."""
+    return sorted(checkpoints, key=lambda table_id: (len(table_id), table_id))
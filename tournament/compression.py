@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from websockets.datastructures import Headers
+from websockets.extensions import Extension, ServerExtensionFactory
+from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
+from websockets.server import WebSocketServerProtocol
+
+# permessage-deflate is negotiated in the HTTP upgrade, before the hello says
+# who is connecting, so the profile is picked from the URL path: spectators
+# connect to /spectate (the dashboard's default), everything else is treated
+# as a bot.
+#
+# Profiles (zlib level, server window bits, memLevel):
+#   off      no compression; saves the per-frame deflate cost entirely.
+#   fast     level 1, 15 bits, memLevel 8. The spectator default: delta frames
+#            come out ~20% smaller than with "default" for ~25% less CPU,
+#            because the larger window still holds the previous frames.
+#   default  level 6, 12 bits, memLevel 5: websockets' own defaults. The bot
+#            default; slightly smaller bot frames than "fast".
+#   max      level 9, 15 bits, memLevel 9: roughly half the spectator bytes of
+#            "default" for ~25% more CPU than it.
+#
+# Context takeover stays on in every profile. Keeping the window between
+# frames is what makes small, repetitive frames compress: the keys and team
+# names of the previous frame act as the dictionary for the next one. RFC 7692
+# has no way to negotiate a preset dictionary with browsers. Without takeover,
+# frames come out four to six times larger and cost more CPU.
+# `python -m scripts.bench compression` measures each profile on recorded
+# traffic.
+
+COMPRESSION_PROFILES = ("off", "fast", "default", "max")
+SPECTATOR_PATHS = ("/spectate",)
+
+_DEFLATE_SETTINGS: Dict[str, Tuple[int, Dict[str, int]]] = {
+    "fast": (15, {"level": 1, "memLevel": 8}),
+    "default": (12, {"memLevel": 5}),
+    "max": (15, {"level": 9, "memLevel": 9}),
+}
+
+
+def deflate_factory(profile: str) -> Optional[ServerPerMessageDeflateFactory]:
+    if profile not in COMPRESSION_PROFILES:
+        raise ValueError(f"Unknown compression profile {profile!r}; choose from {', '.join(COMPRESSION_PROFILES)}")
+    if profile == "off":
+        return None
+    window_bits, compress_settings = _DEFLATE_SETTINGS[profile]
+    return ServerPerMessageDeflateFactory(
+        server_max_window_bits=window_bits,
+        # Bots and browsers send little; a 4 KiB inflate window per connection is plenty.
+        client_max_window_bits=12,
+        compress_settings=dict(compress_settings),
+    )
+
+
+def is_spectator_path(path: str) -> bool:
+    route = path.split("?", 1)[0].rstrip("/")
+    return route in SPECTATOR_PATHS
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    """permessage-deflate profile per connection type; picklable for shard workers."""
+
+    bots: str = "default"
+    spectators: str = "fast"
+
+    def __post_init__(self) -> None:
+        deflate_factory(self.bots)
+        deflate_factory(self.spectators)
+
+    def extensions_for(self, path: str) -> List[ServerExtensionFactory]:
+        factory = deflate_factory(self.spectators if is_spectator_path(path) else self.bots)
+        return [factory] if factory is not None else []
+
+    def serve_options(self) -> Dict[str, object]:
+        """Keyword arguments for websockets.serve that apply this config."""
+        return {"compression": None, "create_protocol": _protocol_class(self)}
+
+
+def _protocol_class(config: CompressionConfig) -> Type[WebSocketServerProtocol]:
+    class CompressionNegotiatingProtocol(WebSocketServerProtocol):
+        def process_extensions(
+            self,
+            headers: Headers,
+            available_extensions: Optional[Sequence[ServerExtensionFactory]],
+        ) -> Tuple[Optional[str], List[Extension]]:
+            # self.path is set by the time the handshake gets here.
+            return WebSocketServerProtocol.process_extensions(headers, config.extensions_for(self.path))
+
+    return CompressionNegotiatingProtocol
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+LOGGER = logging.getLogger("poker_host")
+
+# Move clocks for every table in the process share one heap and one task.
+# Arming a clock is a heap push; cancelling only flags the entry, which the
+# runner discards when it surfaces (the heap is rebuilt if cancelled entries
+# ever outnumber live ones). The runner sleeps until the earliest deadline and
+# is woken early only when a new deadline becomes the earliest.
+
+ExpiryCallback = Callable[[float], Optional[Awaitable[None]]]
+
+
+class TimerHandle:
+    __slots__ = ("deadline", "callback", "cancelled", "_scheduler")
+
+    def __init__(self, deadline: float, callback: ExpiryCallback, scheduler: "DeadlineScheduler") -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            self._scheduler._on_cancel()
+
+
+class DeadlineScheduler:
+    """Single-task deadline heap; ``schedule`` never creates a task per timer.
+
+    Deadlines are ``time.monotonic()`` values. Expiry callbacks receive the
+    time they fired at; coroutine callbacks run as their own task so one slow
+    table never delays the next expiry.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Future] = None
+        self._callbacks: Set[asyncio.Task] = set()
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def schedule(self, deadline: float, callback: ExpiryCallback) -> TimerHandle:
+        handle = TimerHandle(deadline, callback, self)
+        heapq.heappush(self._heap, (deadline, next(self._counter), handle))
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+        elif self._heap[0][2] is handle:
+            self._wake()
+        return handle
+
+    def call_later(self, delay_s: float, callback: ExpiryCallback) -> TimerHandle:
+        return self.schedule(time.monotonic() + delay_s, callback)
+
+    def _on_cancel(self) -> None:
+        self._cancelled += 1
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _wake(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _run(self) -> None:
+        try:
+            await self._run_forever()
+        finally:
+            # Drop loop-bound objects so a closed loop is not kept alive.
+            self._runner = None
+            self._wakeup = None
+
+    async def _run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            heap = self._heap
+            while heap and heap[0][2].cancelled:
+                heapq.heappop(heap)
+                self._cancelled -= 1
+            self._wakeup = loop.create_future()
+            if not heap:
+                await self._wakeup
+                continue
+            delay = heap[0][0] - time.monotonic()
+            if delay > 0:
+                timer = loop.call_later(delay, self._wake)
+                try:
+                    await self._wakeup
+                finally:
+                    timer.cancel()
+                continue
+            _, _, handle = heapq.heappop(heap)
+            # Popped entries can no longer be cancelled from the heap's view.
+            handle.cancelled = True
+            self.fired += 1
+            self._fire(handle, time.monotonic())
+
+    def _fire(self, handle: TimerHandle, now: float) -> None:
+        try:
+            result = handle.callback(now)
+        except Exception:
+            LOGGER.exception("Deadline callback failed")
+            return
+        if asyncio.iscoroutine(result):
+            task = asyncio.get_running_loop().create_task(result)
+            self._callbacks.add(task)
+            task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task: asyncio.Task) -> None:
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            LOGGER.error("Deadline callback failed", exc_info=task.exception())
+
+    async def close(self) -> None:
+        for _, _, handle in self._heap:
+            handle.cancelled = True
+        self._heap.clear()
+        self._cancelled = 0
+        runner = self._runner
+        if runner is not None:
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+
+
+_SCHEDULERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, DeadlineScheduler]" = weakref.WeakKeyDictionary()
+
+
+def process_scheduler() -> DeadlineScheduler:
+    """The scheduler shared by every table on the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _SCHEDULERS.get(loop)
+    if scheduler is None:
+        scheduler = _SCHEDULERS[loop] = DeadlineScheduler()
+    return scheduler
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import secrets
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Optional
+
+# Every table keeps two bounded logs of what it broadcast: the hand stream sent
+# to bots (start_hand, event, admin, end_hand, match_end) and the full-state
+# spectator stream. Each message carries its ``log_seq``; a client that
+# reconnects with ``resume_from`` set to the last one it saw gets just the
+# messages after it, replayed from the log. When those were already evicted,
+# or the seq belongs to another stream (the host restarted), the client falls
+# back to the usual snapshot.
+#
+# Entries keep the payload and encode it the first time someone needs the
+# message (live or on replay), so each logged message is encoded at most once
+# per encoding (JSON text or compact binary) and not at all when every client
+# takes batches instead.
+
+DEFAULT_EVENT_LOG_SIZE = 512
+
+# (msg_type, payload, log_seq) -> wire message
+Encoder = Callable[[str, Dict[str, object], int], str]
+Packer = Callable[[str, Dict[str, object], int], bytes]
+
+
+class LoggedMessage:
+    __slots__ = ("seq", "msg_type", "payload", "_message", "_packed")
+
+    def __init__(self, seq: int, msg_type: str, payload: Dict[str, object]) -> None:
+        self.seq = seq
+        self.msg_type = msg_type
+        self.payload = payload
+        self._message: Optional[str] = None
+        self._packed: Optional[bytes] = None
+
+    def message(self, encode: Encoder) -> str:
+        if self._message is None:
+            self._message = encode(self.msg_type, self.payload, self.seq)
+        return self._message
+
+    def packed(self, pack: Packer) -> bytes:
+        if self._packed is None:
+            self._packed = pack(self.msg_type, self.payload, self.seq)
+        return self._packed
+
+
+class EventLog:
+    def __init__(self, name: str, max_events: int = DEFAULT_EVENT_LOG_SIZE) -> None:
+        if max_events < 1:
+            raise ValueError("Event log needs room for at least one message")
+        # Changes on every start, so a seq from an earlier process never matches.
+        self.stream = f"{name}:{secrets.token_hex(4)}"
+        self.max_events = max_events
+        self._entries: Deque[LoggedMessage] = deque(maxlen=max_events)
+        self.last_seq = 0
+        self.replays = 0
+        self.fallbacks = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, msg_type: str, payload: Dict[str, object]) -> LoggedMessage:
+        """Append a message under the next seq; the payload must not change afterwards."""
+        self.last_seq += 1
+        entry = LoggedMessage(self.last_seq, msg_type, payload)
+        self._entries.append(entry)
+        return entry
+
+    def since(self, seq: int, stream: Optional[str] = None) -> Optional[List[LoggedMessage]]:
+        """Messages after ``seq``, or None when the log cannot fill the gap."""
+        if (stream is not None and stream != self.stream) or not 0 <= seq <= self.last_seq:
+            self.fallbacks += 1
+            return None
+        oldest = self._entries[0].seq if self._entries else self.last_seq + 1
+        if seq + 1 < oldest:
+            self.fallbacks += 1
+            return None
+        self.replays += 1
+        return list(islice(self._entries, seq + 1 - oldest, None))
+
+    def head(self) -> Dict[str, object]:
+        return {"stream": self.stream, "log_seq": self.last_seq}
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "stream": self.stream,
+            "last_seq": self.last_seq,
+            "retained": len(self._entries),
+            "max": self.max_events,
+            "replays": self.replays,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def parse_resume(hello: Dict[str, object]) -> Optional[int]:
+    """``resume_from`` from a hello, or None when absent or not a non-negative int."""
+    value = hello.get("resume_from")
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return None
+    return value
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from core.instrumentation import EngineHooks
+from core.serialization import Serializer, default_serializer
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from core.game import GameEngine
+
+LOGGER = logging.getLogger("poker_host")
+
+# Durable hand history for the hosts. Each table's engine gets a small hook
+# that builds one record per hand (seed, seats and hole cards, every action,
+# board, showdowns, payouts, closing stacks) and hands it to a write-behind
+# queue when the hand completes. The event loop never touches the disk.
+#
+# One writer thread per recorder drains the queue. Each wakeup encodes
+# everything that is waiting and writes it as one batch. fsync runs at most
+# every ``fsync_interval_s``, so a crash loses at most that much history and
+# the disk sees one sync per interval, not one per hand. Records are JSON
+# lines in ``hands-NNNNNN.jsonl`` segments. A segment is closed and synced
+# once it passes ``segment_bytes``, and numbering continues after the
+# segments already in the directory, so a restart never rewrites old files.
+#
+# ``actions`` holds (seat, action, amount) entries in the form
+# GameEngine.apply_actions takes (amount is the raise-to total for RAISE_TO,
+# else null). Dealing the same seats and calling start_hand(seed) replays the
+# hand exactly.
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+_SEGMENT_NAME = re.compile(r"hands-(\d+)\.jsonl$")
+_STOP = object()
+
+
+class HandRecordHooks(EngineHooks):
+    """Builds the record of the hand in progress on one table and passes it to ``on_complete``."""
+
+    def __init__(self, table_id: str, on_complete: Callable[[Dict[str, object]], object]) -> None:
+        self.table_id = table_id
+        self.on_complete = on_complete
+        self.record: Optional[Dict[str, object]] = None
+        # Chips each seat has put in this street; turns BET events into raise-to totals.
+        self._committed: Dict[int, int] = {}
+
+    def on_hand_start(self, engine, ctx, elapsed_ns):
+        players = []
+        self._committed = {}
+        for seat in engine.seats:
+            if seat is None:
+                continue
+            players.append(
+                {
+                    "seat": seat.seat,
+                    "team": seat.team,
+                    "stack": seat.stack + seat.total_in_pot,
+                    "hole": list(seat.hole_cards),
+                }
+            )
+            self._committed[seat.seat] = seat.committed
+        self.record = {
+            "table_id": self.table_id,
+            "hand_id": ctx.hand_id,
+            "seed": ctx.seed,
+            "button": ctx.button,
+            "sb": engine.config.sb,
+            "bb": engine.config.bb,
+            "players": players,
+            "actions": [],
+            "board": [],
+            "showdowns": [],
+            "payouts": [],
+        }
+
+    def on_action(self, engine, seat_idx, action, events, elapsed_ns):
+        record = self.record
+        if record is None:
+            return
+        committed = self._committed
+        amount = None
+        for index, event in enumerate(events):
+            ev = event["ev"]
+            if ev in ("CALL", "BET"):
+                committed[event["seat"]] = committed.get(event["seat"], 0) + event["amount"]
+                if index == 0 and ev == "BET":
+                    amount = committed[event["seat"]]
+            elif ev == "FLOP":
+                record["board"].extend(event["cards"])
+                committed = self._committed = {}
+            elif ev in ("TURN", "RIVER"):
+                record["board"].append(event["card"])
+                committed = self._committed = {}
+            elif ev == "SHOWDOWN":
+                record["showdowns"].append({"seat": event["seat"], "hand": event["hand"], "rank": event["rank"]})
+            elif ev == "POT_AWARD":
+                record["payouts"].append({"seat": event["seat"], "amount": event["amount"]})
+            elif ev == "ELIMINATED":
+                record.setdefault("eliminated", []).append(event["seat"])
+        record["actions"].append((seat_idx, action.value, amount))
+        if engine.is_hand_complete():
+            record["stacks"] = [{"seat": seat.seat, "stack": seat.stack} for seat in engine.seats if seat is not None]
+            record["ended_at"] = datetime.now(timezone.utc).isoformat()
+            self.record = None
+            self.on_complete(record)
+
+
+class HandHistoryRecorder:
+    """Write-behind hand history: attach tables, then ``start()`` the writer thread."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        fsync_interval_s: float = 0.5,
+        max_pending: int = 100_000,
+        serializer: Optional[Serializer] = None,
+    ) -> None:
+        if segment_bytes <= 0:
+            raise ValueError("segment_bytes must be positive")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_interval_s = fsync_interval_s
+        self.max_pending = max_pending
+        self.serializer = serializer or default_serializer()
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._segment_index = 0
+        self._segment_size = 0
+        # Bumped by the event loop (submitted, dropped) or the writer (the rest);
+        # each counter has a single writer, so no lock is needed.
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.fsyncs = 0
+        self.segments = 0
+        self.errors = 0
+
+    def hooks_for(self, table_id: str) -> EngineHooks:
+        return HandRecordHooks(table_id, self.submit)
+
+    def attach(self, engine: "GameEngine", table_id: str) -> EngineHooks:
+        hooks = self.hooks_for(table_id)
+        engine.add_hooks(hooks)
+        return hooks
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._segment_index = self._last_segment_index()
+        self._thread = threading.Thread(target=self._run, name="hand-history-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict[str, object]) -> bool:
+        """Queue a finished hand; never blocks. Returns False when the backlog is full and the hand is dropped."""
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                LOGGER.warning("Hand history backlog full; %s hands dropped so far", self.dropped)
+            return False
+        self.submitted += 1
+        self._queue.put(record)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write and sync everything queued so far, then stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": self.pending,
+            "bytes_written": self.bytes_written,
+            "fsyncs": self.fsyncs,
+            "segments": self.segments,
+            "errors": self.errors,
+        }
+
+    # Writer thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        dirty = False
+        last_sync = time.monotonic()
+        while True:
+            timeout = max(0.0, last_sync + self.fsync_interval_s - time.monotonic()) if dirty else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            batch, stop = self._drain(item)
+            if batch:
+                self._write(batch)
+                dirty = True
+            if dirty and (stop or time.monotonic() - last_sync >= self.fsync_interval_s):
+                self._sync()
+                dirty = False
+                last_sync = time.monotonic()
+            if stop:
+                self._close_segment()
+                return
+
+    def _drain(self, item: object) -> Tuple[List[object], bool]:
+        batch: List[object] = []
+        while item is not None:
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                item = None
+        return batch, False
+
+    def _write(self, batch: List[object]) -> None:
+        dumps = self.serializer.dumps
+        try:
+            lines = [(dumps(record) + "\n").encode() for record in batch]
+            # One write per segment touched; a segment ends on the record that fills it.
+            start = size = 0
+            for index, line in enumerate(lines):
+                size += len(line)
+                if self._segment_size + size >= self.segment_bytes:
+                    self._write_lines(lines[start : index + 1], size)
+                    self._close_segment()
+                    start, size = index + 1, 0
+            if start < len(lines):
+                self._write_lines(lines[start:], size)
+        except (OSError, TypeError, ValueError):
+            self.errors += 1
+            LOGGER.exception("Hand history write failed; up to %s hands lost", len(batch))
+
+    def _write_lines(self, lines: List[bytes], size: int) -> None:
+        if self._file is None:
+            self._open_segment()
+        self._file.write(b"".join(lines))
+        self._segment_size += size
+        self.written += len(lines)
+        self.bytes_written += size
+
+    def _sync(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+        except OSError:
+            self.errors += 1
+            LOGGER.exception("Hand history fsync failed")
+
+    def _open_segment(self) -> None:
+        self._segment_index += 1
+        path = os.path.join(self.directory, f"hands-{self._segment_index:06d}.jsonl")
+        self._file = open(path, "ab")
+        self._segment_size = self._file.tell()
+        self.segments += 1
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._sync()
+        self._file.close()
+        self._file = None
+        self._segment_size = 0
+
+    def _last_segment_index(self) -> int:
+        indexes = [int(match.group(1)) for match in map(_SEGMENT_NAME.match, os.listdir(self.directory)) if match]
+        return max(indexes, default=0)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.instrumentation import EngineHooks
+from core.metrics import ACT_RTT_BUCKETS_US, CONTENT_TYPE, MetricsRegistry, RateMeter, Sample
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .admission import AdmissionGate
+    from .hand_history import HandHistoryRecorder
+    from .outbox import Outbox
+    from .server import HostServer
+
+# HostMetrics is the registry behind GET /metrics. Hot paths only touch
+# counters and histograms (a dict lookup and an add); connection counts, queue
+# depths and mailbox depths are read from the tables when Prometheus scrapes.
+# Fly's connection limits (fly.toml: soft 20, hard 25) count every socket on
+# the machine, so compare them with sum(poker_connections).
+
+
+class _EngineMetricsHooks(EngineHooks):
+    def __init__(self, metrics: "HostMetrics", table_id: str) -> None:
+        self.metrics = metrics
+        self.table_id = table_id
+
+    def on_hand_start(self, engine, ctx, elapsed_ns):
+        self.metrics.hands.inc(table=self.table_id)
+        self.metrics.hand_rate.mark()
+
+    def on_action(self, engine, seat_idx, action, events, elapsed_ns):
+        self.metrics.engine_apply.observe_ns(elapsed_ns, table=self.table_id)
+
+
+class HostMetrics:
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        registry = self.registry
+        self.act_rtt = registry.histogram(
+            "poker_act_roundtrip_seconds",
+            "Time from queuing an act prompt to receiving the bot's action.",
+            ACT_RTT_BUCKETS_US,
+        )
+        self.engine_apply = registry.histogram("poker_engine_apply_seconds", "GameEngine.apply_action time.")
+        self.broadcast = registry.histogram(
+            "poker_broadcast_fanout_seconds", "Time to encode and queue one broadcast for every recipient."
+        )
+        self.hands = registry.counter("poker_hands_total", "Hands started.")
+        self.hand_rate = RateMeter()
+        self.tables: List["HostServer"] = []
+        self.hand_histories: List["HandHistoryRecorder"] = []
+        self.admission_gates: List["AdmissionGate"] = []
+        # Totals from closed send queues, keyed by (table, kind).
+        self._retired: Dict[Tuple[str, str], List[int]] = {}
+        registry.collect(
+            "poker_hands_per_second", "gauge", "Hands started per second over the last minute.", self._hand_rate
+        )
+        registry.collect("poker_connections", "gauge", "Open connections by table and role.", self._connections)
+        registry.collect(
+            "poker_send_queue_depth", "gauge", "Messages waiting in outbound queues.", self._queue_depth
+        )
+        registry.collect(
+            "poker_send_queue_depth_max", "gauge", "Deepest single outbound queue.", self._queue_depth_max
+        )
+        registry.collect("poker_messages_sent_total", "counter", "Messages written to sockets.", self._messages)
+        registry.collect("poker_bytes_sent_total", "counter", "Message bytes written to sockets.", self._bytes)
+        registry.collect(
+            "poker_frames_dropped_total", "counter", "Spectator frames skipped by send queue policy.", self._dropped
+        )
+        registry.collect("poker_actor_mailbox_depth", "gauge", "Jobs waiting on each table actor.", self._mailbox)
+        registry.collect(
+            "poker_messages_rate_limited_total", "counter", "Inbound messages dropped by per-connection rate limits.",
+            self._rate_limited,
+        )
+        registry.collect(
+            "poker_rate_limit_disconnects_total", "counter", "Connections closed for flooding past their rate limit.",
+            self._rate_limit_closes,
+        )
+        registry.collect(
+            "poker_connections_pending", "gauge", "Sockets accepted but still waiting for their hello.",
+            self._pending_connections,
+        )
+        registry.collect(
+            "poker_connections_refused_total", "counter", "Sockets refused by admission control.",
+            self._refused_connections,
+        )
+        registry.collect(
+            "poker_spectators_shed_total", "counter", "Spectators closed to make room for players or operators.",
+            self._shed_spectators,
+        )
+        registry.collect(
+            "poker_hand_history_hands_total", "counter", "Hands written to or dropped from hand history.",
+            self._history_hands,
+        )
+        registry.collect(
+            "poker_hand_history_pending", "gauge", "Finished hands waiting for the history writer.",
+            self._history_pending,
+        )
+
+    def attach(self, table: "HostServer") -> None:
+        self.tables.append(table)
+        table.engine.add_hooks(_EngineMetricsHooks(self, table.table_id))
+        recorder = table.hand_history
+        if recorder is not None and all(recorder is not seen for seen in self.hand_histories):
+            self.hand_histories.append(recorder)
+
+    def attach_admission(self, gate: "AdmissionGate") -> None:
+        self.admission_gates.append(gate)
+
+    def retire_outbox(self, table_id: str, outbox: "Outbox") -> None:
+        totals = self._retired.setdefault((table_id, outbox.kind), [0, 0, 0])
+        totals[0] += outbox.sent
+        totals[1] += outbox.bytes_sent
+        totals[2] += outbox.dropped_frames
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    def _hand_rate(self) -> Iterable[Sample]:
+        yield {}, round(self.hand_rate.rate(), 3)
+
+    def _connections(self) -> Iterable[Sample]:
+        for table in self.tables:
+            yield {"table": table.table_id, "role": "player"}, len(table.sessions)
+            yield {"table": table.table_id, "role": "spectator"}, len(table.spectators)
+
+    def _outbox_totals(self) -> Dict[Tuple[str, str], List[int]]:
+        # [depth, max depth, sent, bytes, dropped] per (table, kind).
+        totals: Dict[Tuple[str, str], List[int]] = {}
+        for key, (sent, sent_bytes, dropped) in self._retired.items():
+            totals[key] = [0, 0, sent, sent_bytes, dropped]
+        for table in self.tables:
+            for outbox in table.outboxes.values():
+                entry = totals.setdefault((table.table_id, outbox.kind), [0, 0, 0, 0, 0])
+                depth = outbox.depth
+                entry[0] += depth
+                entry[1] = max(entry[1], depth)
+                entry[2] += outbox.sent
+                entry[3] += outbox.bytes_sent
+                entry[4] += outbox.dropped_frames
+        return totals
+
+    def _outbox_samples(self, column: int) -> Iterable[Sample]:
+        for (table_id, kind), entry in sorted(self._outbox_totals().items()):
+            yield {"table": table_id, "kind": kind}, entry[column]
+
+    def _queue_depth(self) -> Iterable[Sample]:
+        return self._outbox_samples(0)
+
+    def _queue_depth_max(self) -> Iterable[Sample]:
+        return self._outbox_samples(1)
+
+    def _messages(self) -> Iterable[Sample]:
+        return self._outbox_samples(2)
+
+    def _bytes(self) -> Iterable[Sample]:
+        return self._outbox_samples(3)
+
+    def _dropped(self) -> Iterable[Sample]:
+        return self._outbox_samples(4)
+
+    def _mailbox(self) -> Iterable[Sample]:
+        for table in self.tables:
+            yield {"table": table.table_id}, table.actor.depth
+
+    def _rate_limited(self) -> Iterable[Sample]:
+        for table in self.tables:
+            for role, count in table.rate_limited.items():
+                yield {"table": table.table_id, "role": role}, count
+
+    def _rate_limit_closes(self) -> Iterable[Sample]:
+        for table in self.tables:
+            for role, count in table.rate_limit_closes.items():
+                yield {"table": table.table_id, "role": role}, count
+
+    def _pending_connections(self) -> Iterable[Sample]:
+        if self.admission_gates:
+            yield {}, sum(gate.pending for gate in self.admission_gates)
+
+    def _refused_connections(self) -> Iterable[Sample]:
+        totals: Dict[Tuple[str, str], int] = {}
+        for gate in self.admission_gates:
+            for key, count in gate.refused.items():
+                totals[key] = totals.get(key, 0) + count
+        for (role, reason), count in sorted(totals.items()):
+            yield {"role": role, "reason": reason}, count
+
+    def _shed_spectators(self) -> Iterable[Sample]:
+        if self.admission_gates:
+            yield {}, sum(gate.shed for gate in self.admission_gates)
+
+    def _history_hands(self) -> Iterable[Sample]:
+        if self.hand_histories:
+            yield {"state": "written"}, sum(recorder.written for recorder in self.hand_histories)
+            yield {"state": "dropped"}, sum(recorder.dropped for recorder in self.hand_histories)
+
+    def _history_pending(self) -> Iterable[Sample]:
+        if self.hand_histories:
+            yield {}, sum(recorder.pending for recorder in self.hand_histories)
+
+
+def http_handler(metrics: HostMetrics, scrape: Optional[Callable[[], Awaitable[str]]] = None):
+    """``process_request`` hook serving /metrics and /health next to the WebSocket endpoint.
+
+    ``scrape`` replaces ``metrics.render()`` for hosts whose /metrics is
+    assembled from elsewhere (the shard router).
+    """
+
+    async def process_request(path, request_headers):
+        if request_headers.get("Upgrade", "").lower() == "websocket":
+            return None
+        route = path.split("?", 1)[0]
+        if route == "/metrics":
+            text = await scrape() if scrape is not None else metrics.render()
+            status, content_type, body = HTTPStatus.OK, CONTENT_TYPE, text.encode()
+        elif route in ("/", "/health", "/healthz"):
+            status, content_type, body = HTTPStatus.OK, "text/plain; charset=utf-8", b"tournament host running\n"
+        else:
+            status, content_type, body = HTTPStatus.NOT_FOUND, "text/plain; charset=utf-8", b"not found\n"
+        return status, [("Content-Type", content_type), ("Content-Length", str(len(body)))], body
+
+    return process_request
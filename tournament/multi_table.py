@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import websockets
+from websockets.server import WebSocketServerProtocol
+
+from core.instrumentation import EngineStatsCollector
+from core.models import TableConfig
+
+from .admission import AdmissionConfig, AdmissionGate
+from .checkpoint import table_ids
+from .compression import CompressionConfig
+from .metrics import HostMetrics, http_handler
+from .server import HostServer
+
+LOGGER = logging.getLogger("poker_host")
+
+# MultiTableHost runs many HostServer tables behind one listening socket and
+# one event loop. Each table keeps its own engine, actor (state changes run on
+# it one at a time), sessions, spectators and send queues; this class only
+# reads the hello and picks the table.
+#
+# Routing, in order:
+#   hello["table_id"]            that table (UNKNOWN_TABLE if it does not exist)
+#   spectator / operator         the first table
+#   player already seated        the table holding the team (reconnects)
+#   player                       first table with an open seat, else a new
+#                                table while under ``max_tables``
+
+
+class MultiTableHost:
+    def __init__(
+        self,
+        config: TableConfig,
+        *,
+        tables: int = 1,
+        max_tables: Optional[int] = None,
+        engine_stats: Optional[EngineStatsCollector] = None,
+        table_offset: int = 0,
+        table_stride: int = 1,
+        metrics: Optional[HostMetrics] = None,
+        **table_options: object,
+    ) -> None:
+        if tables < 1:
+            raise ValueError("Need at least one table")
+        self.config = config
+        self.max_tables = max(max_tables or tables, tables)
+        self.engine_stats = engine_stats
+        # One registry for every table; served at /metrics on the host port.
+        self.metrics = metrics or HostMetrics()
+        # Table n is "T-{offset + 1 + (n - 1) * stride}"; shards use this to
+        # interleave ids so the owner of any table id is known up front.
+        self.table_offset = table_offset
+        self.table_stride = table_stride
+        # Passed through to every HostServer (hand_control, queue configs, ...).
+        self.table_options = table_options
+        self.tables: Dict[str, HostServer] = {}
+        self._table_counter = 0
+        # Set by start(admission=...); one gate for the shared listener.
+        self.admission: Optional[AdmissionGate] = None
+        for _ in range(tables):
+            self.open_table()
+
+    def open_table(self, config: Optional[TableConfig] = None) -> HostServer:
+        if len(self.tables) >= self.max_tables:
+            raise RuntimeError("Table limit reached")
+        self._table_counter += 1
+        table_id = f"T-{self.table_offset + 1 + (self._table_counter - 1) * self.table_stride}"
+        table = HostServer(
+            config or self.config,
+            engine_stats=self.engine_stats,
+            table_id=table_id,
+            metrics=self.metrics,
+            **self.table_options,  # type: ignore[arg-type]
+        )
+        table.hub = self
+        self.tables[table_id] = table
+        LOGGER.info("Opened table %s", table_id)
+        return table
+
+    def table(self, table_id: str) -> Optional[HostServer]:
+        return self.tables.get(table_id)
+
+    def restore(self, checkpoints: Dict[str, Dict[str, object]]) -> None:
+        """Restore checkpointed tables (``--resume``), reopening tables that were opened on demand."""
+        for table_id in table_ids(checkpoints):
+            while table_id not in self.tables and len(self.tables) < self.max_tables:
+                self.open_table()
+            table = self.tables.get(table_id)
+            if table is None:
+                LOGGER.warning("Ignoring checkpoint for %s: this host does not open that table", table_id)
+                continue
+            table.restore_checkpoint(checkpoints[table_id])
+
+    async def start(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        compression: Optional[CompressionConfig] = None,
+        admission: Optional[AdmissionConfig] = None,
+    ) -> None:
+        if admission is not None:
+            self.admission = AdmissionGate(admission, self._lead_table()._send_json)
+            self.metrics.attach_admission(self.admission)
+        async with websockets.serve(
+            self._handle_connection,
+            host,
+            port,
+            process_request=http_handler(self.metrics),
+            **(compression or CompressionConfig()).serve_options(),
+        ):
+            LOGGER.info("Multi-table host listening on %s:%s (%s tables)", host, port, len(self.tables))
+            for table in self.tables.values():
+                table.resume_restored_hand()
+            await asyncio.Future()
+
+    async def _handle_connection(self, websocket: WebSocketServerProtocol) -> None:
+        lead = self._lead_table()
+        gate = self.admission
+        if gate is None:
+            hello = await lead._read_message(websocket)
+        else:
+            accepted, hello = await gate.handshake(websocket, lead._read_message)
+            if not accepted:
+                return
+        if hello is None or hello.get("type") != "hello":
+            await lead._send_error(websocket, code="BAD_HELLO", msg="Expected hello")
+            await websocket.close()
+            return
+        # Admission comes before routing so a refused hello never opens a table.
+        if gate is not None and not await gate.admit(websocket, hello):
+            return
+        try:
+            table, error = self.route(hello)
+            if table is None:
+                assert error is not None
+                code, msg = error
+                await lead._send_error(websocket, code=code, msg=msg)
+                await websocket.close()
+                return
+            await table.handle_client(websocket, hello)
+        finally:
+            if gate is not None:
+                gate.release(websocket)
+
+    def route(self, hello: Dict[str, object]) -> Tuple[Optional[HostServer], Optional[Tuple[str, str]]]:
+        """Pick the table for a hello; returns (table, None) or (None, (code, msg))."""
+        table_id = hello.get("table_id")
+        if table_id is not None:
+            table = self.tables.get(table_id) if isinstance(table_id, str) else None
+            if table is None:
+                return None, ("UNKNOWN_TABLE", f"No table {table_id!r}; open tables: {', '.join(self.tables)}")
+            return table, None
+
+        role = hello.get("role") or "player"
+        if isinstance(role, str) and role.strip().casefold() in ("spectator", "operator"):
+            return self._lead_table(), None
+
+        team = hello.get("team")
+        if isinstance(team, str) and team.strip():
+            for table in self.tables.values():
+                if table.engine.find_team(team):
+                    return table, None
+        for table in self.tables.values():
+            if table.engine.has_open_seat():
+                return table, None
+        if len(self.tables) < self.max_tables:
+            return self.open_table(), None
+        return None, ("TABLE_FULL", "No seats available")
+
+    def tables_summary(self) -> List[Dict[str, object]]:
+        return [table.table_summary() for table in self.tables.values()]
+
+    def queue_stats(self) -> List[Dict[str, object]]:
+        stats = [
+            {"table_id": table_id, **entry}
+            for table_id, table in self.tables.items()
+            for entry in table.queue_stats()
+        ]
+        return sorted(stats, key=lambda entry: (-int(entry["depth"]), str(entry["client"])))
+
+    def _lead_table(self) -> HostServer:
+        return next(iter(self.tables.values()))
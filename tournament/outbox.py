@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Tuple, Union
+
+import websockets
+from websockets.server import WebSocketServerProtocol
+
+# Text (JSON) or binary (compact encoding) frame.
+Message = Union[str, bytes]
+
+LOGGER = logging.getLogger("poker_host")
+
+# Every connection gets its own bounded outbound queue drained by one writer
+# task, so a slow socket only ever delays itself. Messages are tagged as
+# frames (spectator table updates, safe to skip) or everything else (must be
+# delivered in order). What happens when the queue is full depends on policy:
+#
+#   drop        skip the incoming frame, keep what is already queued
+#   coalesce    discard queued frames and keep only the newest one
+#   disconnect  close the connection as a slow consumer
+#
+# Non-frame messages never get dropped: they first evict queued frames and,
+# if the queue is still full, the connection is closed.
+
+POLICIES = ("drop", "coalesce", "disconnect")
+SLOW_CONSUMER_CLOSE_CODE = 4408
+
+
+@dataclass(frozen=True)
+class SendQueueConfig:
+    max_messages: int = 256
+    policy: str = "disconnect"
+
+    def __post_init__(self) -> None:
+        if self.policy not in POLICIES:
+            raise ValueError(f"Unknown send queue policy {self.policy!r}")
+        if self.max_messages < 1:
+            raise ValueError("Send queue needs room for at least one message")
+
+
+class Outbox:
+    def __init__(
+        self,
+        websocket: WebSocketServerProtocol,
+        config: SendQueueConfig,
+        label: str,
+        kind: str = "player",
+    ) -> None:
+        self.websocket = websocket
+        self.config = config
+        self.label = label
+        # "player" or "spectator"; groups queues in /metrics.
+        self.kind = kind
+        # (message, is_frame, self_contained)
+        self._queue: Deque[Tuple[Message, bool, bool]] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        # Set once a frame was skipped; the next frame must carry full state.
+        self.needs_keyframe = False
+        self.sent = 0
+        self.bytes_sent = 0
+        self.dropped_frames = 0
+        self.high_water = 0
+        self._writer = asyncio.get_running_loop().create_task(self._drain())
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def put(self, message: Message, *, frame: bool = False, self_contained: bool = True) -> bool:
+        """Queue a message without waiting; returns False if it was not queued."""
+        if self._closed:
+            return False
+        if frame and self.needs_keyframe and not self_contained:
+            self.dropped_frames += 1
+            return False
+        queue = self._queue
+        if len(queue) >= self.config.max_messages:
+            policy = self.config.policy
+            if frame and policy == "drop":
+                return self._skip_frame()
+            if frame and policy == "coalesce":
+                self._evict_frames()
+                if not self_contained:
+                    return self._skip_frame()
+            elif not frame and policy != "disconnect":
+                self._evict_frames()
+            if len(queue) >= self.config.max_messages:
+                self._overflow()
+                return False
+        if frame and self_contained:
+            self.needs_keyframe = False
+        queue.append((message, frame, self_contained))
+        if len(queue) > self.high_water:
+            self.high_water = len(queue)
+        self._ready.set()
+        return True
+
+    def _skip_frame(self) -> bool:
+        self.dropped_frames += 1
+        self.needs_keyframe = True
+        return False
+
+    def _evict_frames(self) -> None:
+        kept = [item for item in self._queue if not item[1]]
+        evicted = len(self._queue) - len(kept)
+        if evicted:
+            self._queue.clear()
+            self._queue.extend(kept)
+            self.dropped_frames += evicted
+            self.needs_keyframe = True
+
+    def _overflow(self) -> None:
+        LOGGER.warning("Closing slow consumer %s (send queue full at %s)", self.label, len(self._queue))
+        self._closed = True
+        self._queue.clear()
+        self._writer.cancel()
+        asyncio.get_running_loop().create_task(
+            self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Send queue overflow")
+        )
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        while True:
+            await self._ready.wait()
+            while queue:
+                message = queue.popleft()[0]
+                try:
+                    await self.websocket.send(message)
+                except websockets.ConnectionClosed:
+                    self._closed = True
+                    queue.clear()
+                    return
+                self.sent += 1
+                self.bytes_sent += len(message)
+            self._ready.clear()
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far has been handed to the socket."""
+        while self._queue and not self._closed and not self._writer.done():
+            await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        self._closed = True
+        self._queue.clear()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "client": self.label,
+            "policy": self.config.policy,
+            "depth": len(self._queue),
+            "high_water": self.high_water,
+            "max": self.config.max_messages,
+            "sent": self.sent,
+            "dropped_frames": self.dropped_frames,
+        }
+
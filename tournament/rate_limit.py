@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# Inbound flood protection. Every connection gets a token bucket for its
+# role: bots for their ``action`` messages, operators for ``control``
+# commands. The connection's own reader task checks the bucket for each
+# frame, before decoding it and before anything reaches the table actor. A
+# client over its limit only spends its own reader task's time, and the
+# table never sees the excess.
+#
+# Each ``act`` prompt sent to a bot gives its bucket one token back. A bot
+# answering its prompts is never limited, however fast the table plays; only
+# messages beyond what the table asked for spend the time-based allowance.
+#
+# The first frame of a rejected run gets one RATE_LIMITED error. The rest
+# are dropped silently, so a flood cannot turn into a flood of replies. A
+# client that keeps sending through ``close_after`` rejections in a row is
+# disconnected. Any accepted frame ends the run.
+
+RATE_LIMIT_CLOSE_CODE = 4429
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    # Sustained messages per second and how many may arrive back to back.
+    rate: float
+    burst: int
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("Rate limits need a positive rate and a burst of at least one message")
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    # None disables the limit for that role.
+    bot: Optional[RateLimit] = RateLimit(rate=20, burst=40)
+    control: Optional[RateLimit] = RateLimit(rate=5, burst=20)
+    # Rejected messages in a row before the connection is closed; 0 never closes.
+    close_after: int = 500
+
+    def bucket(self, role: str) -> Optional["TokenBucket"]:
+        limit = self.bot if role == "player" else self.control
+        return TokenBucket(limit) if limit is not None else None
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp", "streak", "rejected")
+
+    def __init__(self, limit: RateLimit, now: Optional[float] = None) -> None:
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self.tokens = float(limit.burst)
+        self.stamp = time.monotonic() if now is None else now
+        # Rejections since the last accepted message, and in total.
+        self.streak = 0
+        self.rejected = 0
+
+    def take(self, now: Optional[float] = None) -> bool:
+        """Spend one token if there is one; False means drop the message."""
+        if now is None:
+            now = time.monotonic()
+        tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if tokens >= 1:
+            self.tokens = tokens - 1
+            self.streak = 0
+            return True
+        self.tokens = tokens
+        self.streak += 1
+        self.rejected += 1
+        return False
+
+    def credit(self) -> None:
+        """Give back one token, e.g. for a prompt the client is expected to answer."""
+        self.tokens = min(self.burst, self.tokens + 1)
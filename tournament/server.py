@@ -1,23 +1,51 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
 
 import websockets
 from websockets.server import WebSocketServerProtocol
 
+from core.compact import NAME as COMPACT_ENCODING, decode as decode_compact, encode_envelope as encode_compact, is_compact
 from core.game import GameEngine
-from core.models import ActionType, TableConfig
+from core.instrumentation import EngineStatsCollector
+from core.models import ActionType, PlayerSeat, TableConfig
+from core.serialization import EnvelopeEncoder, Serializer
+
+from .actor import TableActor
+from .admission import AdmissionConfig, AdmissionGate
+from .checkpoint import Checkpointer, restore_engine
+from .compression import CompressionConfig
+from .deadlines import DeadlineScheduler, TimerHandle, process_scheduler
+from .event_log import DEFAULT_EVENT_LOG_SIZE, EventLog, LoggedMessage, parse_resume
+from .hand_history import HandHistoryRecorder
+from .metrics import HostMetrics, http_handler
+from .outbox import Message, Outbox, SendQueueConfig
+from .rate_limit import RATE_LIMIT_CLOSE_CODE, RateLimitConfig, TokenBucket
+from .spectator_frames import KEYFRAME_INTERVAL, SpectatorHandRecord, SpectatorHistory, diff_state
+from .spectator_view import SpectatorView
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .multi_table import MultiTableHost
 
 LOGGER = logging.getLogger("poker_host")
 
+# Broadcasts that enter the resumable event logs (see event_log.py). Lobby and
+# status messages are current state and are simply resent on reconnect.
+PLAYER_LOG_TYPES = frozenset({"start_hand", "event", "admin", "end_hand", "match_end"})
+SPECTATOR_LOG_TYPES = frozenset({"spectator/start_hand", "spectator/event", "spectator/end_hand"})
+# Spectator table updates an outbox may skip or coalesce when a client lags.
+SPECTATOR_FRAME_TYPES = frozenset({"spectator/event", "spectator/events"})
+
 # HostServer glues the poker engine to WebSocket clients (bots).
 # Every network concern lives here; the GameEngine stays pure.
+#
+# Table state only changes on the table's actor (see actor.py): connection
+# handlers hand work to it instead of taking a lock. Helpers suffixed
+# ``_locked`` assume they are running there.
 
 
 @dataclass
@@ -25,22 +53,42 @@ class ClientSession:
     seat: int
     team: str
     websocket: WebSocketServerProtocol
+    # Negotiated with "events": "batch" in hello: one message per action.
+    batch_events: bool = False
+    # Negotiated with "encoding": "compact" in hello: binary frames (core/compact.py).
+    compact: bool = False
+    # Inbound rate limit (rate_limit.py); None when bots are not limited.
+    bucket: Optional[TokenBucket] = None
+
+
+@dataclass(frozen=True)
+class TableView:
+    """Read-only table summary republished by the actor after each change."""
+
+    table_id: str
+    seated: int
+    seats: int
+    in_hand: bool
+    connected: int
+    spectators: int
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "table_id": self.table_id,
+            "seated": self.seated,
+            "seats": self.seats,
+            "in_hand": self.in_hand,
+            "connected": self.connected,
+            "spectators": self.spectators,
+        }
 
 
 @dataclass
 class PendingAction:
     seat: int
     deadline: float
-    timer_task: Optional[asyncio.Task] = None
-
-
-@dataclass
-class SpectatorHandRecord:
-    hand_id: str
-    opening_stacks: Dict[int, int]
-    frames: List[Dict[str, object]] = field(default_factory=list)
-    results: Optional[List[Dict[str, object]]] = None
-    next_event_id: int = 0
+    # Handle into the deadline scheduler; None when the move clock is off.
+    timer_task: Optional[TimerHandle] = None
 
 
 class HostServer:
@@ -48,41 +96,152 @@ class HostServer:
         self,
         config: TableConfig,
         hand_control: str = "auto",
+        engine_stats: Optional[EngineStatsCollector] = None,
+        spectator_history_hands: int = 20,
+        spectator_history_bytes: int = 8 * 1024 * 1024,
+        player_queue: Optional[SendQueueConfig] = None,
+        spectator_queue: Optional[SendQueueConfig] = None,
+        scheduler: Optional[DeadlineScheduler] = None,
+        table_id: str = "T-1",
+        metrics: Optional[HostMetrics] = None,
+        event_log_size: int = DEFAULT_EVENT_LOG_SIZE,
+        serializer: Optional[Serializer] = None,
+        hand_history: Optional[HandHistoryRecorder] = None,
+        checkpointer: Optional[Checkpointer] = None,
+        rate_limits: Optional[RateLimitConfig] = None,
     ) -> None:
         # GameEngine handles cards; this class handles sockets and pacing.
         self.engine = GameEngine(config)
-        self.table_id = "T-1"
+        self.table_id = table_id
+        # Builds every outgoing envelope; see core/serialization.py.
+        self.encoder = EnvelopeEncoder(serializer)
+        # The table config never changes, so welcome splices it in pre-encoded.
+        self._config_fragment = self.encoder.serializer.dumps(
+            {
+                "variant": config.variant,
+                "seats": config.seats,
+                "starting_stack": config.starting_stack,
+                "sb": config.sb,
+                "bb": config.bb,
+                "move_time_ms": config.move_time_ms,
+            }
+        )
+        # Optional engine-side timing, kept apart from network and bot time.
+        self.engine_stats = engine_stats
+        if engine_stats is not None:
+            engine_stats.attach(self.engine, self.table_id)
+        # Durable record of every hand, written off the event loop.
+        self.hand_history = hand_history
+        if hand_history is not None:
+            hand_history.attach(self.engine, self.table_id)
+        if checkpointer is not None:
+            checkpointer.attach(self.engine, self.table_id)
+        # Set by restore_checkpoint when a hand was replayed; its clock starts with the server.
+        self._resume_hand = False
+        # Inbound flood protection; checked by each connection's reader before the actor.
+        self.rate_limits = rate_limits or RateLimitConfig()
+        self.rate_limited: Dict[str, int] = {"player": 0, "spectator": 0}
+        self.rate_limit_closes: Dict[str, int] = {"player": 0, "spectator": 0}
         self.sessions: Dict[int, ClientSession] = {}
         self.pending_action: Optional[PendingAction] = None
-        self.lock = asyncio.Lock()
+        # Defaults to the process-wide scheduler once the event loop is running.
+        self._scheduler = scheduler
+        self.actor = TableActor(table_id)
         self.hand_control = hand_control
         self.manual_start_armed = False
         self.awaiting_manual_start = hand_control == "operator"
         self.spectators: Set[WebSocketServerProtocol] = set()
-        self.spectator_hands: Dict[str, SpectatorHandRecord] = {}
-        self.spectator_history: List[str] = []
-        self.spectator_history_limit = 20
+        # Spectators that asked for keyframe/delta frames in their hello.
+        self.delta_spectators: Set[WebSocketServerProtocol] = set()
+        # Spectators that take one spectator/events message per action.
+        self.batch_spectators: Set[WebSocketServerProtocol] = set()
+        self.spectator_history = SpectatorHistory(
+            max_hands=spectator_history_hands,
+            max_bytes=spectator_history_bytes,
+        )
+        # Live spectator state of the hand in progress, patched from its events.
+        self.spectator_view = SpectatorView(self.engine, table_id)
         self.active_hand_id: Optional[str] = None
+        # Outbound queues: bots must see every message, spectators can skip frames.
+        self.player_queue = player_queue or SendQueueConfig(max_messages=256, policy="disconnect")
+        self.spectator_queue = spectator_queue or SendQueueConfig(max_messages=64, policy="coalesce")
+        self.outboxes: Dict[WebSocketServerProtocol, Outbox] = {}
+        self.player_log = EventLog(f"{table_id}/players", event_log_size)
+        self.spectator_log = EventLog(f"{table_id}/spectators", event_log_size)
         self.latest_hand_id: Optional[str] = None
-
-    async def start(self, host: str = "0.0.0.0", port: int = 8765) -> None:
+        # Set by MultiTableHost so operators can see every table in the process.
+        self.hub: Optional["MultiTableHost"] = None
+        # Connection admission for this table's own listener (start(admission=...)).
+        self.admission: Optional[AdmissionGate] = None
+        self.view = self._build_view()
+        # perf_counter_ns when each seat's current act prompt was queued.
+        self._act_sent_ns: Dict[int, int] = {}
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.attach(self)
+
+    async def start(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        compression: Optional[CompressionConfig] = None,
+        admission: Optional[AdmissionConfig] = None,
+    ) -> None:
+        if self.metrics is None:
+            self.metrics = HostMetrics()
+            self.metrics.attach(self)
+        if admission is not None:
+            self.admission = AdmissionGate(admission, self._send_json)
+            self.metrics.attach_admission(self.admission)
         # websockets.serve keeps accepting clients until the process stops.
-        async with websockets.serve(self._handle_connection, host, port):
+        async with websockets.serve(
+            self._handle_connection,
+            host,
+            port,
+            process_request=http_handler(self.metrics),
+            **(compression or CompressionConfig()).serve_options(),
+        ):
             LOGGER.info("Host server listening on %s:%s", host, port)
+            self.resume_restored_hand()
             await asyncio.Future()
 
     async def _handle_connection(self, websocket: WebSocketServerProtocol) -> None:
         # First message must be "hello" so we know who we are talking to.
-        hello = await self._read_message(websocket)
+        gate = self.admission
+        if gate is None:
+            hello = await self._read_message(websocket)
+        else:
+            accepted, hello = await gate.handshake(websocket, self._read_message)
+            if not accepted:
+                return
         if hello is None or hello.get("type") != "hello":
             await self._send_error(websocket, code="BAD_HELLO", msg="Expected hello")
             await websocket.close()
             return
+        if gate is None:
+            await self.handle_client(websocket, hello)
+            return
+        if not await gate.admit(websocket, hello):
+            return
+        try:
+            await self.handle_client(websocket, hello)
+        finally:
+            gate.release(websocket)
+
+    async def handle_client(self, websocket: WebSocketServerProtocol, hello: Dict[str, object]) -> None:
+        """Serve a connection whose hello was already read (here or by a multi-table router)."""
         role_raw = hello.get("role") or "player"
         role = role_raw.strip().casefold() if isinstance(role_raw, str) else "player"
         if role in ("spectator", "operator"):
             can_control = role == "operator" or bool(hello.get("control"))
-            await self._handle_spectator_session(websocket, can_control=can_control)
+            delta_frames = hello.get("frames") == "delta"
+            await self._handle_spectator_session(
+                websocket,
+                can_control=can_control,
+                delta_frames=delta_frames,
+                resume=self._resume_point(hello),
+                batch_events=hello.get("events") == "batch",
+            )
             return
         team_raw = hello.get("team")
         if not isinstance(team_raw, str):
@@ -96,8 +255,7 @@ class HostServer:
             return
 
         try:
-            async with self.lock:
-                seat = self.engine.assign_seat(team)
+            seat = await self.actor.call(self._claim_seat, team)
         except ValueError as exc:
             code = str(exc)
             await self._send_error(websocket, code=code, msg="Seat claim rejected")
@@ -113,92 +271,153 @@ class HostServer:
         if previous:
             await previous.websocket.close(code=4000, reason="Replaced by new connection")
 
-        session = ClientSession(seat=seat.seat, team=seat.team, websocket=websocket)
+        session = ClientSession(
+            seat=seat.seat,
+            team=seat.team,
+            websocket=websocket,
+            batch_events=hello.get("events") == "batch",
+            compact=hello.get("encoding") == COMPACT_ENCODING,
+            bucket=self.rate_limits.bucket("player"),
+        )
+        await self.actor.call(self._register_player, session, self._resume_point(hello))
+        bucket = session.bucket
+        try:
+            async for raw in websocket:
+                if bucket is not None and not bucket.take():
+                    if await self._reject_flood(websocket, bucket, "player"):
+                        break
+                    continue
+                message = self._decode(raw)
+                if message.get("type") == "action":
+                    # Fire and forget: the actor applies actions in arrival order.
+                    self.actor.post(self._handle_action, session, message, time.perf_counter_ns())
+                else:
+                    await self._send_error(websocket, code="UNKNOWN_TYPE", msg="Unsupported message type")
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            await self.actor.call(self._unregister_player, session)
+
+    def restore_checkpoint(self, snapshot: Dict[str, object]) -> None:
+        """Rebuild the table from a checkpoint (``--resume``) before any client connects.
+
+        Teams get their seats back when their bots reconnect with the same name.
+        """
+        ctx = restore_engine(self.engine, snapshot)
+        if ctx is not None:
+            opening_stacks = {int(seat["seat"]): int(seat["stack"]) for seat in snapshot["seats"]}  # type: ignore[union-attr]
+            self._start_spectator_hand_locked(opening_stacks)
+            self._resume_hand = True
+        self._refresh_view()
+        LOGGER.info(
+            "Table %s restored from checkpoint: %s seats%s",
+            self.table_id,
+            len(snapshot["seats"]),  # type: ignore[arg-type]
+            f", hand {ctx.hand_id} in progress" if ctx is not None else "",
+        )
+
+    def resume_restored_hand(self) -> None:
+        """Prompt (or start the clock of) whoever is to act in a restored hand."""
+        if self._resume_hand:
+            self._resume_hand = False
+            self.actor.post(self._prompt_next_actor)
+
+    async def _claim_seat(self, team: str) -> PlayerSeat:
+        seat = self.engine.assign_seat(team)
+        self.spectator_view.touch(seat.seat)
+        return seat
+
+    def _resume_point(self, hello: Dict[str, object]) -> Optional[Tuple[int, Optional[str]]]:
+        seq = parse_resume(hello)
+        if seq is None:
+            return None
+        stream = hello.get("stream")
+        return seq, stream if isinstance(stream, str) else None
+
+    async def _register_player(
+        self,
+        session: ClientSession,
+        resume: Optional[Tuple[int, Optional[str]]] = None,
+    ) -> None:
+        websocket = session.websocket
+        seat = self.engine.seats[session.seat]
+        assert seat is not None
         self.sessions[seat.seat] = session
-        async with self.lock:
-            self.engine.set_connected(seat.seat, True)
+        self.outboxes[websocket] = Outbox(websocket, self.player_queue, f"seat {seat.seat} ({seat.team})")
+        self.engine.set_connected(seat.seat, True)
+        self.spectator_view.touch(seat.seat)
         LOGGER.info(
             "Seat %s claimed by %s (stack=%s)",
             seat.seat,
-            team,
+            seat.team,
             seat.stack,
         )
 
-        await self._send_json(websocket, "welcome", {
-            "table_id": self.table_id,
-            "seat": seat.seat,
-            "config": {
-                "variant": self.engine.config.variant,
-                "seats": self.engine.config.seats,
-                "starting_stack": self.engine.config.starting_stack,
-                "sb": self.engine.config.sb,
-                "bb": self.engine.config.bb,
-                "move_time_ms": self.engine.config.move_time_ms,
-            },
-        })
+        missed = self.player_log.since(*resume) if resume is not None else None
+        welcome: Dict[str, object] = {"table_id": self.table_id, "seat": seat.seat, **self.player_log.head()}
+        if resume is not None:
+            welcome["resume"] = "replay" if missed is not None else "snapshot"
+        if session.compact:
+            # Welcome itself stays text; everything after it is binary.
+            welcome["encoding"] = COMPACT_ENCODING
+        await self._send_raw(
+            websocket, self.encoder.encode("welcome", welcome, fragments={"config": self._config_fragment})
+        )
 
         await self._publish_lobby()
 
-        snapshot_payload: Optional[Dict[str, object]] = None
-        pending_act: Optional[Dict[str, object]] = None
-        start_needed = False
-        async with self.lock:
-            if self.engine.hand:
+        for entry in missed or ():
+            await self._deliver([websocket], self._logged(entry, session.compact))
+        if self.engine.hand:
+            if missed is None:
                 snapshot_payload = self.engine.snapshot_payload(seat.seat, self._time_remaining_ms())
-                if self.pending_action and self.pending_action.seat == seat.seat:
-                    pending_act = self.engine.act_payload(seat.seat)
-                    # Update remaining time on reconnect so the bot sees the correct clock.
-                    remaining = self._time_remaining_ms()
-                    try:
-                        pending_act["you"]["time_ms"] = remaining  # type: ignore[index]
-                    except Exception:
-                        pass
-            elif self.engine.can_start_hand():
-                start_needed = True
-
-        if snapshot_payload:
-            await self._send_json(websocket, "snapshot", snapshot_payload)
-        if pending_act:
-            await self._send_json(websocket, "act", pending_act)
-        if start_needed:
+                await self._send_player(session, "snapshot", snapshot_payload)
+            if self.engine.next_actor() == seat.seat:
+                pending_act = self.engine.act_payload(seat.seat)
+                # Update remaining time on reconnect so the bot sees the correct clock.
+                pending_act["you"]["time_ms"] = self._time_remaining_ms()  # type: ignore[index]
+                await self._send_player(session, "act", pending_act)
+                self._act_sent_ns[seat.seat] = time.perf_counter_ns()
+                if session.bucket is not None:
+                    session.bucket.credit()
+        elif self.engine.can_start_hand():
             await self._maybe_start_hand()
 
-        try:
-            async for raw in websocket:
-                message = self._decode(raw)
-                if message.get("type") == "action":
-                    await self._handle_action(session, message)
-                else:
-                    await self._send_error(websocket, code="UNKNOWN_TYPE", msg="Unsupported message type")
-        except websockets.ConnectionClosed:
-            pass
-        finally:
-            async with self.lock:
-                self.engine.set_connected(seat.seat, False)
-        self.sessions.pop(seat.seat, None)
-        LOGGER.info("Seat %s (%s) disconnected", seat.seat, team)
+    async def _unregister_player(self, session: ClientSession) -> None:
+        await self._close_outbox(session.websocket)
+        # A replaced connection must not disconnect the session that replaced it.
+        if self.sessions.get(session.seat) is not session:
+            return
+        self.engine.set_connected(session.seat, False)
+        self.spectator_view.touch(session.seat)
+        del self.sessions[session.seat]
+        LOGGER.info("Seat %s (%s) disconnected", session.seat, session.team)
         await self._publish_lobby()
 
-    async def _handle_spectator_session(self, websocket: WebSocketServerProtocol, *, can_control: bool) -> None:
+    async def _handle_spectator_session(
+        self,
+        websocket: WebSocketServerProtocol,
+        *,
+        can_control: bool,
+        delta_frames: bool = False,
+        resume: Optional[Tuple[int, Optional[str]]] = None,
+        batch_events: bool = False,
+    ) -> None:
         LOGGER.info("Spectator connected%s", " (control)" if can_control else "")
-        async with self.lock:
-            self.spectators.add(websocket)
-            lobby_payload = self._spectator_lobby_payload_locked()
-            snapshot_payload = self._latest_snapshot_locked()
-            status_payload = self._spectator_status_locked()
-        if lobby_payload is not None:
-            await self._send_json(websocket, "spectator/lobby", lobby_payload)
-        if snapshot_payload is not None:
-            await self._send_json(websocket, "spectator/snapshot", snapshot_payload)
-        if status_payload is not None:
-            await self._send_json(websocket, "spectator/status", status_payload)
+        await self.actor.call(self._register_spectator, websocket, can_control, delta_frames, resume, batch_events)
+        # Read-only spectators are closed on their first message; only control needs a limit.
+        bucket = self.rate_limits.bucket("spectator") if can_control else None
         try:
             async for raw in websocket:
+                if bucket is not None and not bucket.take():
+                    if await self._reject_flood(websocket, bucket, "spectator"):
+                        break
+                    continue
                 message = self._decode(raw)
                 if not message:
                     continue
                 if can_control and message.get("type") == "control":
-                    await self._handle_control_command(message, websocket)
+                    await self.actor.call(self._handle_control_command, message, websocket)
                     continue
                 LOGGER.warning("Spectator sent unsupported message; closing connection")
                 await websocket.close(code=4403, reason="Spectators are read-only")
@@ -206,40 +425,96 @@ class HostServer:
         except websockets.ConnectionClosed:
             pass
         finally:
-            async with self.lock:
-                self.spectators.discard(websocket)
+            await self.actor.call(self._unregister_spectator, websocket)
             LOGGER.info("Spectator disconnected")
 
+    async def _reject_flood(self, websocket: WebSocketServerProtocol, bucket: TokenBucket, role: str) -> bool:
+        """Account for a message over the rate limit; True once the connection was closed for it."""
+        self.rate_limited[role] += 1
+        close_after = self.rate_limits.close_after
+        if close_after and bucket.streak >= close_after:
+            self.rate_limit_closes[role] += 1
+            LOGGER.warning(
+                "Closing %s connection on %s: %s messages in a row over its rate limit",
+                role,
+                self.table_id,
+                bucket.streak,
+            )
+            await websocket.close(code=RATE_LIMIT_CLOSE_CODE, reason="Rate limit exceeded")
+            return True
+        if bucket.streak == 1:
+            await self._send_error(websocket, code="RATE_LIMITED", msg="Too many messages; excess is dropped")
+        return False
+
+    async def _register_spectator(
+        self,
+        websocket: WebSocketServerProtocol,
+        can_control: bool,
+        delta_frames: bool,
+        resume: Optional[Tuple[int, Optional[str]]] = None,
+        batch_events: bool = False,
+    ) -> None:
+        role = "operator" if can_control else "spectator"
+        peer = getattr(websocket, "remote_address", None) or id(websocket)
+        self.outboxes[websocket] = Outbox(websocket, self.spectator_queue, f"{role} {peer}", kind="spectator")
+        self.spectators.add(websocket)
+        if delta_frames:
+            self.delta_spectators.add(websocket)
+        if batch_events:
+            self.batch_spectators.add(websocket)
+        self._refresh_view()
+        missed = self.spectator_log.since(*resume) if resume is not None else None
+        lobby = {**self._spectator_lobby_payload_locked(), **self.spectator_log.head()}
+        if resume is not None:
+            lobby["resume"] = "replay" if missed is not None else "snapshot"
+        await self._send_json(websocket, "spectator/lobby", lobby)
+        if missed is None:
+            snapshot_payload = self._latest_snapshot_locked(delta_frames=delta_frames)
+            if snapshot_payload is not None:
+                await self._send_json(websocket, "spectator/snapshot", snapshot_payload)
+        else:
+            for entry in missed:
+                await self._deliver(
+                    [websocket],
+                    entry.message(self._envelope),
+                    frame=entry.msg_type in SPECTATOR_FRAME_TYPES,
+                )
+        await self._send_json(websocket, "spectator/status", self._spectator_status_locked())
+
+    async def _unregister_spectator(self, websocket: WebSocketServerProtocol) -> None:
+        self.spectators.discard(websocket)
+        self.delta_spectators.discard(websocket)
+        self.batch_spectators.discard(websocket)
+        self._refresh_view()
+        await self._close_outbox(websocket)
+
     async def _maybe_start_hand(self) -> None:
-        async with self.lock:
-            if self.engine.hand or not self.engine.can_start_hand():
-                return
-            if self._manual_mode() and not self.manual_start_armed:
-                return
-            ctx = self.engine.start_hand()
-            start_payload = self.engine.start_hand_payload(ctx)
-            pre_events = self.engine.consume_pre_events()
-            opening_stacks = {entry["seat"]: entry["stack"] for entry in start_payload["stacks"]}
-            spectator_state = self._start_spectator_hand_locked(opening_stacks)
-            if self._manual_mode():
-                self.manual_start_armed = False
-                self.awaiting_manual_start = False
+        if self.engine.hand or not self.engine.can_start_hand():
+            return
+        if self._manual_mode() and not self.manual_start_armed:
+            return
+        ctx = self.engine.start_hand()
+        start_payload = self.engine.start_hand_payload(ctx)
+        pre_events = self.engine.consume_pre_events()
+        opening_stacks = {entry["seat"]: entry["stack"] for entry in start_payload["stacks"]}
+        spectator_state = self._start_spectator_hand_locked(opening_stacks)
+        if self._manual_mode():
+            self.manual_start_armed = False
+            self.awaiting_manual_start = False
 
         await self._broadcast("start_hand", start_payload)
         if spectator_state:
             await self._broadcast_spectator("spectator/start_hand", {"state": spectator_state})
-        await self._broadcast_events(pre_events)
-        await self._prompt_next_actor()
+        await self._broadcast_and_prompt(pre_events)
         await self._publish_status()
 
     async def _prompt_next_actor(self) -> None:
         hand_ready_to_finish = False
-        async with self.lock:
-            next_seat = self.engine.next_actor()
-            if next_seat is None:
-                hand_ready_to_finish = self.engine.is_hand_complete()
-            else:
-                payload = self.engine.act_payload(next_seat)
+        next_seat = self.engine.next_actor()
+        if next_seat is None:
+            hand_ready_to_finish = self.engine.is_hand_complete()
+        else:
+            payload = self.engine.act_payload(next_seat)
 
         if next_seat is None:
             if hand_ready_to_finish:
@@ -249,58 +524,91 @@ class HostServer:
         session = self.sessions.get(next_seat)
         if not session:
             LOGGER.info(
-                "Seat %s is disconnected; waiting for reconnection or operator input",
+                "Seat %s is disconnected; waiting for reconnection, timeout or operator input",
                 next_seat,
             )
-            self._set_pending_action(next_seat)
+            await self._schedule_timer(next_seat)
             await self._publish_status()
             return
         if self.engine.hand and self.engine.hand.phase == self.engine.hand.phase.SHOWDOWN:
             await self._maybe_finish_hand()
             return
-        await self._send_json(session.websocket, "act", payload)
-        self._set_pending_action(next_seat)
+        await self._send_act(session, payload)
+
+    def _prompt_session(self) -> Optional[ClientSession]:
+        """The connected bot ``_prompt_next_actor`` would send ``act`` to right now, if any."""
+        seat = self.engine.next_actor()
+        if seat is None:
+            return None
+        hand = self.engine.hand
+        if hand and hand.phase == hand.phase.SHOWDOWN:
+            return None
+        return self.sessions.get(seat)
+
+    async def _send_act(self, session: ClientSession, payload: Optional[Dict[str, object]] = None) -> None:
+        if payload is None:
+            payload = self.engine.act_payload(session.seat)
+        await self._send_player(session, "act", payload)
+        self._act_sent_ns[session.seat] = time.perf_counter_ns()
+        # The answer to a prompt never counts against the bot's rate limit.
+        if session.bucket is not None:
+            session.bucket.credit()
+        await self._schedule_timer(session.seat)
+
+    async def _broadcast_and_prompt(self, events: List[Dict[str, object]]) -> None:
+        """Broadcast the events from one engine call and prompt whoever acts next."""
+        session = self._prompt_session() if events else None
+        if session is None:
+            await self._broadcast_events(events)
+            await self._prompt_next_actor()
+            return
+        await self._broadcast_events(events, actor=session)
 
-    async def _handle_action(self, session: ClientSession, message: Dict[str, object]) -> None:
+    async def _handle_action(
+        self,
+        session: ClientSession,
+        message: Dict[str, object],
+        received_ns: Optional[int] = None,
+    ) -> None:
         hand_id = message.get("hand_id")
         action_name = message.get("action")
         amount = message.get("amount")
 
-        async with self.lock:
-            if not self.engine.hand or hand_id != self.engine.hand.hand_id:
-                await self._send_error(session.websocket, code="ACTION_TOO_LATE", msg="Hand no longer active")
-                return
-            if not self.pending_action or self.pending_action.seat != session.seat:
-                await self._send_error(session.websocket, code="OUT_OF_TURN", msg="Not your turn")
-                return
+        if not self.engine.hand or hand_id != self.engine.hand.hand_id:
+            await self._send_error(session.websocket, code="ACTION_TOO_LATE", msg="Hand no longer active")
+            return
+        pending = self.pending_action
+        if self.engine.next_actor() != session.seat or (pending and pending.seat != session.seat):
+            await self._send_error(session.websocket, code="OUT_OF_TURN", msg="Not your turn")
+            return
 
-            try:
-                action = ActionType(action_name)
-            except Exception:
-                await self._send_error(session.websocket, code="INVALID_ACTION", msg="Unknown action")
-                return
+        try:
+            action = ActionType(action_name)
+        except Exception:
+            await self._send_error(session.websocket, code="INVALID_ACTION", msg="Unknown action")
+            return
 
-            if action == ActionType.RAISE_TO and not isinstance(amount, int):
-                await self._send_error(session.websocket, code="BAD_SCHEMA", msg="amount required for raise")
-                return
+        if action == ActionType.RAISE_TO and not isinstance(amount, int):
+            await self._send_error(session.websocket, code="BAD_SCHEMA", msg="amount required for raise")
+            return
 
-            if self.pending_action:
-                if self.pending_action.timer_task:
-                    self.pending_action.timer_task.cancel()
-                self.pending_action = None
-
-            try:
-                events = self.engine.apply_action(session.seat, action, amount)
-            except ValueError as exc:
-                LOGGER.warning(
-                    "Rejected action seat=%s action=%s amount=%s reason=%s",
-                    session.seat,
-                    action,
-                    amount,
-                    exc,
-                )
-                await self._send_error(session.websocket, code="INVALID_ACTION", msg=str(exc))
-                return
+        try:
+            events = self.engine.apply_action(session.seat, action, amount)
+        except ValueError as exc:
+            LOGGER.warning(
+                "Rejected action seat=%s action=%s amount=%s reason=%s",
+                session.seat,
+                action,
+                amount,
+                exc,
+            )
+            await self._send_error(session.websocket, code="INVALID_ACTION", msg=str(exc))
+            return
+        # Rejected actions leave the clock running; only an applied one stops it.
+        self._clear_pending_action_locked()
+        sent_ns = self._act_sent_ns.pop(session.seat, None)
+        if self.metrics is not None and sent_ns is not None and received_ns is not None:
+            self.metrics.act_rtt.observe_ns(received_ns - sent_ns, table=self.table_id, seat=session.seat)
 
         LOGGER.debug(
             "Applied action hand=%s seat=%s action=%s amount=%s",
@@ -310,8 +618,7 @@ class HostServer:
             amount,
         )
 
-        await self._broadcast_events(events)
-        await self._prompt_next_actor()
+        await self._broadcast_and_prompt(events)
 
     async def _maybe_finish_hand(self) -> None:
         if not self.engine.is_hand_complete():
@@ -328,36 +635,76 @@ class HostServer:
         match_over = self.engine.is_match_over()
         if match_over:
             await self._broadcast("match_end", self.engine.match_result_payload())
-        async with self.lock:
-            self.engine.hand = None
-            self.active_hand_id = None
-            if self._manual_mode():
-                if match_over:
-                    self.awaiting_manual_start = False
-                    self.manual_start_armed = False
-                else:
-                    self.awaiting_manual_start = True
-                    self.manual_start_armed = False
+        self.engine.hand = None
+        self.active_hand_id = None
+        if self._manual_mode():
+            if match_over:
+                self.awaiting_manual_start = False
+                self.manual_start_armed = False
+            else:
+                self.awaiting_manual_start = True
+                self.manual_start_armed = False
         await self._publish_status()
         if match_over:
             LOGGER.info("Match over: %s", self.engine.match_result_payload().get("winner"))
+            if self.engine_stats is not None:
+                LOGGER.info("Engine stats: %s", self.engine_stats.summary_line(self.table_id))
             return
 
         await self._maybe_start_hand()
 
-    def _set_pending_action(self, seat_idx: int) -> None:
-        self.pending_action = PendingAction(seat=seat_idx, deadline=time.monotonic(), timer_task=None)
+    async def _schedule_timer(self, seat_idx: int) -> None:
+        """Start the move clock for ``seat_idx``; a no-op when clocks are disabled."""
+        if self.engine.config.move_time_ms <= 0:
+            return
+        self._clear_pending_action_locked()
+        if self.engine.next_actor() != seat_idx:
+            return
+        deadline = time.monotonic() + self.engine.config.move_time_ms / 1000
+        pending = PendingAction(seat=seat_idx, deadline=deadline)
+        pending.timer_task = self._deadlines().schedule(
+            deadline,
+            lambda now: self.actor.post(self._timer_expired, seat_idx, now, pending),
+        )
+        self.pending_action = pending
+
+    def _clear_pending_action_locked(self) -> None:
+        pending = self.pending_action
+        if pending is not None:
+            if pending.timer_task:
+                pending.timer_task.cancel()
+            self.pending_action = None
+
+    def _deadlines(self) -> DeadlineScheduler:
+        if self._scheduler is None:
+            self._scheduler = process_scheduler()
+        return self._scheduler
+
+    async def _timer_expired(self, seat_idx: int, now: float, expected: Optional[PendingAction] = None) -> None:
+        pending = self.pending_action
+        # The bot may have acted (and even been prompted again) while this
+        # expiry sat in the actor's mailbox.
+        if pending is None or pending.seat != seat_idx or self.engine.next_actor() != seat_idx:
+            return
+        if expected is not None and pending is not expected:
+            return
+        self.pending_action = None
+        events = self._apply_fallback_locked(seat_idx)
+        late_ms = max(0.0, now - pending.deadline) * 1000
+        LOGGER.info("Seat %s timed out (fired %.0f ms after deadline); fallback applied", seat_idx, late_ms)
+        await self._broadcast("admin", {"event": "TIMEOUT", "seat": seat_idx})
+        await self._broadcast_and_prompt(events)
 
     def _apply_fallback_locked(self, seat_idx: int) -> list[dict[str, object]]:
         action, amount = self._fallback_decision_locked(seat_idx)
         return self.engine.apply_action(seat_idx, action, amount)
 
     def _fallback_decision_locked(self, seat_idx: int) -> tuple[ActionType, Optional[int]]:
-        legal, call_amount, _, _ = self.engine.legal_actions(seat_idx)
+        window = self.engine.action_window(seat_idx)
         # Matches the documented timeout preference: check > call > fold.
-        if ActionType.CHECK in legal:
+        if window.allows(ActionType.CHECK):
             return ActionType.CHECK, None
-        if ActionType.CALL in legal:
+        if window.allows(ActionType.CALL):
             return ActionType.CALL, None
         return ActionType.FOLD, None
 
@@ -366,38 +713,136 @@ class HostServer:
         msg_type: str,
         payload: Dict[str, object],
     ) -> None:
-        async with self.lock:
-            targets = [session.websocket for session in self.sessions.values()]
-        if not targets:
+        text, packed = self._player_targets()
+        logged = msg_type in PLAYER_LOG_TYPES
+        if not text and not packed and not logged:
             return
-        message = self._envelope(msg_type, payload)
-        await asyncio.gather(*(socket.send(message) for socket in targets), return_exceptions=True)
+        started = time.perf_counter_ns()
+        if logged:
+            # Logged even with nobody connected: reconnecting bots replay it.
+            entry = self.player_log.record(msg_type, payload)
+            if text:
+                await self._deliver(text, entry.message(self._envelope))
+            if packed:
+                await self._deliver(packed, entry.packed(self._pack))
+        else:
+            if text:
+                await self._deliver(text, self._envelope(msg_type, payload))
+            if packed:
+                await self._deliver(packed, self._pack(msg_type, payload))
+        if self.metrics is not None:
+            self.metrics.broadcast.observe_ns(time.perf_counter_ns() - started, table=self.table_id, audience="players")
+
+    def _player_targets(self) -> Tuple[List[WebSocketServerProtocol], List[WebSocketServerProtocol]]:
+        """Connected bots split into JSON and compact receivers."""
+        text: List[WebSocketServerProtocol] = []
+        packed: List[WebSocketServerProtocol] = []
+        for session in self.sessions.values():
+            (packed if session.compact else text).append(session.websocket)
+        return text, packed
+
+    async def _deliver(
+        self,
+        targets: List[WebSocketServerProtocol],
+        message: Message,
+        *,
+        frame: bool = False,
+        self_contained: bool = True,
+    ) -> None:
+        # Queued connections never block the caller; sockets without an
+        # outbox (not yet registered) are written directly.
+        direct = []
+        for socket in targets:
+            outbox = self.outboxes.get(socket)
+            if outbox is None:
+                direct.append(socket)
+            else:
+                outbox.put(message, frame=frame, self_contained=self_contained)
+        if direct:
+            await asyncio.gather(*(socket.send(message) for socket in direct), return_exceptions=True)
+
+    async def _close_outbox(self, websocket: WebSocketServerProtocol) -> None:
+        outbox = self.outboxes.pop(websocket, None)
+        if outbox is not None:
+            await outbox.close()
+            if self.metrics is not None:
+                self.metrics.retire_outbox(self.table_id, outbox)
+
+    def queue_stats(self) -> List[Dict[str, object]]:
+        """Per-connection send queue depth; the deepest (furthest behind) first."""
+        stats = [outbox.stats() for outbox in self.outboxes.values()]
+        return sorted(stats, key=lambda entry: (-int(entry["depth"]), str(entry["client"])))
+
+    async def _broadcast_events(
+        self,
+        events: List[Dict[str, object]],
+        actor: Optional[ClientSession] = None,
+    ) -> None:
+        """Send the events from one engine call: one message each, or one batch for clients that asked.
 
-    async def _broadcast_events(self, events):
-        for event in events:
-            await self._broadcast("event", event)
-            await self._publish_spectator_event(event)
+        With ``actor``, that bot is served first: its events and then its
+        ``act`` prompt are queued, and its writer gets to send them, before the
+        rest of the fan-out to bots and spectators is encoded and queued.
+        """
+        if not events:
+            return
+        started = time.perf_counter_ns()
+        # (batch_events, compact) -> sockets
+        groups: Dict[Tuple[bool, bool], List[WebSocketServerProtocol]] = {}
+        for session in self.sessions.values():
+            if session is not actor:
+                groups.setdefault((session.batch_events, session.compact), []).append(session.websocket)
+        # Every event enters the log; it is only encoded once someone needs it.
+        entries = [self.player_log.record("event", event) for event in events]
+        batches: Dict[bool, Message] = {}
+        if actor is not None:
+            await self._deliver_events([actor.websocket], events, entries, actor.batch_events, actor.compact, batches)
+            await self._send_act(actor)
+            # Yield once so the actor's writer hands both to its socket now.
+            await asyncio.sleep(0)
+        for (batched, compact), targets in groups.items():
+            await self._deliver_events(targets, events, entries, batched, compact, batches)
+        if self.metrics is not None and (groups or actor is not None):
+            self.metrics.broadcast.observe_ns(time.perf_counter_ns() - started, table=self.table_id, audience="players")
+        await self._publish_spectator_events(events)
+
+    async def _deliver_events(
+        self,
+        targets: List[WebSocketServerProtocol],
+        events: List[Dict[str, object]],
+        entries: List[LoggedMessage],
+        batched: bool,
+        compact: bool,
+        batches: Dict[bool, Message],
+    ) -> None:
+        if batched:
+            # One batch per encoding (keyed by ``compact``), shared by every receiver.
+            message = batches.get(compact)
+            if message is None:
+                encode = self._pack if compact else self._envelope
+                message = batches[compact] = encode("events", {"events": events}, entries[-1].seq)
+            await self._deliver(targets, message)
+        else:
+            for entry in entries:
+                await self._deliver(targets, self._logged(entry, compact))
 
     async def _handle_skip_request(self) -> None:
-        async with self.lock:
-            if not self.engine.hand:
-                return
-            seat_idx = self.engine.next_actor()
-            if seat_idx is None:
-                return
-            if self.pending_action and self.pending_action.seat == seat_idx:
-                self.pending_action = None
-            events = self._apply_fallback_locked(seat_idx)
+        if not self.engine.hand:
+            return
+        seat_idx = self.engine.next_actor()
+        if seat_idx is None:
+            return
+        self._clear_pending_action_locked()
+        events = self._apply_fallback_locked(seat_idx)
         LOGGER.info("Manual skip applied to seat %s", seat_idx)
         await self._broadcast("admin", {"event": "SKIP", "seat": seat_idx})
-        await self._broadcast_events(events)
-        await self._prompt_next_actor()
+        await self._broadcast_and_prompt(events)
 
     async def _publish_lobby(self) -> None:
-        async with self.lock:
-            lobby_state = self.engine.lobby_state()
-            spectator_payload = self._format_spectator_lobby(lobby_state)
-            status_payload = self._spectator_status_locked()
+        self._refresh_view()
+        lobby_state = self.engine.lobby_state()
+        spectator_payload = self._format_spectator_lobby(lobby_state)
+        status_payload = self._spectator_status_locked()
         await self._broadcast("lobby", lobby_state)
         await self._broadcast_spectator("spectator/lobby", spectator_payload)
         await self._broadcast_spectator("spectator/status", status_payload)
@@ -437,9 +882,26 @@ class HostServer:
             "total_seats": self.engine.config.seats,
         }
 
+    def table_summary(self) -> Dict[str, object]:
+        # Safe from any task: the view is replaced, never mutated.
+        return self.view.as_dict()
+
+    def _build_view(self) -> TableView:
+        return TableView(
+            table_id=self.table_id,
+            seated=sum(1 for seat in self.engine.seats if seat is not None),
+            seats=self.engine.config.seats,
+            in_hand=self.engine.hand is not None,
+            connected=len(self.sessions),
+            spectators=len(self.spectators),
+        )
+
+    def _refresh_view(self) -> None:
+        self.view = self._build_view()
+
     async def _publish_status(self) -> None:
-        async with self.lock:
-            payload = self._spectator_status_locked()
+        self._refresh_view()
+        payload = self._spectator_status_locked()
         await self._broadcast_spectator("spectator/status", payload)
 
     async def _handle_control_command(self, message: Dict[str, object], websocket: WebSocketServerProtocol) -> None:
@@ -454,6 +916,25 @@ class HostServer:
         elif command == "SKIP_ACTION":
             await self._handle_skip_request()
             await self._send_json(websocket, "control/ack", {"command": command, "status": "applied"})
+        elif command == "QUEUE_STATS":
+            # scope=host widens the answer to every table in this process.
+            if message.get("scope") == "host" and self.hub is not None:
+                queues = self.hub.queue_stats()
+            else:
+                queues = self.queue_stats()
+            await self._send_json(
+                websocket,
+                "control/ack",
+                {
+                    "command": command,
+                    "queues": queues,
+                    "actor": self.actor.stats(),
+                    "event_logs": {"players": self.player_log.stats(), "spectators": self.spectator_log.stats()},
+                },
+            )
+        elif command == "LIST_TABLES":
+            tables = self.hub.tables_summary() if self.hub is not None else [self.table_summary()]
+            await self._send_json(websocket, "control/ack", {"command": command, "tables": tables})
         elif command == "REQUEST_STATUS":
             await self._publish_status()
             await self._send_json(websocket, "control/ack", {"command": command, "status": "sent"})
@@ -461,86 +942,113 @@ class HostServer:
             await self._send_json(websocket, "control/error", {"command": command, "error": "UNKNOWN_COMMAND"})
 
     async def _command_start_hand(self) -> str:
-        async with self.lock:
-            if self.engine.hand:
-                return "hand_in_progress"
-            if self._manual_mode():
-                self.manual_start_armed = True
-                self.awaiting_manual_start = False
-            ready_now = self.engine.can_start_hand()
+        if self.engine.hand:
+            return "hand_in_progress"
+        if self._manual_mode():
+            self.manual_start_armed = True
+            self.awaiting_manual_start = False
+        ready_now = self.engine.can_start_hand()
         await self._publish_status()
         await self._maybe_start_hand()
-        async with self.lock:
-            if self.engine.hand:
-                return "started"
-            if not ready_now:
-                return "waiting_for_players"
-            if self._manual_mode() and self.manual_start_armed:
-                return "queued"
+        if self.engine.hand:
+            return "started"
+        if not ready_now:
+            return "waiting_for_players"
+        if self._manual_mode() and self.manual_start_armed:
+            return "queued"
         return "pending"
 
     async def _command_forfeit_seat(self, seat_idx: int) -> str:
-        close_session: Optional[ClientSession] = None
-        async with self.lock:
-            if seat_idx < 0 or seat_idx >= len(self.engine.seats):
-                return "invalid_seat"
-            player = self.engine.seats[seat_idx]
-            if player is None:
-                return "seat_empty"
-            if self.engine.hand:
-                return "hand_in_progress"
-            player.stack = 0
-            player.connected = False
-            player.has_folded = True
-            player.hole_cards.clear()
-            close_session = self.sessions.pop(seat_idx, None)
+        if seat_idx < 0 or seat_idx >= len(self.engine.seats):
+            return "invalid_seat"
+        player = self.engine.seats[seat_idx]
+        if player is None:
+            return "seat_empty"
+        if self.engine.hand:
+            return "hand_in_progress"
+        player.stack = 0
+        player.connected = False
+        player.has_folded = True
+        player.hole_cards.clear()
+        close_session = self.sessions.pop(seat_idx, None)
         if close_session:
-            try:
-                await close_session.websocket.close(code=4401, reason="Seat forfeited by operator")
-            except Exception:
-                pass
+            # Closing waits for the peer; never hold up the actor for it.
+            asyncio.get_running_loop().create_task(
+                close_session.websocket.close(code=4401, reason="Seat forfeited by operator")
+            )
         await self._publish_lobby()
         await self._publish_status()
         return "removed"
 
-    def _latest_snapshot_locked(self) -> Optional[Dict[str, object]]:
-        if not self.latest_hand_id:
-            return None
-        record = self.spectator_hands.get(self.latest_hand_id)
+    def _latest_snapshot_locked(self, delta_frames: bool = False) -> Optional[Dict[str, object]]:
+        record = self.spectator_history.get(self.latest_hand_id)
         if not record or not record.frames:
             return None
-        payload: Dict[str, object] = {
-            "hand_id": record.hand_id,
-            "frames": list(record.frames),
-        }
-        if record.results:
-            payload["results"] = record.results
-        return payload
+        return self.spectator_history.catchup_payload(record, delta_frames)
 
-    async def _broadcast_spectator(self, msg_type: str, payload: Dict[str, object]) -> None:
-        async with self.lock:
-            targets = list(self.spectators)
-        if not targets:
-            return
-        message = self._envelope(msg_type, payload)
-        await asyncio.gather(*(socket.send(message) for socket in targets), return_exceptions=True)
+    async def _broadcast_spectator(
+        self,
+        msg_type: str,
+        payload: Dict[str, object],
+        *,
+        delta_payload: Optional[Dict[str, object]] = None,
+        targets: Optional[Set[WebSocketServerProtocol]] = None,
+        log_seq: Optional[int] = None,
+    ) -> None:
+        # ``delta_payload`` goes to spectators that negotiated delta frames;
+        # everyone else gets the full-state ``payload``. ``targets`` narrows
+        # the audience (per-event vs batch clients).
+        spectators = self.spectators if targets is None else targets
+        if delta_payload is None:
+            full_targets = list(spectators)
+            delta_targets = []
+        else:
+            full_targets, delta_targets = [], []
+            for socket in spectators:
+                outbox = self.outboxes.get(socket)
+                # A delta client that skipped frames resyncs from a full state.
+                if socket in self.delta_spectators and not (outbox and outbox.needs_keyframe):
+                    delta_targets.append(socket)
+                else:
+                    full_targets.append(socket)
+        frame = msg_type in SPECTATOR_FRAME_TYPES
+        started = time.perf_counter_ns()
+        if msg_type in SPECTATOR_LOG_TYPES:
+            # The log keeps the full-state form; delta clients resume from it too.
+            entry = self.spectator_log.record(msg_type, payload)
+            log_seq = entry.seq
+            if full_targets:
+                await self._deliver(full_targets, entry.message(self._envelope), frame=frame)
+        elif full_targets:
+            await self._deliver(full_targets, self._envelope(msg_type, payload, log_seq=log_seq), frame=frame)
+        if delta_targets:
+            assert delta_payload is not None
+            await self._deliver(
+                delta_targets,
+                self._envelope(msg_type, delta_payload, log_seq=log_seq),
+                frame=frame,
+                self_contained="delta" not in delta_payload,
+            )
+        if self.metrics is not None and (full_targets or delta_targets):
+            self.metrics.broadcast.observe_ns(
+                time.perf_counter_ns() - started, table=self.table_id, audience="spectators"
+            )
 
     def _start_spectator_hand_locked(self, opening_stacks: Dict[int, int]) -> Optional[Dict[str, object]]:
-        state = self._spectator_state_locked()
+        state = self.spectator_view.start_hand(opening_stacks, self._time_remaining_ms())
         if not state:
             return None
         hand_id = state["hand_id"]
         record = SpectatorHandRecord(hand_id=hand_id, opening_stacks=dict(opening_stacks))
-        self.spectator_hands[hand_id] = record
-        self.spectator_history.append(hand_id)
+        self.spectator_history.add(record)
         self.active_hand_id = hand_id
         self.latest_hand_id = hand_id
-        self._trim_spectator_history_locked()
         self._append_spectator_frame_locked(record, state, label="Hand start")
         return state
 
-    def _spectator_state_locked(self) -> Optional[Dict[str, object]]:
-        return self.engine.spectator_state(self.table_id, self._time_remaining_ms())
+    def _spectator_state_locked(self, events: Sequence[Dict[str, object]] = ()) -> Optional[Dict[str, object]]:
+        """Current spectator state after ``events``; a cheap patch of the previous one."""
+        return self.spectator_view.update(events, self._time_remaining_ms())
 
     def _append_spectator_frame_locked(
         self,
@@ -549,10 +1057,21 @@ class HostServer:
         *,
         event: Optional[Dict[str, object]] = None,
         label: Optional[str] = None,
-    ) -> Optional[Dict[str, object]]:
-        ts = self._now_ts()
-        frame: Dict[str, object] = {"ts": ts, "state": state}
-        event_payload: Optional[Dict[str, object]] = None
+    ) -> Dict[str, object]:
+        frame: Dict[str, object] = {"ts": self._now_ts(), "seq": len(record.frames)}
+        delta = None
+        if record.last_state is not None and record.since_keyframe < KEYFRAME_INTERVAL - 1:
+            if state is self.spectator_view.state:
+                delta = self.spectator_view.delta_from(record.last_state)
+            else:
+                delta = diff_state(record.last_state, state)
+        if delta is None:
+            frame["state"] = state
+            record.since_keyframe = 0
+        else:
+            frame["delta"] = delta
+            record.since_keyframe += 1
+        record.last_state = state
         if event is not None:
             event_payload = dict(event)
             if "id" not in event_payload:
@@ -561,52 +1080,66 @@ class HostServer:
             frame["event"] = event_payload
         if label:
             frame["label"] = label
-        record.frames.append(frame)
-        return event_payload
-
-    def _trim_spectator_history_locked(self) -> None:
-        while len(self.spectator_history) > self.spectator_history_limit:
-            old_id = self.spectator_history.pop(0)
-            if old_id == self.active_hand_id or old_id == self.latest_hand_id:
-                self.spectator_history.insert(0, old_id)
-                break
-            self.spectator_hands.pop(old_id, None)
+        self.spectator_history.append_frame(record, frame)
+        return frame
 
     def _active_record_locked(self) -> Optional[SpectatorHandRecord]:
-        if not self.active_hand_id:
-            return None
-        return self.spectator_hands.get(self.active_hand_id)
+        return self.spectator_history.get(self.active_hand_id)
 
-    async def _publish_spectator_event(self, event: Dict[str, object]) -> None:
-        async with self.lock:
-            record = self._active_record_locked()
-            if not record:
-                return
-            state = self._spectator_state_locked()
-            if not state:
-                return
-            event_payload = self._append_spectator_frame_locked(record, state, event=event)
-            hand_id = record.hand_id
-        if not event_payload:
+    async def _publish_spectator_events(self, events: List[Dict[str, object]]) -> None:
+        record = self._active_record_locked()
+        if not record:
+            return
+        # The engine does not move between events of one call, so they all
+        # share the state it ended in.
+        state = self._spectator_state_locked(events)
+        if not state:
+            return
+        frames = [self._append_spectator_frame_locked(record, state, event=event) for event in events]
+        hand_id = record.hand_id
+        batched = self.batch_spectators
+        single = self.spectators - batched if batched else self.spectators
+        for frame in frames:
+            delta_payload: Dict[str, object] = {"hand_id": hand_id, "event": frame["event"], "seq": frame["seq"]}
+            if "delta" in frame:
+                delta_payload["delta"] = frame["delta"]
+            else:
+                delta_payload["state"] = state
+            await self._broadcast_spectator(
+                "spectator/event",
+                {"hand_id": hand_id, "event": frame["event"], "state": state},
+                delta_payload=delta_payload,
+                targets=single,
+            )
+        if not batched:
             return
+        # The first frame's patch already lands on the final state; the rest are empty.
+        batch_events = [frame["event"] for frame in frames]
+        batch_delta: Dict[str, object] = {"hand_id": hand_id, "events": batch_events, "seq": frames[-1]["seq"]}
+        if "delta" in frames[0]:
+            batch_delta["delta"] = frames[0]["delta"]
+        else:
+            batch_delta["state"] = state
         await self._broadcast_spectator(
-            "spectator/event",
-            {"hand_id": hand_id, "event": event_payload, "state": state},
+            "spectator/events",
+            {"hand_id": hand_id, "events": batch_events, "state": state},
+            delta_payload=batch_delta,
+            targets=batched,
+            log_seq=self.spectator_log.last_seq,
         )
 
     async def _publish_spectator_hand_end(self, end_payload: Dict[str, object]) -> None:
-        async with self.lock:
-            record = self._active_record_locked()
-            state = self._spectator_state_locked() if self.engine.hand else None
-            if record and state:
-                self._append_spectator_frame_locked(record, state, label="Hand complete")
-            elif not state:
-                state = self._fallback_state_from_payload_locked(end_payload)
-            results = None
-            if record:
-                results = self._build_results_locked(record, end_payload)
-                record.results = results
-            hand_id = end_payload["hand_id"]
+        record = self._active_record_locked()
+        state = self._spectator_state_locked() if self.engine.hand else None
+        if record and state:
+            self._append_spectator_frame_locked(record, state, label="Hand complete")
+        elif not state:
+            state = self._fallback_state_from_payload_locked(end_payload)
+        results = None
+        if record:
+            results = self._build_results_locked(end_payload)
+            record.results = results
+        hand_id = end_payload["hand_id"]
         payload: Dict[str, object] = {
             "hand_id": hand_id,
             "state": state,
@@ -614,34 +1147,9 @@ class HostServer:
         }
         await self._broadcast_spectator("spectator/end_hand", payload)
 
-    def _build_results_locked(
-        self,
-        record: SpectatorHandRecord,
-        end_payload: Dict[str, object],
-    ) -> List[Dict[str, object]]:
-        final_lookup = {entry["seat"]: entry["stack"] for entry in end_payload.get("stacks", [])}
-        results: List[Dict[str, object]] = []
-        for seat, stack in final_lookup.items():
-            opening = record.opening_stacks.get(seat)
-            result = {"seat": seat, "stack": stack}
-            if opening is not None:
-                result["amount"] = stack - opening
-            results.append(result)
-        self._attach_showdown_ranks(record, results)
-        return sorted(results, key=lambda item: item["seat"])
-
-    def _attach_showdown_ranks(self, record: SpectatorHandRecord, results: List[Dict[str, object]]) -> None:
-        rank_lookup: Dict[int, str] = {}
-        for frame in record.frames:
-            event = frame.get("event")
-            if not event:
-                continue
-            if event.get("ev") == "SHOWDOWN" and "seat" in event and "rank" in event:
-                rank_lookup[event["seat"]] = event["rank"]
-        for result in results:
-            seat = result["seat"]
-            if seat in rank_lookup:
-                result["rank"] = rank_lookup[seat]
+    def _build_results_locked(self, end_payload: Dict[str, object]) -> List[Dict[str, object]]:
+        # The view's running results already hold stacks, net amounts and showdown ranks.
+        return self.spectator_view.results(end_payload.get("stacks", []))  # type: ignore[arg-type]
 
     def _fallback_state_from_payload_locked(self, end_payload: Dict[str, object]) -> Dict[str, object]:
         ctx = self.engine.hand
@@ -676,34 +1184,60 @@ class HostServer:
         }
 
     def _now_ts(self) -> str:
-        return datetime.now(timezone.utc).isoformat()
+        return self.encoder.clock.now_iso()
 
     async def _send_json(self, websocket: WebSocketServerProtocol, msg_type: str, payload: Dict[str, object]) -> None:
+        await self._send_raw(websocket, self._envelope(msg_type, payload))
+
+    async def _send_player(self, session: ClientSession, msg_type: str, payload: Dict[str, object]) -> None:
+        if session.compact:
+            await self._send_raw(session.websocket, self._pack(msg_type, payload))
+        else:
+            await self._send_json(session.websocket, msg_type, payload)
+
+    async def _send_raw(self, websocket: WebSocketServerProtocol, message: Message) -> None:
+        outbox = self.outboxes.get(websocket)
+        if outbox is not None:
+            outbox.put(message)
+            return
         try:
-            await websocket.send(self._envelope(msg_type, payload))
+            await websocket.send(message)
         except websockets.ConnectionClosed:
             pass
 
     async def _send_error(self, websocket: WebSocketServerProtocol, code: str, msg: str) -> None:
         await self._send_json(websocket, "error", {"code": code, "msg": msg})
 
-    def _envelope(self, msg_type: str, payload: Dict[str, object]) -> str:
-        body = {"type": msg_type, "v": 1, "ts": datetime.now(timezone.utc).isoformat()}
-        body.update(payload)
-        return json.dumps(body)
+    def _envelope(self, msg_type: str, payload: Dict[str, object], log_seq: Optional[int] = None) -> str:
+        return self.encoder.encode(msg_type, payload, log_seq=log_seq)
+
+    def _pack(self, msg_type: str, payload: Dict[str, object], log_seq: Optional[int] = None) -> bytes:
+        return encode_compact(msg_type, payload, self._now_ts(), log_seq)
 
-    async def _read_message(self, websocket: WebSocketServerProtocol) -> Optional[Dict[str, object]]:
+    def _logged(self, entry: LoggedMessage, compact: bool) -> Message:
+        return entry.packed(self._pack) if compact else entry.message(self._envelope)
+
+    async def _read_message(
+        self, websocket: WebSocketServerProtocol, timeout: float = 5.0
+    ) -> Optional[Dict[str, object]]:
         try:
-            raw = await asyncio.wait_for(websocket.recv(), timeout=5)
+            raw = await asyncio.wait_for(websocket.recv(), timeout=timeout)
             return self._decode(raw)
         except Exception:
             return None
 
-    def _decode(self, raw: str) -> Dict[str, object]:
+    def _decode(self, raw: Message) -> Dict[str, object]:
+        # Malformed or non-object frames decode to {} and get the usual error reply.
         try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
+            if is_compact(raw):
+                return decode_compact(raw)
+            message = self.encoder.serializer.loads(raw)
+        except (ValueError, RecursionError):
             return {}
+        return message if isinstance(message, dict) else {}
 
     def _time_remaining_ms(self) -> int:
-        return self.engine.config.move_time_ms
+        pending = self.pending_action
+        if pending is None or pending.timer_task is None:
+            return self.engine.config.move_time_ms
+        return max(0, int((pending.deadline - time.monotonic()) * 1000))
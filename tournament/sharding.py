@@ -0,0 +1,516 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import websockets
+from websockets.server import WebSocketServerProtocol
+
+from core.instrumentation import EngineStatsCollector
+from core.metrics import Sample, merge_expositions
+from core.models import TableConfig
+
+from .admission import AdmissionConfig, AdmissionGate
+from .checkpoint import Checkpointer, load_checkpoints
+from .compression import CompressionConfig
+from .hand_history import HandHistoryRecorder
+from .metrics import HostMetrics, http_handler
+from .multi_table import MultiTableHost
+
+LOGGER = logging.getLogger("poker_host")
+
+# One asyncio process tops out at one core, so supervisor mode runs N worker
+# processes, each a MultiTableHost owning a shard of tables, behind a router.
+#
+# Table ids are interleaved: worker k of N opens T-(k+1), T-(k+1+N), ... so
+# the owner of any table id is (n - 1) % N without asking anyone. The router
+# reads the hello, picks the owning shard and then only relays frames; all
+# engine, encoding and spectator work stays in the workers. Operators that
+# connect to the router without a table_id get a router session whose control
+# commands fan out to every shard and come back merged. Router-to-worker links
+# are local and never compressed; clients negotiate compression with the router.
+# The router's /metrics scrapes every worker's /metrics, adds a shard label to
+# their samples and merges them with its own admission and relay counters, so
+# Prometheus only needs the public port.
+
+_TABLE_ID = re.compile(r"^T-(\d+)$")
+ROUTER_COMMANDS = ("LIST_TABLES", "QUEUE_STATS", "REQUEST_STATUS")
+TABLE_COMMANDS = ("START_HAND", "SKIP_ACTION")
+
+
+def shard_for_table(table_id: object, workers: int) -> Optional[int]:
+    match = _TABLE_ID.match(table_id) if isinstance(table_id, str) else None
+    if not match or int(match.group(1)) < 1:
+        return None
+    return (int(match.group(1)) - 1) % workers
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    index: int
+    host: str
+    port: int
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+
+@dataclass(frozen=True)
+class WorkerOptions:
+    """Everything a worker process needs; must stay picklable."""
+
+    config: TableConfig
+    workers: int
+    tables: int = 1
+    max_tables: Optional[int] = None
+    engine_stats: bool = False
+    table_options: Tuple[Tuple[str, object], ...] = ()
+    # Each worker records into its own shard-N subdirectory.
+    hand_history_dir: Optional[str] = None
+    hand_history_options: Tuple[Tuple[str, object], ...] = ()
+    # Checkpoints also go to per-worker shard-N subdirectories.
+    checkpoint_dir: Optional[str] = None
+    checkpoint_mid_hand: bool = False
+    resume: bool = False
+
+
+def run_worker(index: int, host: str, port: int, options: WorkerOptions) -> None:
+    """Worker process entry point: one MultiTableHost on a private port."""
+    logging.basicConfig(level=logging.INFO, format=f"[shard {index}] %(levelname)s:%(name)s:%(message)s")
+    table_options = dict(options.table_options)
+    hand_history = None
+    if options.hand_history_dir:
+        hand_history = HandHistoryRecorder(
+            os.path.join(options.hand_history_dir, f"shard-{index}"), **dict(options.hand_history_options)
+        )
+        hand_history.start()
+        table_options["hand_history"] = hand_history
+    checkpointer = None
+    if options.checkpoint_dir:
+        checkpointer = Checkpointer(
+            os.path.join(options.checkpoint_dir, f"shard-{index}"), mid_hand=options.checkpoint_mid_hand
+        )
+        table_options["checkpointer"] = checkpointer
+    server = MultiTableHost(
+        options.config,
+        tables=options.tables,
+        max_tables=options.max_tables,
+        engine_stats=EngineStatsCollector() if options.engine_stats else None,
+        table_offset=index,
+        table_stride=options.workers,
+        **table_options,
+    )
+    if checkpointer is not None:
+        if options.resume:
+            server.restore(load_checkpoints(checkpointer.directory))
+        checkpointer.start()
+    try:
+        asyncio.run(server.start(host=host, port=port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if hand_history is not None:
+            hand_history.close()
+        if checkpointer is not None:
+            checkpointer.close()
+
+
+class ShardRouter:
+    def __init__(self, shards: Sequence[ShardSpec]) -> None:
+        if not shards:
+            raise ValueError("Router needs at least one shard")
+        self.shards = list(shards)
+        # Players without a table_id stick to the shard they were first sent to.
+        self._team_shards: Dict[str, int] = {}
+        self._players_routed = [0] * len(self.shards)
+        self.connections = 0
+        # Set by start(admission=...); the router is the public listener in supervisor mode.
+        self.admission: Optional[AdmissionGate] = None
+        self.metrics = HostMetrics()
+        self._shards_up: Dict[int, bool] = {}
+        self.metrics.registry.collect(
+            "poker_router_connections", "gauge", "Client connections relayed to shards.", self._relayed
+        )
+        self.metrics.registry.collect(
+            "poker_shard_up", "gauge", "Whether the shard answered the last /metrics scrape.", self._shard_up
+        )
+
+    async def start(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        compression: Optional[CompressionConfig] = None,
+        admission: Optional[AdmissionConfig] = None,
+    ) -> None:
+        if admission is not None:
+            self.admission = AdmissionGate(admission, self._send)
+            self.metrics.attach_admission(self.admission)
+        async with websockets.serve(
+            self._handle_connection,
+            host,
+            port,
+            process_request=http_handler(self.metrics, self.scrape_metrics),
+            **(compression or CompressionConfig()).serve_options(),
+        ):
+            LOGGER.info("Router listening on %s:%s (%s shards)", host, port, len(self.shards))
+            await asyncio.Future()
+
+    async def _handle_connection(self, websocket: WebSocketServerProtocol) -> None:
+        gate = self.admission
+        if gate is None:
+            hello = await self._read_hello(websocket)
+        else:
+            accepted, hello = await gate.handshake(websocket, self._read_hello)
+            if not accepted:
+                return
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            await self._reject(websocket, "BAD_HELLO", "Expected hello")
+            return
+        if gate is None:
+            await self._serve(websocket, hello)
+            return
+        if not await gate.admit(websocket, hello):
+            return
+        try:
+            await self._serve(websocket, hello)
+        finally:
+            gate.release(websocket)
+
+    async def _read_hello(
+        self, websocket: WebSocketServerProtocol, timeout: float = 5.0
+    ) -> Optional[Dict[str, object]]:
+        try:
+            raw = await asyncio.wait_for(websocket.recv(), timeout=timeout)
+            hello = json.loads(raw)
+        except Exception:
+            return None
+        return hello if isinstance(hello, dict) else None
+
+    async def _serve(self, websocket: WebSocketServerProtocol, hello: Dict[str, object]) -> None:
+        role_raw = hello.get("role") or "player"
+        role = role_raw.strip().casefold() if isinstance(role_raw, str) else "player"
+        if role == "operator" and hello.get("table_id") is None:
+            await self._operator_session(websocket)
+            return
+        shard, error = self.route(hello, role)
+        if shard is None:
+            assert error is not None
+            await self._reject(websocket, *error)
+            return
+        await self._relay(websocket, hello, shard)
+
+    def route(self, hello: Dict[str, object], role: str = "player") -> Tuple[Optional[ShardSpec], Optional[Tuple[str, str]]]:
+        table_id = hello.get("table_id")
+        if table_id is not None:
+            index = shard_for_table(table_id, len(self.shards))
+            if index is None:
+                return None, ("UNKNOWN_TABLE", f"No table {table_id!r}")
+            return self.shards[index], None
+        if role in ("spectator", "operator"):
+            return self.shards[0], None
+        team = hello.get("team")
+        if not isinstance(team, str) or not team.strip():
+            # Let a shard produce the usual schema error.
+            return self.shards[0], None
+        key = team.strip().casefold()
+        index = self._team_shards.get(key)
+        if index is None:
+            index = min(range(len(self.shards)), key=lambda idx: (self._players_routed[idx], idx))
+            self._team_shards[key] = index
+            self._players_routed[index] += 1
+        return self.shards[index], None
+
+    async def _relay(self, websocket: WebSocketServerProtocol, hello: Dict[str, object], shard: ShardSpec) -> None:
+        try:
+            upstream = await websockets.connect(shard.url, max_size=None, compression=None)
+        except (OSError, websockets.WebSocketException):
+            LOGGER.warning("Shard %s unreachable at %s", shard.index, shard.url)
+            await self._reject(websocket, "SHARD_UNAVAILABLE", "Table shard is not reachable")
+            return
+        self.connections += 1
+        try:
+            await upstream.send(json.dumps(hello))
+            pumps = [
+                asyncio.ensure_future(self._pump(websocket, upstream)),
+                asyncio.ensure_future(self._pump(upstream, websocket)),
+            ]
+            _, pending = await asyncio.wait(pumps, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self.connections -= 1
+            # Pass the shard's close code (e.g. slow consumer, seat replaced) through.
+            code = upstream.close_code or 1000
+            reason = upstream.close_reason or ""
+            await upstream.close()
+            await websocket.close(code=code if code != 1006 else 1011, reason=reason)
+
+    @staticmethod
+    async def _pump(source, sink) -> None:
+        try:
+            async for message in source:
+                await sink.send(message)
+        except websockets.ConnectionClosed:
+            pass
+
+    # Metrics ------------------------------------------------------------
+
+    async def scrape_metrics(self) -> str:
+        """The router's own metrics merged with every reachable shard's, labelled by shard."""
+        texts = await asyncio.gather(*(self._shard_metrics(shard) for shard in self.shards))
+        self._shards_up = {shard.index: text is not None for shard, text in zip(self.shards, texts)}
+        parts = [({}, self.metrics.render())]
+        parts.extend(({"shard": str(shard.index)}, text) for shard, text in zip(self.shards, texts) if text is not None)
+        return merge_expositions(parts)
+
+    async def _shard_metrics(self, shard: ShardSpec, timeout: float = 2.0) -> Optional[str]:
+        """GET /metrics from a worker; None when it cannot be reached."""
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(shard.host, shard.port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        try:
+            writer.write(f"GET /metrics HTTP/1.1\r\nHost: {shard.host}\r\nConnection: close\r\n\r\n".encode())
+            response = await asyncio.wait_for(reader.read(), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        finally:
+            writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        if not head.startswith(b"HTTP/1.1 200"):
+            return None
+        return body.decode()
+
+    def _relayed(self) -> Iterable[Sample]:
+        yield {}, self.connections
+
+    def _shard_up(self) -> Iterable[Sample]:
+        for index, up in sorted(self._shards_up.items()):
+            yield {"shard": index}, int(up)
+
+    # Operator fan-out ---------------------------------------------------
+
+    async def _operator_session(self, websocket: WebSocketServerProtocol) -> None:
+        LOGGER.info("Router operator connected")
+        try:
+            await self._send(websocket, "router/status", await self.cluster_status())
+            async for raw in websocket:
+                try:
+                    message = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(message, dict) or message.get("type") != "control":
+                    await websocket.close(code=4403, reason="Router sessions accept control messages only")
+                    return
+                reply_type, payload = await self.handle_control(message)
+                await self._send(websocket, reply_type, payload)
+        except websockets.ConnectionClosed:
+            pass
+
+    async def handle_control(self, message: Dict[str, object]) -> Tuple[str, Dict[str, object]]:
+        command_raw = message.get("command") or message.get("cmd")
+        if not isinstance(command_raw, str):
+            return "control/error", {"error": "COMMAND_REQUIRED"}
+        command = command_raw.strip().upper()
+        if command == "LIST_TABLES":
+            replies = await self._fan_out({"type": "control", "command": command})
+            tables = [
+                {"shard": shard.index, **entry}
+                for shard, reply in replies
+                for entry in (reply or {}).get("tables", [])
+            ]
+            return "control/ack", {"command": command, "tables": tables}
+        if command == "QUEUE_STATS":
+            replies = await self._fan_out({"type": "control", "command": command, "scope": "host"})
+            queues = [
+                {"shard": shard.index, **entry}
+                for shard, reply in replies
+                for entry in (reply or {}).get("queues", [])
+            ]
+            queues.sort(key=lambda entry: (-int(entry["depth"]), str(entry["client"])))
+            return "control/ack", {"command": command, "queues": queues}
+        if command == "REQUEST_STATUS":
+            return "control/ack", {"command": command, **await self.cluster_status()}
+        if command in TABLE_COMMANDS:
+            table_id = message.get("table_id")
+            targets = [table_id] if table_id is not None else await self._all_table_ids()
+            results = {}
+            for target in targets:
+                index = shard_for_table(target, len(self.shards))
+                if index is None:
+                    results[str(target)] = "unknown_table"
+                    continue
+                reply = await self._shard_control(self.shards[index], {"type": "control", "command": command}, target)
+                results[str(target)] = (reply or {}).get("status", "unreachable")
+            return "control/ack", {"command": command, "tables": results}
+        return "control/error", {"command": command, "error": "UNKNOWN_COMMAND"}
+
+    async def cluster_status(self) -> Dict[str, object]:
+        replies = await self._fan_out({"type": "control", "command": "LIST_TABLES"})
+        shards = []
+        for shard, reply in replies:
+            tables = (reply or {}).get("tables", [])
+            shards.append(
+                {
+                    "shard": shard.index,
+                    "url": shard.url,
+                    "up": reply is not None,
+                    "tables": len(tables),
+                    "in_hand": sum(1 for entry in tables if entry.get("in_hand")),
+                    "connected": sum(int(entry.get("connected", 0)) for entry in tables),
+                    "spectators": sum(int(entry.get("spectators", 0)) for entry in tables),
+                }
+            )
+        return {"shards": shards, "relayed_connections": self.connections}
+
+    async def _all_table_ids(self) -> List[str]:
+        replies = await self._fan_out({"type": "control", "command": "LIST_TABLES"})
+        return [entry["table_id"] for _, reply in replies for entry in (reply or {}).get("tables", [])]
+
+    async def _fan_out(self, command: Dict[str, object]) -> List[Tuple[ShardSpec, Optional[Dict[str, object]]]]:
+        replies = await asyncio.gather(*(self._shard_control(shard, command) for shard in self.shards))
+        return list(zip(self.shards, replies))
+
+    async def _shard_control(
+        self,
+        shard: ShardSpec,
+        command: Dict[str, object],
+        table_id: Optional[str] = None,
+        timeout: float = 5.0,
+    ) -> Optional[Dict[str, object]]:
+        """Run one control command on a shard; None when it cannot be reached."""
+        hello: Dict[str, object] = {"type": "hello", "role": "operator"}
+        if table_id is not None:
+            hello["table_id"] = table_id
+        try:
+            async with websockets.connect(shard.url, max_size=None, compression=None) as upstream:
+                await upstream.send(json.dumps(hello))
+                await upstream.send(json.dumps(command))
+                while True:
+                    reply = json.loads(await asyncio.wait_for(upstream.recv(), timeout=timeout))
+                    # Operator sessions open with lobby/snapshot/status; skip to the answer.
+                    if reply.get("type") in ("control/ack", "control/error"):
+                        return reply
+        except (OSError, asyncio.TimeoutError, websockets.WebSocketException):
+            LOGGER.warning("Shard %s did not answer %s", shard.index, command.get("command"))
+            return None
+
+    # Helpers ------------------------------------------------------------
+
+    async def _reject(self, websocket: WebSocketServerProtocol, code: str, msg: str) -> None:
+        await self._send(websocket, "error", {"code": code, "msg": msg})
+        await websocket.close()
+
+    async def _send(self, websocket: WebSocketServerProtocol, msg_type: str, payload: Dict[str, object]) -> None:
+        body = {"type": msg_type, "v": 1, "ts": datetime.now(timezone.utc).isoformat()}
+        body.update(payload)
+        try:
+            await websocket.send(json.dumps(body))
+        except websockets.ConnectionClosed:
+            pass
+
+
+class Supervisor:
+    """Spawns the shard workers, waits for them to listen, then runs the router.
+
+    A worker that dies is restarted on the same port. With a checkpoint
+    directory it is restarted with ``resume`` set, so its tables come back
+    from their last checkpoints; without one they come back empty, and bots
+    reconnecting through the router simply sit down again.
+    """
+
+    def __init__(
+        self,
+        options: WorkerOptions,
+        *,
+        worker_host: str = "127.0.0.1",
+        worker_base_port: int = 9100,
+    ) -> None:
+        if options.workers < 1:
+            raise ValueError("Need at least one worker")
+        self.options = options
+        self.shards = [
+            ShardSpec(index=index, host=worker_host, port=worker_base_port + index) for index in range(options.workers)
+        ]
+        self.router = ShardRouter(self.shards)
+        self._context = multiprocessing.get_context("spawn")
+        self.processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self.restarts = 0
+
+    def _spawn(self, shard: ShardSpec, options: Optional[WorkerOptions] = None) -> None:
+        process = self._context.Process(
+            target=run_worker,
+            args=(shard.index, shard.host, shard.port, options or self.options),
+            name=f"poker-shard-{shard.index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[shard.index] = process
+        LOGGER.info("Started shard %s (pid %s) on %s", shard.index, process.pid, shard.url)
+
+    async def wait_ready(self, timeout: float = 20.0) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        for shard in self.shards:
+            while True:
+                try:
+                    _, writer = await asyncio.open_connection(shard.host, shard.port)
+                except OSError:
+                    if loop.time() > deadline:
+                        raise RuntimeError(f"Shard {shard.index} did not start listening on {shard.url}")
+                    await asyncio.sleep(0.1)
+                    continue
+                writer.close()
+                await writer.wait_closed()
+                break
+
+    async def start(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        compression: Optional[CompressionConfig] = None,
+        admission: Optional[AdmissionConfig] = None,
+    ) -> None:
+        for shard in self.shards:
+            self._spawn(shard)
+        try:
+            await self.wait_ready()
+            monitor = asyncio.create_task(self._monitor())
+            try:
+                await self.router.start(host, port, compression, admission)
+            finally:
+                monitor.cancel()
+        finally:
+            self.stop()
+
+    async def _monitor(self, interval: float = 1.0) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for shard in self.shards:
+                process = self.processes.get(shard.index)
+                if process is not None and not process.is_alive():
+                    LOGGER.warning("Shard %s exited with %s; restarting", shard.index, process.exitcode)
+                    self.restarts += 1
+                    self._spawn(shard, self._restart_options())
+
+    def _restart_options(self) -> WorkerOptions:
+        # A restarted worker picks its tables up from its own checkpoints.
+        if self.options.checkpoint_dir and not self.options.resume:
+            return replace(self.options, resume=True)
+        return self.options
+
+    def stop(self) -> None:
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=5)
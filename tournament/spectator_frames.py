@@ -0,0 +1,168 @@
+"""Keyframe + delta encoding for spectator table states.
+
+A hand's frames start with a keyframe (the full ``state``) and continue with
+``delta`` patches against the previous frame; a fresh keyframe is emitted
+every ``KEYFRAME_INTERVAL`` frames so a client that missed a message can
+resynchronise without a snapshot. Patch shape::
+
+    {"set": {<top-level key>: <new value>, ...},
+     "seats": [{"seat": <idx>, <changed seat field>: <new value>, ...}, ...]}
+
+Clients apply a patch by overwriting the listed top-level keys and, for each
+seat entry, the listed fields of the seat with the same ``seat`` index. Both
+parts are optional. ``apply_delta`` below is the reference implementation.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from core.serialization import dumps
+
+KEYFRAME_INTERVAL = 16
+
+State = Dict[str, object]
+
+
+def diff_state(previous: State, current: State) -> Optional[Dict[str, object]]:
+    """Patch turning ``previous`` into ``current``; None when seats cannot be patched."""
+    prev_seats = previous.get("seats") or []
+    curr_seats = current.get("seats") or []
+    if [seat["seat"] for seat in prev_seats] != [seat["seat"] for seat in curr_seats]:  # type: ignore[index]
+        return None
+
+    patch: Dict[str, object] = {}
+    changed = {key: value for key, value in current.items() if key != "seats" and previous.get(key) != value}
+    if changed:
+        patch["set"] = changed
+    seat_patches: List[Dict[str, object]] = []
+    for before, after in zip(prev_seats, curr_seats):  # type: ignore[arg-type]
+        fields = {key: value for key, value in after.items() if before.get(key) != value}
+        if fields:
+            fields["seat"] = after["seat"]
+            seat_patches.append(fields)
+    if seat_patches:
+        patch["seats"] = seat_patches
+    return patch
+
+
+def apply_delta(state: State, patch: Dict[str, object]) -> State:
+    """Return a new state with ``patch`` applied; ``state`` is left untouched."""
+    result = dict(state)
+    result.update(patch.get("set") or {})  # type: ignore[arg-type]
+    seat_patches = patch.get("seats")
+    if seat_patches:
+        by_index = {entry["seat"]: entry for entry in seat_patches}  # type: ignore[union-attr]
+        result["seats"] = [
+            {**seat, **by_index[seat["seat"]]} if seat["seat"] in by_index else seat
+            for seat in state.get("seats") or []  # type: ignore[union-attr]
+        ]
+    return result
+
+
+def expand_frames(frames: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Rebuild full-state frames from a keyframe/delta sequence (for legacy clients)."""
+    expanded: List[Dict[str, object]] = []
+    state: Optional[State] = None
+    for frame in frames:
+        full = {key: value for key, value in frame.items() if key not in ("delta", "seq")}
+        if "state" in frame:
+            state = frame["state"]  # type: ignore[assignment]
+        elif state is not None:
+            state = apply_delta(state, frame["delta"])  # type: ignore[arg-type]
+            full["state"] = state
+        else:
+            continue
+        expanded.append(full)
+    return expanded
+
+
+@dataclass
+class SpectatorHandRecord:
+    hand_id: str
+    opening_stacks: Dict[int, int]
+    # Keyframe/delta frames for the whole hand.
+    frames: List[Dict[str, object]] = field(default_factory=list)
+    results: Optional[List[Dict[str, object]]] = None
+    next_event_id: int = 0
+    last_state: Optional[Dict[str, object]] = None
+    since_keyframe: int = 0
+    size_bytes: int = 0
+    # Catch-up payloads keyed by encoding, tagged with the frame count they cover.
+    catchup: Dict[bool, Tuple[Tuple[int, bool], Dict[str, object]]] = field(default_factory=dict)
+
+
+class SpectatorHistory:
+    """Ring buffer of recent hands bounded by hand count and encoded frame bytes.
+
+    The newest hand is never evicted, so a hand in progress always survives
+    even if it alone exceeds the byte budget.
+    """
+
+    def __init__(self, max_hands: int = 20, max_bytes: int = 8 * 1024 * 1024) -> None:
+        self.max_hands = max_hands
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._records: Deque[SpectatorHandRecord] = deque()
+        self._by_id: Dict[str, SpectatorHandRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, hand_id: object) -> bool:
+        return hand_id in self._by_id
+
+    def hand_ids(self) -> List[str]:
+        return [record.hand_id for record in self._records]
+
+    def get(self, hand_id: Optional[str]) -> Optional[SpectatorHandRecord]:
+        return self._by_id.get(hand_id) if hand_id else None
+
+    def latest(self) -> Optional[SpectatorHandRecord]:
+        return self._records[-1] if self._records else None
+
+    def add(self, record: SpectatorHandRecord) -> None:
+        self._records.append(record)
+        self._by_id[record.hand_id] = record
+        self.total_bytes += record.size_bytes
+        self._evict()
+
+    def append_frame(self, record: SpectatorHandRecord, frame: Dict[str, object]) -> None:
+        size = len(dumps(frame))
+        record.frames.append(frame)
+        record.size_bytes += size
+        if record.hand_id in self._by_id:
+            self.total_bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._records) > 1 and (
+            len(self._records) > self.max_hands or self.total_bytes > self.max_bytes
+        ):
+            old = self._records.popleft()
+            del self._by_id[old.hand_id]
+            self.total_bytes -= old.size_bytes
+
+    def catchup_payload(self, record: SpectatorHandRecord, delta_frames: bool) -> Dict[str, object]:
+        """Snapshot for a newly connected spectator, built once per hand update.
+
+        Delta clients get the stored frames as-is; full-state clients get them
+        expanded. Either way every spectator joining before the next frame
+        shares the same payload instead of copying the frame list again.
+        """
+        version = (len(record.frames), record.results is not None)
+        cached = record.catchup.get(delta_frames)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        payload: Dict[str, object] = {"hand_id": record.hand_id}
+        if delta_frames:
+            payload["encoding"] = "delta"
+            payload["frames"] = tuple(record.frames)
+        else:
+            payload["frames"] = expand_frames(record.frames)
+        if record.results:
+            payload["results"] = record.results
+        record.catchup[delta_frames] = (version, payload)
+        return payload
@@ -0,0 +1,191 @@
+"""Live spectator view of the hand in progress, patched from engine events.
+
+``GameEngine.spectator_state`` builds the whole state (every seat, the board)
+from scratch. The host publishes one frame per event, so it keeps a
+``SpectatorView`` instead. The view builds the state once per hand and then
+updates only what the events of each engine call touched:
+
+* a bet, call, check or fold refreshes that seat;
+* anything else (a street, a showdown, a pot award) refreshes every seat;
+* pot, phase, next actor and clock are read from the hand each time.
+
+States are copy-on-write. Frames and logs keep the states they were given,
+so an update builds a new top-level dict and new dicts only for the seats
+that changed. While it does, the view records the patch it applied, which
+is exactly what ``diff_state`` would return against the previous state.
+
+The view also keeps a showdown-rank index and a running result row per seat
+(closing stack, net amount, rank), so hand-end results are a read, not a
+rescan of the hand's frames.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from .spectator_frames import State, diff_state
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from core.game import GameEngine
+
+# Events that change nothing but the acting seat (and the pot, read anyway).
+_SEAT_EVENTS = frozenset(("FOLD", "CHECK", "CALL", "BET"))
+# Seat fields that can change mid-hand; hole cards and button cannot. The team
+# label changes when a bot reconnects under a differently cased name.
+_LIVE_FIELDS = ("team", "stack", "committed", "has_folded", "connected")
+
+
+class SpectatorView:
+    def __init__(self, engine: "GameEngine", table_id: str) -> None:
+        self.engine = engine
+        self.table_id = table_id
+        # Current state; never mutated once returned.
+        self.state: Optional[State] = None
+        # State the last update started from, and the patch it applied.
+        self._base: Optional[State] = None
+        self._patch: Dict[str, object] = {}
+        # Seat index -> position in state["seats"].
+        self._positions: Dict[int, int] = {}
+        self._dirty: set = set()
+        self._stale = False
+        self.opening_stacks: Dict[int, int] = {}
+        self.ranks: Dict[int, str] = {}
+        self._results: Dict[int, Dict[str, object]] = {}
+
+    def start_hand(self, opening_stacks: Dict[int, int], time_remaining_ms: Optional[int]) -> Optional[State]:
+        """Build the state of a newly dealt hand and reset the rank index and results."""
+        self.opening_stacks = dict(opening_stacks)
+        self.ranks = {}
+        self._results = {}
+        self._rebuild(time_remaining_ms)
+        return self.state
+
+    def touch(self, seat_idx: int) -> None:
+        """Seat ``seat_idx`` changed outside an engine action (it connected, or just sat down)."""
+        self._dirty.add(seat_idx)
+
+    def update(self, events: Sequence[Dict[str, object]], time_remaining_ms: Optional[int]) -> Optional[State]:
+        """Apply the events of one engine call and return the new state (None without a hand)."""
+        ctx = self.engine.hand
+        if ctx is None:
+            return None
+        state = self.state
+        if state is None or state["hand_id"] != ctx.hand_id:
+            self._rebuild(time_remaining_ms)
+            return self.state
+        dirty = self._dirty
+        refresh_all = False
+        for event in events:
+            ev = event["ev"]
+            if ev in _SEAT_EVENTS:
+                dirty.add(event["seat"])
+                continue
+            refresh_all = True
+            if ev == "SHOWDOWN":
+                self.ranks[event["seat"]] = event["rank"]  # type: ignore[index]
+                row = self._results.get(event["seat"])  # type: ignore[arg-type]
+                if row is not None:
+                    row["rank"] = event["rank"]
+
+        # Same key order as GameEngine.spectator_state, so patches match diff_state.
+        top: Dict[str, object] = {"pot": ctx.pot, "phase": ctx.phase.value}
+        if len(ctx.community) != len(state["community"]):  # type: ignore[arg-type]
+            top["community"] = [card.label for card in ctx.community]
+        top["next_actor"] = next_actor = self.engine.next_actor()
+        top["time_remaining_ms"] = time_remaining_ms if next_actor is not None else None
+        changed = {key: value for key, value in top.items() if state[key] != value}
+        patch: Dict[str, object] = {"set": changed} if changed else {}
+
+        seats: List[Dict[str, object]] = state["seats"]  # type: ignore[assignment]
+        positions = self._positions
+        if not dirty.issubset(positions):
+            # A seat the state does not list yet: someone sat down mid-hand.
+            self._rebuild(time_remaining_ms)
+            return self.state
+        if not refresh_all:
+            positions = {seat: positions[seat] for seat in dirty}
+        seat_patches = []
+        for seat_idx, position in positions.items():
+            fields = self._seat_changes(seats[position])
+            if fields:
+                if seats is state["seats"]:
+                    seats = list(seats)
+                seats[position] = {**seats[position], **fields}
+                self._record_result(seat_idx, seats[position])
+                fields["seat"] = seat_idx
+                seat_patches.append(fields)
+        if self._stale:
+            self._rebuild(time_remaining_ms)
+            return self.state
+        dirty.clear()
+        if seat_patches:
+            seat_patches.sort(key=lambda entry: entry["seat"])  # type: ignore[arg-type,return-value]
+            patch["seats"] = seat_patches
+        if not patch:
+            self._base, self._patch = state, patch
+            return state
+        new_state = {**state, **changed}
+        new_state["seats"] = seats
+        self._base, self._patch, self.state = state, patch, new_state
+        return new_state
+
+    def delta_from(self, previous: State) -> Optional[Dict[str, object]]:
+        """Patch from ``previous`` to the current state (None when seats cannot be patched)."""
+        if previous is self.state:
+            return {}
+        if previous is self._base and self.state is not None:
+            return self._patch
+        return diff_state(previous, self.state or {})
+
+    def results(self, final_stacks: List[Dict[str, object]]) -> List[Dict[str, object]]:
+        """Result rows (stack, net amount, showdown rank) for the seats in ``final_stacks``."""
+        rows = []
+        for entry in final_stacks:
+            seat = entry["seat"]
+            row = self._results.get(seat)  # type: ignore[arg-type]
+            if row is None or row["stack"] != entry["stack"]:
+                row = self._result_row(seat, entry["stack"])  # type: ignore[arg-type]
+            rows.append(dict(row))
+        rows.sort(key=lambda item: item["seat"])  # type: ignore[arg-type,return-value]
+        return rows
+
+    def _rebuild(self, time_remaining_ms: Optional[int]) -> None:
+        state = self.engine.spectator_state(self.table_id, time_remaining_ms)
+        # No recorded patch: delta_from falls back to diff_state.
+        self._base, self._patch = None, {}
+        self.state = state
+        self._stale = False
+        self._dirty.clear()
+        self._positions = {}
+        if state is None:
+            return
+        for position, seat in enumerate(state["seats"]):  # type: ignore[arg-type]
+            self._positions[seat["seat"]] = position
+            self._record_result(seat["seat"], seat)
+
+    def _seat_changes(self, current: Dict[str, object]) -> Dict[str, object]:
+        seat = self.engine.seats[current["seat"]]  # type: ignore[index]
+        if seat is None:
+            self._stale = True
+            return {}
+        fields = {}
+        for name in _LIVE_FIELDS:
+            value = getattr(seat, name)
+            if current[name] != value:
+                fields[name] = value
+        return fields
+
+    def _record_result(self, seat_idx: int, seat: Dict[str, object]) -> None:
+        row = self._results.get(seat_idx)
+        if row is None or row["stack"] != seat["stack"]:
+            self._results[seat_idx] = self._result_row(seat_idx, seat["stack"])  # type: ignore[arg-type]
+
+    def _result_row(self, seat_idx: int, stack: int) -> Dict[str, object]:
+        row: Dict[str, object] = {"seat": seat_idx, "stack": stack}
+        opening = self.opening_stacks.get(seat_idx)
+        if opening is not None:
+            row["amount"] = stack - opening
+        rank = self.ranks.get(seat_idx)
+        if rank is not None:
+            row["rank"] = rank
+        return row